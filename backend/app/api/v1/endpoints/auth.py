@@ -3,25 +3,26 @@
 处理用户登录、登出和身份验证
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import get_db
+from app.models import get_async_db
 from app.schemas.user import LoginRequest, LoginResponse
 from app.services.user_service import UserService
 from app.services.operation_log_service import OperationLogService
 from app.core.security import create_access_token
+from app.core.audit import audit, set_audit_context
 from app.core.deps import get_current_user
-from app.core.logger_helper import log_operation
 
 # 创建路由器
 router = APIRouter()
 
 
 @router.post("/login", response_model=LoginResponse, summary="用户登录")
+@audit(OperationLogService.MODULE_AUTH, OperationLogService.ACTION_LOGIN)
 async def login(
     request: Request,
     login_data: LoginRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     用户登录接口
@@ -37,19 +38,10 @@ async def login(
     Raises:
         HTTPException: 用户名或密码错误时返回 401
     """
-    user = UserService.authenticate_user(db, login_data.username, login_data.password)
+    user = await UserService.authenticate_user(db, login_data.username, login_data.password)
     if not user:
-        # 记录登录失败日志
-        await log_operation(
-            db=db,
-            user_id=0,  # 未知用户
-            username=login_data.username,
-            action_type=OperationLogService.ACTION_LOGIN,
-            module=OperationLogService.MODULE_AUTH,
-            request=request,
-            status=0,  # 失败
-            remark="用户名或密码错误"
-        )
+        # 登录请求没有令牌，审计日志记录尝试登录的用户名（用户ID为 0）
+        set_audit_context(request, username=login_data.username, remark="用户名或密码错误")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="用户名或密码错误"
@@ -64,17 +56,7 @@ async def login(
         }
     )
 
-    # 记录登录成功日志
-    await log_operation(
-        db=db,
-        user_id=user.id,
-        username=user.username,
-        action_type=OperationLogService.ACTION_LOGIN,
-        module=OperationLogService.MODULE_AUTH,
-        request=request,
-        status=1,  # 成功
-        remark="用户登录成功"
-    )
+    set_audit_context(request, user_id=user.id, username=user.username, remark="用户登录成功")
 
     return LoginResponse(
         access_token=access_token,
@@ -102,25 +84,10 @@ def get_current_user_info(current_user: dict = Depends(get_current_user)):
 
 
 @router.post("/logout", summary="用户登出")
-async def logout(
-    request: Request,
-    current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
+@audit(OperationLogService.MODULE_AUTH, OperationLogService.ACTION_LOGOUT)
+async def logout(current_user: dict = Depends(get_current_user)):
     """
     用户登出接口
     注意：客户端需要清除本地存储的令牌
     """
-    # 记录登出日志
-    await log_operation(
-        db=db,
-        user_id=current_user.get("id"),
-        username=current_user.get("username"),
-        action_type=OperationLogService.ACTION_LOGOUT,
-        module=OperationLogService.MODULE_AUTH,
-        request=request,
-        status=1,
-        remark="用户登出成功"
-    )
-
     return {"message": "登出成功"}
@@ -2,15 +2,13 @@
 智能问答接口
 提供基于Qwen大模型的对话功能
 """
-from fastapi import APIRouter, Request, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends
 
-from app.models import get_db
 from app.schemas.chat import ChatRequest, ChatResponse
 from app.services.chat_service import ChatService
 from app.services.operation_log_service import OperationLogService
+from app.core.audit import audit
 from app.core.deps import get_current_user
-from app.core.logger_helper import log_operation
 
 # 创建路由器
 router = APIRouter()
@@ -20,10 +18,9 @@ chat_service = ChatService()
 
 
 @router.post("/message", response_model=ChatResponse, summary="发送消息")
+@audit(OperationLogService.MODULE_CHAT, OperationLogService.ACTION_QUERY)
 async def send_message(
-    req: Request,
     request: ChatRequest,
-    db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -34,18 +31,6 @@ async def send_message(
     """
     response = await chat_service.chat(request.message, request.session_id)
 
-    # 记录问答日志（不记录消息的具体内容）
-    await log_operation(
-        db=db,
-        user_id=current_user.get("id"),
-        username=current_user.get("username"),
-        action_type=OperationLogService.ACTION_QUERY,
-        module=OperationLogService.MODULE_CHAT,
-        request=req,
-        status=1,
-        remark="发送消息给AI助手"
-    )
-
     return ChatResponse(
         message=response["message"],
         session_id=response["session_id"]
@@ -53,10 +38,9 @@ async def send_message(
 
 
 @router.post("/clear", summary="清除对话历史")
+@audit(OperationLogService.MODULE_CHAT, OperationLogService.ACTION_DELETE)
 async def clear_history(
-    req: Request,
     session_id: str = None,
-    db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -66,16 +50,4 @@ async def clear_history(
     """
     chat_service.clear_history(session_id)
 
-    # 记录清除对话历史日志
-    await log_operation(
-        db=db,
-        user_id=current_user.get("id"),
-        username=current_user.get("username"),
-        action_type=OperationLogService.ACTION_DELETE,
-        module=OperationLogService.MODULE_CHAT,
-        request=req,
-        status=1,
-        remark="清除对话历史"
-    )
-
     return {"message": "对话历史已清除"}
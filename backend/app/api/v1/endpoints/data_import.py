@@ -2,36 +2,96 @@
 数据导入 API 接口
 提供 Excel 文件上传和 Neo4j 知识图谱导入功能
 """
-from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, Request, status
-from sqlalchemy.orm import Session
-from typing import List
+import asyncio
+from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, Request, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal
 from datetime import datetime
+from pathlib import Path
 
-from app.models import get_db, FileUploadRecord
+from app.models import get_async_db, SessionLocal, FileUploadRecord
 from app.schemas.data_import import (
     FileUploadResponse,
     ImportResult,
     ImportStatistics,
+    ImportStatus,
     ImportError,
     FileListItem
 )
 from app.services.data_import_service import DataImportService
+from app.services.import_job_service import ImportJobService
 from app.services.operation_log_service import OperationLogService
+from app.core.audit import audit, set_audit_context
 from app.core.deps import get_current_user, get_current_admin
-from app.core.logger_helper import log_operation
+from app.core.neo4j_client import database_pointer
+from app.core.responses import ORJSONResponse
 import logging
 
 logger = logging.getLogger(__name__)
 
 # 创建路由器
-router = APIRouter(tags=["数据导入"])
+router = APIRouter(tags=["数据导入"], default_response_class=ORJSONResponse)
+
+# 上传文件大小限制（50MB）
+MAX_UPLOAD_SIZE = 50 * 1024 * 1024
+
+
+async def _read_excel_upload(file: UploadFile) -> bytes:
+    """
+    验证上传文件的类型和大小，并读取文件内容
+
+    Raises:
+        HTTPException: 文件类型不支持或大小超限时返回 400
+    """
+    # 验证文件类型
+    if not file.filename or not file.filename.lower().endswith(('.xlsx', '.xls')):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="仅支持 .xlsx 或 .xls 格式的 Excel 文件"
+        )
+
+    # 读取文件内容
+    file_content = await file.read()
+
+    # 验证文件大小
+    if len(file_content) > MAX_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"文件大小超过限制 ({MAX_UPLOAD_SIZE / 1024 / 1024}MB)"
+        )
+
+    return file_content
+
+
+def _save_upload(file_content: bytes, filename: str, file_id: str, current_user: dict) -> Path:
+    """
+    保存上传文件并创建上传记录（在工作线程中调用，使用独立的同步会话）
+
+    Returns:
+        Path: 保存后的文件路径
+    """
+    db = SessionLocal()
+    try:
+        _, file_path = DataImportService.save_uploaded_file(
+            file_content=file_content,
+            original_filename=filename,
+            file_id=file_id,
+            db=db,
+            user_id=current_user.get("id"),
+            username=current_user.get("username")
+        )
+        return file_path
+    finally:
+        db.close()
 
 
 @router.post("/upload-and-import", response_model=ImportResult, summary="上传并导入 Excel 文件")
+@audit(OperationLogService.MODULE_DATA_IMPORT, OperationLogService.ACTION_IMPORT)
 async def upload_and_import(
     request: Request,
     file: UploadFile = File(..., description="Excel 文件"),
-    db: Session = Depends(get_db),
+    mode: Literal["full", "incremental"] = Query("full", description="导入模式: full 清空重建, incremental 增量（只写入差异）"),
     current_user: dict = Depends(get_current_admin)
 ):
     """
@@ -39,64 +99,32 @@ async def upload_and_import(
 
     流程：
     1. 上传文件到服务器
-    2. 清空 Neo4j 数据库
+    2. 清空 Neo4j 数据库（增量模式下跳过）
     3. 解析 Excel 文件
-    4. 创建节点和关系
+    4. 创建节点和关系（增量模式下只写入与现有图的差异）
     5. 返回导入统计信息
 
+    Args:
+        mode: 导入模式，full 清空重建，incremental 增量导入
+
     Returns:
         ImportResult: 导入结果，包含统计信息和错误列表
     """
+    set_audit_context(request, remark=f"上传并导入文件: {file.filename}")
     try:
-        # 验证文件类型
-        if not file.filename or not file.filename.lower().endswith(('.xlsx', '.xls')):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="仅支持 .xlsx 或 .xls 格式的 Excel 文件"
-            )
-
-        # 读取文件内容
-        file_content = await file.read()
-
-        # 验证文件大小（限制 50MB）
-        max_size = 50 * 1024 * 1024
-        if len(file_content) > max_size:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"文件大小超过限制 ({max_size / 1024 / 1024}MB)"
-            )
+        # 验证并读取文件内容
+        file_content = await _read_excel_upload(file)
 
         # 生成文件ID
         file_id = DataImportService.generate_file_id()
 
         # 保存文件并创建数据库记录
-        _, file_path = DataImportService.save_uploaded_file(
-            file_content=file_content,
-            original_filename=file.filename,
-            file_id=file_id,
-            db=db,
-            user_id=current_user.get("id"),
-            username=current_user.get("username")
-        )
-
-        # 记录上传日志
-        await log_operation(
-            db=db,
-            user_id=current_user.get("id"),
-            username=current_user.get("username"),
-            action_type="UPLOAD",
-            module="data_import",
-            request=request,
-            status=1,
-            remark=f"上传并导入文件: {file.filename}"
+        file_path = await asyncio.to_thread(
+            _save_upload, file_content, file.filename, file_id, current_user
         )
 
-        # 执行导入
-        result = DataImportService.import_from_excel(
-            file_path=str(file_path),
-            db=db,
-            file_id=file_id
-        )
+        # 执行导入（在导入执行器中使用同步会话，与后台任务串行，不阻塞事件循环）
+        result = await ImportJobService.run_import_serial(str(file_path), file_id, mode)
 
         # 转换错误格式
         error_items = [
@@ -117,22 +145,11 @@ async def upload_and_import(
             message=result["message"]
         )
 
-        # 记录导入完成日志
-        status_code = 1 if result["success"] else 0
+        # 审计日志记录导入结果（导入失败时接口仍返回 200，状态记为失败）
         remark = f"导入完成: 节点{result['statistics']['total_nodes']}个, 关系{result['statistics']['relation_count']}条"
         if not result["success"]:
             remark = f"导入失败: {result['message']}"
-
-        await log_operation(
-            db=db,
-            user_id=current_user.get("id"),
-            username=current_user.get("username"),
-            action_type="IMPORT",
-            module="data_import",
-            request=request,
-            status=status_code,
-            remark=remark
-        )
+        set_audit_context(request, remark=f"{file.filename} {remark}", status=1 if result["success"] else 0)
 
         return import_result
 
@@ -140,16 +157,7 @@ async def upload_and_import(
         raise
     except Exception as e:
         logger.error(f"上传并导入失败: {e}")
-        await log_operation(
-            db=db,
-            user_id=current_user.get("id"),
-            username=current_user.get("username"),
-            action_type="UPLOAD_IMPORT",
-            module="data_import",
-            request=request,
-            status=0,
-            remark=f"操作失败: {str(e)}"
-        )
+        set_audit_context(request, remark=f"上传并导入文件失败: {file.filename}: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"操作失败: {str(e)}"
@@ -158,7 +166,7 @@ async def upload_and_import(
 
 @router.get("/records", response_model=List[FileListItem], summary="获取上传记录列表")
 async def get_upload_records(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_admin)
 ):
     """
@@ -170,9 +178,12 @@ async def get_upload_records(
         List[FileListItem]: 上传记录列表
     """
     try:
-        records = db.query(FileUploadRecord).order_by(
-            FileUploadRecord.upload_time.desc()
-        ).limit(100).all()
+        result = await db.execute(
+            select(FileUploadRecord).order_by(
+                FileUploadRecord.upload_time.desc()
+            ).limit(100)
+        )
+        records = result.scalars().all()
 
         return [
             FileListItem(
@@ -197,7 +208,7 @@ async def get_upload_records(
 @router.get("/records/{file_id}", summary="获取上传记录详情")
 async def get_upload_record(
     file_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_admin)
 ):
     """
@@ -210,9 +221,9 @@ async def get_upload_record(
         上传记录详情
     """
     try:
-        record = db.query(FileUploadRecord).filter(
-            FileUploadRecord.file_id == file_id
-        ).first()
+        record = await db.scalar(
+            select(FileUploadRecord).where(FileUploadRecord.file_id == file_id)
+        )
 
         if not record:
             raise HTTPException(
@@ -229,6 +240,10 @@ async def get_upload_record(
             "uploader_id": record.uploader_id,
             "uploader_name": record.uploader_name,
             "import_status": record.import_status,
+            "job_id": record.job_id,
+            "import_phase": record.import_phase,
+            "processed_rows": record.processed_rows,
+            "total_rows": record.total_rows,
             "statistics": {
                 "device_count": record.device_count,
                 "person_count": record.person_count,
@@ -255,10 +270,11 @@ async def get_upload_record(
 
 
 @router.delete("/records/{file_id}", summary="删除上传记录和文件")
+@audit(OperationLogService.MODULE_DATA_IMPORT, OperationLogService.ACTION_DELETE)
 async def delete_upload_record(
     request: Request,
     file_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_admin)
 ):
     """
@@ -272,9 +288,9 @@ async def delete_upload_record(
     """
     try:
         # 查找记录
-        record = db.query(FileUploadRecord).filter(
-            FileUploadRecord.file_id == file_id
-        ).first()
+        record = await db.scalar(
+            select(FileUploadRecord).where(FileUploadRecord.file_id == file_id)
+        )
 
         if not record:
             raise HTTPException(
@@ -283,26 +299,15 @@ async def delete_upload_record(
             )
 
         # 删除文件
-        from pathlib import Path
         file_path = Path(record.file_path)
         if file_path.exists():
             file_path.unlink()
 
         # 删除数据库记录
-        db.delete(record)
-        db.commit()
+        await db.delete(record)
+        await db.commit()
 
-        # 记录删除日志
-        await log_operation(
-            db=db,
-            user_id=current_user.get("id"),
-            username=current_user.get("username"),
-            action_type="DELETE",
-            module="data_import",
-            request=request,
-            status=1,
-            remark=f"删除文件记录: {record.filename}"
-        )
+        set_audit_context(request, remark=f"删除文件记录: {record.filename}")
 
         return {"success": True, "message": "文件记录已删除"}
 
@@ -317,14 +322,16 @@ async def delete_upload_record(
 
 
 @router.post("/reimport/{file_id}", response_model=ImportResult, summary="根据历史记录重新导入")
+@audit(OperationLogService.MODULE_DATA_IMPORT, OperationLogService.ACTION_REIMPORT)
 async def reimport_from_record(
     request: Request,
     file_id: str,
-    db: Session = Depends(get_db),
+    mode: Literal["full", "incremental"] = Query("full", description="导入模式: full 清空重建, incremental 增量（只写入差异）"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_admin)
 ):
     """
-    根据历史上传记录重新导入数据到 Neo4j（清空重建）
+    根据历史上传记录重新导入数据到 Neo4j（默认清空重建，mode=incremental 时增量导入）
 
     使用已保存的文件重新执行导入，适用于：
     - 回滚到之前的数据版本
@@ -332,15 +339,16 @@ async def reimport_from_record(
 
     Args:
         file_id: 历史上传记录的文件ID
+        mode: 导入模式，full 清空重建，incremental 增量导入
 
     Returns:
         ImportResult: 导入结果，包含统计信息和错误列表
     """
     try:
         # 查找记录
-        record = db.query(FileUploadRecord).filter(
-            FileUploadRecord.file_id == file_id
-        ).first()
+        record = await db.scalar(
+            select(FileUploadRecord).where(FileUploadRecord.file_id == file_id)
+        )
 
         if not record:
             raise HTTPException(
@@ -349,7 +357,6 @@ async def reimport_from_record(
             )
 
         # 检查文件是否存在
-        from pathlib import Path
         file_path = Path(record.file_path)
         if not file_path.exists():
             raise HTTPException(
@@ -357,24 +364,16 @@ async def reimport_from_record(
                 detail=f"文件不存在: {record.file_path}"
             )
 
-        # 记录重新导入日志
-        await log_operation(
-            db=db,
-            user_id=current_user.get("id"),
-            username=current_user.get("username"),
-            action_type="REIMPORT",
-            module="data_import",
-            request=request,
-            status=1,
-            remark=f"重新导入文件: {record.filename}"
-        )
+        if ImportJobService.is_running(record):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"该文件已有导入任务在执行: {record.job_id}"
+            )
 
-        # 执行导入
-        result = DataImportService.import_from_excel(
-            file_path=str(file_path),
-            db=db,
-            file_id=file_id
-        )
+        set_audit_context(request, remark=f"重新导入文件: {record.filename}")
+
+        # 执行导入（在导入执行器中使用同步会话，与后台任务串行，不阻塞事件循环）
+        result = await ImportJobService.run_import_serial(str(file_path), file_id, mode)
 
         # 转换错误格式
         error_items = [
@@ -395,22 +394,11 @@ async def reimport_from_record(
             message=result["message"]
         )
 
-        # 记录导入完成日志
-        status_code = 1 if result["success"] else 0
+        # 审计日志记录导入结果（导入失败时接口仍返回 200，状态记为失败）
         remark = f"重新导入完成: 节点{result['statistics']['total_nodes']}个, 关系{result['statistics']['relation_count']}条"
         if not result["success"]:
             remark = f"重新导入失败: {result['message']}"
-
-        await log_operation(
-            db=db,
-            user_id=current_user.get("id"),
-            username=current_user.get("username"),
-            action_type="REIMPORT",
-            module="data_import",
-            request=request,
-            status=status_code,
-            remark=remark
-        )
+        set_audit_context(request, remark=f"{record.filename} {remark}", status=1 if result["success"] else 0)
 
         return import_result
 
@@ -418,22 +406,132 @@ async def reimport_from_record(
         raise
     except Exception as e:
         logger.error(f"重新导入失败: {e}")
-        await log_operation(
-            db=db,
-            user_id=current_user.get("id"),
-            username=current_user.get("username"),
-            action_type="REIMPORT",
-            module="data_import",
-            request=request,
-            status=0,
-            remark=f"重新导入失败: {str(e)}"
-        )
+        set_audit_context(request, remark=f"重新导入失败: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"重新导入失败: {str(e)}"
         )
 
 
+@router.post("/jobs/upload-and-import", response_model=ImportStatus, summary="上传 Excel 文件并提交后台导入任务")
+@audit(OperationLogService.MODULE_DATA_IMPORT, OperationLogService.ACTION_UPLOAD)
+async def submit_upload_import_job(
+    request: Request,
+    file: UploadFile = File(..., description="Excel 文件"),
+    mode: Literal["full", "incremental"] = Query("full", description="导入模式: full 清空重建, incremental 增量（只写入差异）"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_admin)
+):
+    """
+    上传 Excel 文件并提交后台导入任务，立即返回任务ID
+
+    导入在后台线程中执行，通过 GET /jobs/{job_id} 轮询进度
+
+    Args:
+        mode: 导入模式，full 清空重建，incremental 增量导入
+
+    Returns:
+        ImportStatus: 任务初始状态（包含 job_id）
+    """
+    try:
+        file_content = await _read_excel_upload(file)
+
+        file_id = DataImportService.generate_file_id()
+        await asyncio.to_thread(
+            _save_upload, file_content, file.filename, file_id, current_user
+        )
+
+        record = await db.scalar(
+            select(FileUploadRecord).where(FileUploadRecord.file_id == file_id)
+        )
+        job_id = await ImportJobService.submit(db, record, mode=mode)
+
+        set_audit_context(request, remark=f"上传文件并提交导入任务: {file.filename} (任务ID: {job_id})")
+
+        return await ImportJobService.get_status(db, job_id)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"提交导入任务失败: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"提交导入任务失败: {str(e)}"
+        )
+
+
+@router.post("/jobs/reimport/{file_id}", response_model=ImportStatus, summary="根据历史记录提交后台重新导入任务")
+@audit(OperationLogService.MODULE_DATA_IMPORT, OperationLogService.ACTION_REIMPORT)
+async def submit_reimport_job(
+    request: Request,
+    file_id: str,
+    mode: Literal["full", "incremental"] = Query("full", description="导入模式: full 清空重建, incremental 增量（只写入差异）"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_admin)
+):
+    """
+    根据历史上传记录提交后台重新导入任务，立即返回任务ID
+
+    Args:
+        file_id: 历史上传记录的文件ID
+        mode: 导入模式，full 清空重建，incremental 增量导入
+
+    Returns:
+        ImportStatus: 任务初始状态（包含 job_id）
+    """
+    record = await db.scalar(
+        select(FileUploadRecord).where(FileUploadRecord.file_id == file_id)
+    )
+
+    if not record:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"上传记录不存在: {file_id}"
+        )
+
+    if not Path(record.file_path).exists():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"文件不存在: {record.file_path}"
+        )
+
+    if ImportJobService.is_running(record):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"该文件已有导入任务在执行: {record.job_id}"
+        )
+
+    job_id = await ImportJobService.submit(db, record, mode=mode)
+
+    set_audit_context(request, remark=f"提交重新导入任务: {record.filename} (任务ID: {job_id})")
+
+    return await ImportJobService.get_status(db, job_id)
+
+
+@router.get("/jobs/{job_id}", response_model=ImportStatus, summary="查询后台导入任务进度")
+async def get_import_job_status(
+    job_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_admin)
+):
+    """
+    查询后台导入任务的状态、阶段和行进度
+
+    Args:
+        job_id: 任务ID
+
+    Returns:
+        ImportStatus: 任务状态
+    """
+    job_status = await ImportJobService.get_status(db, job_id)
+    if not job_status:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"导入任务不存在: {job_id}"
+        )
+    return job_status
+
+
 @router.get("/health", summary="数据导入模块健康检查")
 async def health_check():
     """检查数据导入模块状态"""
@@ -444,7 +542,9 @@ async def health_check():
         return {
             "status": "healthy",
             "data_directory": str(DataImportService.DATA_DIR),
-            "directory_exists": DataImportService.DATA_DIR.exists()
+            "directory_exists": DataImportService.DATA_DIR.exists(),
+            "active_database": database_pointer.active,
+            "standby_database": database_pointer.standby
         }
     except Exception as e:
         return {
@@ -2,33 +2,41 @@
 知识图谱 API 接口
 提供知识图谱关键词检索和可视化功能
 """
+from typing import Optional
 from fastapi import APIRouter, HTTPException, status, Query, Request, Depends
-from sqlalchemy.orm import Session
 
-from app.models import get_db
 from app.schemas.knowledge_graph import (
     GraphDataResponse,
-    GraphStatistics
+    GraphStatistics,
+    NeighborBatchRequest
+)
+from app.services.knowledge_graph_service import (
+    KnowledgeGraphService,
+    NEIGHBOR_DEFAULT_MAX_NODES,
+    GRAPH_PAGE_DEFAULT_SIZE,
+    GRAPH_STREAM_MAX_NODES
 )
-from app.services.knowledge_graph_service import KnowledgeGraphService
 from app.services.operation_log_service import OperationLogService
-from app.core.deps import get_current_user
-from app.core.logger_helper import log_operation
+from app.core.audit import audit, set_audit_context
+from app.core.deps import get_current_user, get_current_admin
+from app.core.responses import ORJSONResponse, wants_ndjson, ndjson_response
 
-# 创建路由器
-router = APIRouter()
+# 创建路由器（图谱结果体积大，使用 orjson 序列化）
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 @router.get("/statistics", response_model=GraphStatistics, summary="获取图谱统计信息")
 async def get_statistics():
     """
-    获取知识图谱的统计信息
+    获取知识图谱的统计信息（各标签节点数、各关系类型关系数）
+
+    统计信息来自进程内快照，导入完成后或超过 GRAPH_STATISTICS_TTL 秒后刷新
 
     Returns:
         GraphStatistics: 统计信息
     """
     try:
-        stats = KnowledgeGraphService.get_graph_statistics()
+        stats = await KnowledgeGraphService.get_graph_statistics()
         return GraphStatistics(**stats)
     except Exception as e:
         # 即使出错也返回基本的统计结构
@@ -41,17 +49,21 @@ async def get_statistics():
 
 
 @router.post("/search", summary="关键词搜索")
+@audit(OperationLogService.MODULE_KNOWLEDGE_GRAPH, OperationLogService.ACTION_SEARCH)
 async def search_nodes(
     request: Request,
     keyword: str = Query(..., description="搜索关键词", min_length=1),
     limit: int = Query(100, ge=1, le=1000, description="最大返回结果数"),
-    db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     多字段智能搜索节点（全文索引 + 多字段回退）
 
-    支持搜索字段：设备名称、设备型号、姓名、工艺名称、物料名称、故障名称、故障现象等
+    全文索引的结果按相关度排在前面，不足 limit 个时用全属性扫描的结果补足（按节点去重）
+
+    支持搜索字段：设备名称、设备型号、姓名、工艺名称、物料名称、故障名称、故障现象等。
+    请求头 Accept: application/x-ndjson 时以 NDJSON 流式返回（先节点、后关系、最后 end 标记）：
+    匹配的节点（最多 limit 个）在请求时整体查出，关系从查询游标逐条输出
 
     Args:
         keyword: 搜索关键词
@@ -60,39 +72,21 @@ async def search_nodes(
     Returns:
         包含节点和关系的数据
     """
-    try:
-        result = KnowledgeGraphService.search_all_nodes(
-            keyword=keyword,
-            limit=limit
-        )
+    set_audit_context(request, remark="执行关键词搜索")
 
-        # 记录搜索日志（不记录搜索的具体内容）
-        await log_operation(
-            db=db,
-            user_id=current_user.get("id"),
-            username=current_user.get("username"),
-            action_type=OperationLogService.ACTION_SEARCH,
-            module=OperationLogService.MODULE_KNOWLEDGE_GRAPH,
-            request=request,
-            status=1,
-            remark="执行关键词搜索"
-        )
+    try:
+        if wants_ndjson(request):
+            result = ndjson_response(await KnowledgeGraphService.stream_search(keyword=keyword, limit=limit))
+        else:
+            # 直接返回响应对象，跳过 jsonable_encoder
+            result = ORJSONResponse(await KnowledgeGraphService.search_all_nodes(
+                keyword=keyword,
+                limit=limit
+            ))
 
         return result
 
     except Exception as e:
-        # 记录搜索失败日志
-        await log_operation(
-            db=db,
-            user_id=current_user.get("id"),
-            username=current_user.get("username"),
-            action_type=OperationLogService.ACTION_SEARCH,
-            module=OperationLogService.MODULE_KNOWLEDGE_GRAPH,
-            request=request,
-            status=0,
-            remark=f"搜索失败: {str(e)}"
-        )
-
         import traceback
         import logging
         logging.error(f"搜索失败详细错误: {traceback.format_exc()}")
@@ -103,36 +97,39 @@ async def search_nodes(
 
 
 @router.get("/graph-data", summary="获取图谱数据用于可视化")
+@audit(OperationLogService.MODULE_KNOWLEDGE_GRAPH, OperationLogService.ACTION_QUERY)
 async def get_graph_data(
     request: Request,
-    limit: int = Query(100, ge=1, le=1000, description="最大节点数"),
-    db: Session = Depends(get_db),
+    limit: int = Query(100, ge=1, le=GRAPH_STREAM_MAX_NODES, description="最大节点数（非流式最大 1000）"),
     current_user: dict = Depends(get_current_user)
 ):
     """
     获取图谱数据（节点和关系）用于可视化展示
 
+    请求头 Accept: application/x-ndjson 时节点和关系直接从 Neo4j 查询游标流式返回，
+    服务端内存占用与节点数无关，此时 limit 最大为 GRAPH_STREAM_MAX_NODES
+
     Args:
         limit: 最大返回节点数
 
     Returns:
         包含节点和关系的数据
     """
-    try:
-        data = KnowledgeGraphService.get_graph_data(limit=limit)
-
-        # 记录查询日志
-        await log_operation(
-            db=db,
-            user_id=current_user.get("id"),
-            username=current_user.get("username"),
-            action_type=OperationLogService.ACTION_QUERY,
-            module=OperationLogService.MODULE_KNOWLEDGE_GRAPH,
-            request=request,
-            status=1,
-            remark=f"获取图谱数据，限制: {limit}"
+    set_audit_context(request, remark=f"获取图谱数据，限制: {limit}")
+
+    streaming = wants_ndjson(request)
+    if not streaming and limit > 1000:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="非流式请求的 limit 不能超过 1000，获取更多节点请使用 Accept: application/x-ndjson 或分页接口"
         )
 
+    try:
+        if streaming:
+            data = ndjson_response(await KnowledgeGraphService.stream_graph_data(limit=limit))
+        else:
+            data = ORJSONResponse(await KnowledgeGraphService.get_graph_data(limit=limit))
+
         return data
     except Exception as e:
         import traceback
@@ -144,11 +141,53 @@ async def get_graph_data(
         )
 
 
+@router.get("/graph-data/page", summary="分页获取图谱数据")
+@audit(OperationLogService.MODULE_KNOWLEDGE_GRAPH, OperationLogService.ACTION_QUERY)
+async def get_graph_data_page(
+    request: Request,
+    page_size: int = Query(GRAPH_PAGE_DEFAULT_SIZE, ge=1, le=5000, description="每页节点数"),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor，为空时从第一页开始"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    按游标分页获取图谱数据，前端可逐页加载大图
+
+    每页返回本页节点以及本页节点与已加载节点之间的关系，逐页合并即为完整的图。
+    分页期间图被重新导入时返回 400，需要从第一页重新加载
+
+    Args:
+        page_size: 每页节点数
+        cursor: 分页游标
+
+    Returns:
+        nodes、edges、next_cursor、has_more
+    """
+    set_audit_context(request, remark=f"分页获取图谱数据，每页: {page_size}，{'后续页' if cursor else '第一页'}")
+
+    try:
+        data = ORJSONResponse(await KnowledgeGraphService.get_graph_data_page(page_size=page_size, cursor=cursor))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        import traceback
+        import logging
+        logging.error(f"分页获取图谱数据失败: {traceback.format_exc()}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"分页获取图谱数据失败: {str(e)}"
+        )
+
+    return data
+
+
 @router.get("/health", summary="知识图谱模块健康检查")
-def health_check():
-    """检查 Neo4j 连接状态"""
+async def health_check():
+    """检查 Neo4j 连接状态（使用统计快照，不会每次都查询 Neo4j）"""
     try:
-        stats = KnowledgeGraphService.get_graph_statistics()
+        stats = await KnowledgeGraphService.get_graph_statistics()
         return {
             "status": "healthy" if stats.get("connected") else "unhealthy",
             "neo4j_connected": stats.get("connected", False),
@@ -162,41 +201,63 @@ def health_check():
         }
 
 
+@router.get("/cache/stats", summary="获取查询结果缓存统计（管理员）")
+def get_cache_stats(current_user: dict = Depends(get_current_admin)):
+    """
+    获取本工作进程的查询结果缓存统计（条目数、命中率、淘汰和过期次数、当前图版本）
+    """
+    return KnowledgeGraphService.get_cache_stats()
+
+
 @router.get("/neighbors/{node_id}", summary="获取节点的邻居")
+@audit(OperationLogService.MODULE_KNOWLEDGE_GRAPH, OperationLogService.ACTION_QUERY)
 async def get_node_neighbors(
     request: Request,
     node_id: str,
     depth: int = Query(1, ge=1, le=3, description="扩展深度"),
-    db: Session = Depends(get_db),
+    max_nodes: Optional[int] = Query(
+        None, ge=1, le=5000,
+        description=f"返回的邻居节点总数上限（默认 depth=1 不限制，depth>1 为 {NEIGHBOR_DEFAULT_MAX_NODES}）"
+    ),
+    per_hop_limit: Optional[int] = Query(None, ge=1, le=5000, description="每一跳新增节点数上限"),
     current_user: dict = Depends(get_current_user)
 ):
     """
     获取指定节点的邻居节点和关系，用于点击展开
 
+    depth 大于 1 时一次返回整个邻域子图（逐跳扩展、节点去重），
+    超过 max_nodes 或 per_hop_limit 时截断并返回 truncated=true。
+    未指定 max_nodes 时 depth=1 返回全部直接邻居，depth 大于 1 最多返回 NEIGHBOR_DEFAULT_MAX_NODES 个节点。
+    请求头 Accept: application/x-ndjson 时以 NDJSON 流式返回，truncated 在 end 标记中：
+    depth=1 时邻居和关系直接从查询游标逐条输出（不经过结果缓存）；
+    depth 大于 1 时邻域子图在请求时整体查出（经过结果缓存，受 max_nodes 限制）后再逐条输出
+
     Args:
         node_id: 节点的 elementId
         depth: 扩展深度（1-3，默认为1）
+        max_nodes: 返回的邻居节点总数上限（可选）
+        per_hop_limit: 每一跳新增节点数上限
 
     Returns:
-        包含邻居节点和关系的数据
+        包含邻居节点、关系和截断标记的数据
     """
-    try:
-        result = KnowledgeGraphService.get_node_neighbors(
-            node_id=node_id,
-            depth=depth
-        )
+    set_audit_context(request, remark=f"获取节点邻居，节点ID: {node_id}")
 
-        # 记录查询日志
-        await log_operation(
-            db=db,
-            user_id=current_user.get("id"),
-            username=current_user.get("username"),
-            action_type=OperationLogService.ACTION_QUERY,
-            module=OperationLogService.MODULE_KNOWLEDGE_GRAPH,
-            request=request,
-            status=1,
-            remark=f"获取节点邻居，节点ID: {node_id}"
-        )
+    try:
+        if wants_ndjson(request):
+            result = ndjson_response(await KnowledgeGraphService.stream_node_neighbors(
+                node_id=node_id,
+                depth=depth,
+                max_nodes=max_nodes,
+                per_hop_limit=per_hop_limit
+            ))
+        else:
+            result = ORJSONResponse(await KnowledgeGraphService.get_node_neighbors(
+                node_id=node_id,
+                depth=depth,
+                max_nodes=max_nodes,
+                per_hop_limit=per_hop_limit
+            ))
 
         return result
     except Exception as e:
@@ -207,3 +268,42 @@ async def get_node_neighbors(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"获取节点邻居失败: {str(e)}"
         )
+
+
+@router.post("/neighbors/batch", summary="批量获取多个节点的邻居")
+@audit(OperationLogService.MODULE_KNOWLEDGE_GRAPH, OperationLogService.ACTION_QUERY)
+async def get_neighbors_batch(
+    request: Request,
+    batch: NeighborBatchRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    批量展开多个节点的邻居，返回合并后的子图，用于框选后一次性展开
+
+    节点和关系均已去重，返回的节点不包含请求中的节点
+
+    Args:
+        batch: 节点 elementId 列表、扩展深度和节点数上限
+
+    Returns:
+        包含邻居节点、关系和截断标记的数据
+    """
+    set_audit_context(request, remark=f"批量获取节点邻居，节点数: {len(batch.node_ids)}")
+
+    try:
+        result = ORJSONResponse(await KnowledgeGraphService.get_neighbors_batch(
+            node_ids=batch.node_ids,
+            depth=batch.depth,
+            max_nodes=batch.max_nodes,
+            per_hop_limit=batch.per_hop_limit
+        ))
+
+        return result
+    except Exception as e:
+        import traceback
+        import logging
+        logging.error(f"批量获取节点邻居失败: {traceback.format_exc()}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"批量获取节点邻居失败: {str(e)}"
+        )
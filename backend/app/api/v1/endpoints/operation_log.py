@@ -2,22 +2,60 @@
 操作日志 API 端点
 提供日志查询、统计等接口，仅管理员可访问
 """
-from typing import Optional
-from fastapi import APIRouter, Depends, Query, status
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_current_admin
-from app.models import get_db, OperationLog
+from app.core.log_writer import operation_log_writer
+from app.core.responses import ORJSONResponse
+from app.models import get_async_db, OperationLog
 from app.schemas.operation_log import (
     OperationLogResponse,
     OperationLogListResponse,
+    OperationLogPageResponse,
     OperationLogQuery,
     OperationLogStatistics
 )
 from app.services.operation_log_service import OperationLogService
 
 # 创建路由器
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+
+def _build_query(
+    username: Optional[str],
+    action_type: Optional[str],
+    module: Optional[str],
+    status: Optional[int],
+    start_date: Optional[str],
+    end_date: Optional[str]
+) -> Optional[OperationLogQuery]:
+    """根据查询参数构建查询对象，没有筛选条件时返回 None"""
+    if not any([username, action_type, module, status is not None, start_date, end_date]):
+        return None
+
+    query_data = {}
+    if username:
+        query_data["username"] = username
+    if action_type:
+        query_data["action_type"] = action_type
+    if module:
+        query_data["module"] = module
+    if status is not None:
+        query_data["status"] = status
+    if start_date:
+        try:
+            query_data["start_date"] = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
+        except ValueError:
+            pass
+    if end_date:
+        try:
+            query_data["end_date"] = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+        except ValueError:
+            pass
+    return OperationLogQuery(**query_data)
 
 
 @router.get(
@@ -35,7 +73,7 @@ async def get_operation_logs(
     status: Optional[int] = Query(None, ge=0, le=1, description="按状态筛选"),
     start_date: Optional[str] = Query(None, description="开始时间（ISO格式）"),
     end_date: Optional[str] = Query(None, description="结束时间（ISO格式）"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_admin)
 ):
     """
@@ -63,34 +101,10 @@ async def get_operation_logs(
     }
     ```
     """
-    from datetime import datetime
-
-    # 构建查询对象
-    query = None
-    if any([username, action_type, module, status is not None, start_date, end_date]):
-        query_data = {}
-        if username:
-            query_data["username"] = username
-        if action_type:
-            query_data["action_type"] = action_type
-        if module:
-            query_data["module"] = module
-        if status is not None:
-            query_data["status"] = status
-        if start_date:
-            try:
-                query_data["start_date"] = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-            except ValueError:
-                pass
-        if end_date:
-            try:
-                query_data["end_date"] = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-            except ValueError:
-                pass
-        query = OperationLogQuery(**query_data)
+    query = _build_query(username, action_type, module, status, start_date, end_date)
 
     # 获取日志列表
-    logs, total = OperationLogService.get_logs(db, skip=skip, limit=limit, query=query)
+    logs, total = await OperationLogService.get_logs(db, skip=skip, limit=limit, query=query)
 
     # 转换为响应模型
     items = [OperationLogResponse.model_validate(log) for log in logs]
@@ -98,6 +112,72 @@ async def get_operation_logs(
     return OperationLogListResponse(total=total, items=items)
 
 
+@router.get(
+    "/logs/page",
+    response_model=OperationLogPageResponse,
+    summary="游标分页获取操作日志列表",
+    description="按 (操作时间, ID) 键集分页获取操作日志，每页代价与页码无关，支持精确、封顶和估算三种总数，仅管理员可访问"
+)
+async def get_operation_logs_page(
+    limit: int = Query(10, ge=1, le=100, description="每页记录数"),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor，为空时从第一页开始"),
+    total_mode: Literal["exact", "capped", "approx", "none"] = Query(
+        "capped", description="总数计算方式: exact 精确, capped 封顶计数, approx 估算, none 不计算"
+    ),
+    username: Optional[str] = Query(None, description="按用户名筛选"),
+    action_type: Optional[str] = Query(None, description="按行为类型筛选"),
+    module: Optional[str] = Query(None, description="按模块筛选"),
+    status: Optional[int] = Query(None, ge=0, le=1, description="按状态筛选"),
+    start_date: Optional[str] = Query(None, description="开始时间（ISO格式）"),
+    end_date: Optional[str] = Query(None, description="结束时间（ISO格式）"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_admin)
+):
+    """
+    游标分页获取操作日志列表
+
+    权限要求：仅管理员
+
+    分页参数：
+    - limit: 每页记录数，默认10，最大100
+    - cursor: 上一页返回的 next_cursor；翻页时筛选条件需与第一页保持一致
+
+    总数计算方式（total_mode）：
+    - exact: 精确计数（与 /logs 相同，日志量大时较慢）
+    - capped: 最多计数到 OPERATION_LOG_COUNT_CAP 条，超过时 total 为上限、total_exact 为 false（默认）
+    - approx: 无筛选条件时返回 MySQL 统计信息中的估算行数，有筛选条件时按 capped 计算
+    - none: 不计算总数，翻页时可沿用第一页的总数
+
+    筛选参数与 /logs 相同
+
+    返回格式：
+    ```json
+    {
+        "items": [...],
+        "next_cursor": "...",
+        "has_more": true,
+        "total": 10000,
+        "total_exact": false
+    }
+    ```
+    """
+    query = _build_query(username, action_type, module, status, start_date, end_date)
+
+    try:
+        page = await OperationLogService.get_logs_page(
+            db, limit=limit, cursor=cursor, query=query, total_mode=total_mode
+        )
+    except ValueError as e:
+        # 参数 status 与 fastapi.status 同名，这里直接使用状态码
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+
+    page["items"] = [OperationLogResponse.model_validate(log) for log in page["items"]]
+    return OperationLogPageResponse(**page)
+
+
 @router.get(
     "/logs/{log_id}",
     response_model=OperationLogResponse,
@@ -106,7 +186,7 @@ async def get_operation_logs(
 )
 async def get_operation_log(
     log_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_admin)
 ):
     """
@@ -119,9 +199,8 @@ async def get_operation_log(
 
     返回指定ID的日志详细信息
     """
-    log = OperationLogService.get_log_by_id(db, log_id)
+    log = await OperationLogService.get_log_by_id(db, log_id)
     if not log:
-        from fastapi import HTTPException
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="日志不存在"
@@ -136,7 +215,7 @@ async def get_operation_log(
     description="获取操作日志的统计信息，包括总数、今日数量、按类型/模块/用户统计，仅管理员可访问"
 )
 async def get_log_statistics(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_admin)
 ):
     """
@@ -151,10 +230,33 @@ async def get_log_statistics(
     - module_stats: 按模块统计
     - user_stats: 按用户统计（前10名）
     """
-    stats = OperationLogService.get_statistics(db)
+    stats = await OperationLogService.get_statistics(db)
     return OperationLogStatistics(**stats)
 
 
+@router.get(
+    "/logs/writer/stats",
+    summary="获取操作日志写入器状态",
+    description="获取操作日志缓冲队列的长度和写入、丢弃、失败计数，仅管理员可访问"
+)
+async def get_log_writer_stats(
+    current_user: dict = Depends(get_current_admin)
+):
+    """
+    获取操作日志写入器状态
+
+    权限要求：仅管理员
+
+    返回信息：
+    - queue_size: 当前缓冲的日志数
+    - enqueued / written: 入队和已写入的日志数
+    - dropped: 队列已满（或写入器未运行）时丢弃的日志数
+    - failed: 批量写入失败的日志数
+    - backpressure_waits: 因队列已满而等待的次数
+    """
+    return operation_log_writer.stats()
+
+
 @router.get(
     "/logs/recent",
     response_model=list[OperationLogResponse],
@@ -163,7 +265,7 @@ async def get_log_statistics(
 )
 async def get_recent_logs(
     limit: int = Query(10, ge=1, le=50, description="返回记录数"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_admin)
 ):
     """
@@ -176,5 +278,5 @@ async def get_recent_logs(
 
     返回最近的操作日志列表，按时间倒序排列
     """
-    logs = OperationLogService.get_recent_logs(db, limit=limit)
+    logs = await OperationLogService.get_recent_logs(db, limit=limit)
     return [OperationLogResponse.model_validate(log) for log in logs]
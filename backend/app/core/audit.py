@@ -0,0 +1,173 @@
+"""
+请求审计中间件
+每个请求结束时根据路由上声明的模块和行为类型生成一条操作日志，交给缓冲写入器异步写入
+
+使用方式：
+    @router.post("/search", summary="关键词搜索")
+    @audit(OperationLogService.MODULE_KNOWLEDGE_GRAPH, OperationLogService.ACTION_SEARCH)
+    async def search_nodes(...):
+        ...
+
+说明：
+- 未声明 @audit 的路由（健康检查、统计等）不记录
+- 用户从请求头的 Bearer 令牌中解析；登录等没有令牌的接口通过 set_audit_context 补充
+- 状态按响应码判断（< 400 为成功），认证失败、参数校验失败和未捕获的异常同样记录为失败
+"""
+import time
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Request
+from starlette.datastructures import Headers
+
+from app.core.log_writer import operation_log_writer
+from app.core.security import decode_access_token
+
+logger = logging.getLogger(__name__)
+
+# 备注字段的最大长度（与 OperationLog.remark 一致）
+REMARK_MAX_LENGTH = 500
+# 用户代理字段的最大长度（与 OperationLog.user_agent 一致）
+USER_AGENT_MAX_LENGTH = 500
+# 无法识别用户时记录的用户名
+ANONYMOUS_USERNAME = "anonymous"
+
+
+def audit(module: str, action_type: str) -> Callable:
+    """
+    声明接口的审计模块和行为类型（写在 @router.xxx 下方）
+
+    Args:
+        module: 操作模块 (使用 OperationLogService 中的常量)
+        action_type: 行为类型 (使用 OperationLogService 中的常量)
+    """
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.__audit__ = {"module": module, "action_type": action_type}
+        return endpoint
+    return decorator
+
+
+def set_audit_context(request: Request, **fields: Any) -> None:
+    """
+    补充当前请求审计记录的字段，由中间件在请求结束时读取
+
+    Args:
+        request: FastAPI 请求对象
+        **fields: user_id、username、remark、status（接口返回 200 但业务失败时设为 0）
+    """
+    request.state.audit = {**getattr(request.state, "audit", {}), **fields}
+
+
+def _client_ip(headers: Headers, client: Optional[Tuple[str, int]]) -> Optional[str]:
+    """从代理请求头或连接信息中获取客户端 IP"""
+    ip_address = (
+        headers.get("X-Forwarded-For") or
+        headers.get("X-Real-IP") or
+        headers.get("CF-Connecting-IP") or
+        (client[0] if client else None)
+    )
+    # 如果 X-Forwarded-For 包含多个 IP，取第一个
+    if ip_address and "," in ip_address:
+        ip_address = ip_address.split(",")[0].strip()
+    return ip_address
+
+
+def _token_user(headers: Headers) -> Dict[str, Any]:
+    """从 Bearer 令牌中解析用户，令牌缺失或无效时返回空字典"""
+    scheme, _, token = headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return {}
+    payload = decode_access_token(token)
+    if not payload:
+        return {}
+    try:
+        user_id = int(payload.get("sub"))
+    except (TypeError, ValueError):
+        return {}
+    return {"user_id": user_id, "username": payload.get("username")}
+
+
+class AuditMiddleware:
+    """
+    请求审计 ASGI 中间件
+
+    不读取也不缓冲响应体，流式响应照常逐块发送；耗时为整个响应发送完成的时间
+    """
+
+    def __init__(self, app, sink: Optional[Callable[[Dict[str, Any]], Any]] = None):
+        """
+        Args:
+            app: 下游 ASGI 应用
+            sink: 接收日志记录的函数，不能阻塞；默认放入操作日志写入器的队列
+        """
+        self.app = app
+        self.sink = sink
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        created_at = datetime.utcnow()
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        error = None
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            try:
+                self._record(scope, status_code, error, created_at, time.perf_counter() - start)
+            except Exception as e:
+                # 审计失败不影响请求
+                logger.error(f"生成审计日志失败: {e}")
+
+    def _record(
+        self,
+        scope,
+        status_code: int,
+        error: Optional[Exception],
+        created_at: datetime,
+        elapsed: float
+    ) -> None:
+        """根据路由匹配结果生成日志记录并交给 sink"""
+        # 路由匹配后 Router 会把 endpoint 写入同一个 scope
+        spec = getattr(scope.get("endpoint"), "__audit__", None)
+        if spec is None:
+            return
+
+        headers = Headers(scope=scope)
+        context = (scope.get("state") or {}).get("audit", {})
+        user = {**_token_user(headers), **context}
+        success = error is None and status_code < 400 and context.get("status", 1) == 1
+
+        remark = context.get("remark") or f"{scope['method']} {scope['path']}"
+        if error is not None:
+            remark = f"{remark} (异常 {type(error).__name__}: {error})"
+        elif status_code >= 400:
+            remark = f"{remark} (HTTP {status_code})"
+
+        user_agent = headers.get("User-Agent")
+        record = {
+            "user_id": user.get("user_id") or 0,
+            "username": user.get("username") or ANONYMOUS_USERNAME,
+            "action_type": spec["action_type"],
+            "module": spec["module"],
+            "ip_address": _client_ip(headers, scope.get("client")),
+            "user_agent": user_agent[:USER_AGENT_MAX_LENGTH] if user_agent else None,
+            "status": 1 if success else 0,
+            "remark": remark[:REMARK_MAX_LENGTH],
+            "duration_ms": round(elapsed * 1000),
+            "created_at": created_at
+        }
+        (self.sink or operation_log_writer.write_nowait)(record)
@@ -0,0 +1,108 @@
+"""
+进程内结果缓存
+带容量上限（LRU 淘汰）和过期时间（TTL）的线程安全缓存，并统计命中/未命中次数
+"""
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    TTL + LRU 缓存
+
+    Example:
+        ```python
+        cache = TTLCache(maxsize=1024, ttl=300)
+        value = cache.get_or_load(("search", "开机", 100), lambda: expensive_query())
+        ```
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300, timer: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            maxsize: 最大条目数，超出时淘汰最久未使用的条目
+            ttl: 条目过期时间（秒）
+            timer: 时钟函数（测试时可替换）
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._lock = threading.Lock()
+        # key -> (过期时间, 值)，按最近使用顺序排列（末尾为最近使用）
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        读取缓存
+
+        Returns:
+            tuple: (是否命中, 值)
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self._timer():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._data[key]
+                self.expirations += 1
+            self.misses += 1
+            return False, None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (self._timer() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        读取缓存，未命中时调用 loader 加载并写入
+
+        loader 抛出异常时不写入缓存；并发未命中时可能重复加载（不持锁执行 loader）
+        """
+        hit, value = self.get(key)
+        if hit:
+            return value
+        value = loader()
+        self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        """清空缓存（保留统计计数）"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """缓存统计信息"""
+        with self._lock:
+            total = self.hits + self.misses
+            stats = {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+        if extra:
+            stats.update(extra)
+        return stats
@@ -21,6 +21,9 @@ class Settings(BaseSettings):
     DB_USER: str
     DB_PASSWORD: str
     DB_NAME: str
+    # 异步数据库连接 URL（可选），为空时通过 aiomysql 连接上面配置的 MySQL；
+    # 测试时可配置为 sqlite+aiosqlite:///./test.db，不需要 MySQL
+    DATABASE_ASYNC_URL: str = ""
 
     # =========================
     # JWT 配置
@@ -36,6 +39,9 @@ class Settings(BaseSettings):
     NEO4J_USER: str
     NEO4J_PASSWORD: str
     NEO4J_DATABASE: str
+    # 备用数据库（需要企业版多数据库支持）。配置后全量导入写入非在线的一侧，
+    # 校验通过后再切换在线数据库；为空时全量导入在 NEO4J_DATABASE 中原地清空重建
+    NEO4J_STANDBY_DATABASE: str = ""
 
     # =========================
     # Qwen 大模型配置
@@ -46,6 +52,48 @@ class Settings(BaseSettings):
     # 对话记忆轮数限制
     CHAT_MEMORY_LIMIT: int = 3
 
+    # =========================
+    # 数据导入配置
+    # =========================
+    # 批量写入 Neo4j 时每个事务包含的行数
+    IMPORT_BATCH_SIZE: int = 5000
+    # 清空图数据库时每个事务删除的关系/节点数
+    IMPORT_DELETE_BATCH_SIZE: int = 10000
+    # 是否使用 openpyxl 只读模式流式解析 Excel（大文件内存占用更低）
+    IMPORT_STREAMING_READ: bool = False
+    # 是否使用进程池并行解析各工作表（非流式模式下生效）
+    IMPORT_PARALLEL_PARSE: bool = False
+    # 并行解析的进程数，0 表示 min(工作表数, CPU 核数)
+    IMPORT_PARSE_WORKERS: int = 0
+
+    # =========================
+    # 知识图谱检索配置
+    # =========================
+    # 是否在进程内维护 n-gram 倒排索引，用于关键词子串搜索（内存占用与图的属性文本量成正比）
+    SEARCH_NGRAM_INDEX: bool = False
+    # 是否缓存搜索、邻居展开和图谱数据的查询结果（导入成功后自动失效）
+    GRAPH_CACHE_ENABLED: bool = True
+    # 结果缓存的最大条目数（LRU 淘汰）
+    GRAPH_CACHE_MAXSIZE: int = 1024
+    # 结果缓存的过期时间（秒）
+    GRAPH_CACHE_TTL: int = 300
+    # 图谱统计快照的刷新间隔（秒），健康检查和统计接口在此期间直接返回快照
+    GRAPH_STATISTICS_TTL: int = 60
+
+    # =========================
+    # 操作日志配置
+    # =========================
+    # 操作日志缓冲队列的最大长度
+    OPERATION_LOG_QUEUE_SIZE: int = 10000
+    # 每批插入 MySQL 的最大日志数
+    OPERATION_LOG_BATCH_SIZE: int = 200
+    # 日志最多缓冲多少毫秒后写入（从一批中的第一条日志入队开始计时）
+    OPERATION_LOG_FLUSH_INTERVAL_MS: int = 500
+    # 队列已满时请求最多等待的毫秒数（背压），超时后丢弃并计入 dropped
+    OPERATION_LOG_ENQUEUE_TIMEOUT_MS: int = 50
+    # 游标分页接口 capped 模式下最多计数的日志数，超过时总数显示为“超过该值”
+    OPERATION_LOG_COUNT_CAP: int = 10000
+
     # =========================
     # 前端配置
     # =========================
@@ -56,6 +104,13 @@ class Settings(BaseSettings):
         """生成数据库连接 URL"""
         return f"mysql+pymysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        """生成异步数据库连接 URL"""
+        if self.DATABASE_ASYNC_URL:
+            return self.DATABASE_ASYNC_URL
+        return f"mysql+aiomysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+
     class Config:
         # 使用绝对路径，确保从任何目录运行都能找到 .env 文件
         env_file = BASE_DIR / ".env"
@@ -0,0 +1,202 @@
+"""
+操作日志缓冲写入器
+接口把日志记录放入进程内的有界队列后立即返回，由后台任务按批量大小或时间间隔批量插入 MySQL
+
+说明：
+- 队列已满时写入方最多等待 OPERATION_LOG_ENQUEUE_TIMEOUT_MS 毫秒（背压），仍无空位则丢弃并计数
+- 应用关闭时先停止接收，再把队列中剩余的日志全部写入后退出
+- 写入器未启动时（脚本、测试）write_nowait 直接丢弃并计数，审计日志只在应用运行时记录
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.models.base import AsyncSessionLocal
+from app.models.operation_log import OperationLog
+
+logger = logging.getLogger(__name__)
+
+# 停止信号：放在队列末尾，保证它之前入队的日志都会被写入
+_STOP = object()
+
+
+class OperationLogWriter:
+    """操作日志缓冲写入器类"""
+
+    def __init__(
+        self,
+        maxsize: int,
+        batch_size: int,
+        flush_interval_ms: int,
+        enqueue_timeout_ms: int,
+        session_factory=AsyncSessionLocal
+    ):
+        """
+        初始化写入器
+
+        Args:
+            maxsize: 队列最大长度
+            batch_size: 每批最多插入的行数
+            flush_interval_ms: 一批中第一条日志最多等待多少毫秒后写入
+            enqueue_timeout_ms: 队列已满时写入方最多等待的毫秒数
+            session_factory: 异步会话工厂
+        """
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.enqueue_timeout = enqueue_timeout_ms / 1000
+        self._session_factory = session_factory
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._accepting = False
+
+        # 统计计数
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self.backpressure_waits = 0
+
+    @property
+    def running(self) -> bool:
+        """写入器是否在接收日志"""
+        return self._accepting
+
+    def start(self) -> None:
+        """在当前事件循环中启动后台写入任务"""
+        if self._accepting:
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._task = asyncio.create_task(self._run(), name="operation-log-writer")
+        self._accepting = True
+        logger.info(
+            f"操作日志写入器已启动 (队列长度: {self.maxsize}, 批量: {self.batch_size}, "
+            f"间隔: {self.flush_interval * 1000:.0f}ms)"
+        )
+
+    async def stop(self) -> None:
+        """停止接收日志，写入队列中剩余的日志后退出"""
+        if not self._accepting:
+            return
+        self._accepting = False
+        # 停止信号排在已入队的日志之后；队列已满时等待后台任务腾出空位
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+        logger.info(f"操作日志写入器已停止: {self.stats()}")
+
+    async def write(self, record: Dict[str, Any]) -> bool:
+        """
+        将一条日志放入队列
+
+        队列已满时最多等待 enqueue_timeout 秒，超时则丢弃
+
+        Args:
+            record: OperationLog 的列值字典
+
+        Returns:
+            bool: 是否成功入队
+        """
+        if not self._accepting:
+            self.dropped += 1
+            return False
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self.backpressure_waits += 1
+            try:
+                await asyncio.wait_for(self._queue.put(record), self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                self.dropped += 1
+                logger.warning(f"操作日志队列已满，丢弃日志: {record.get('action_type')} {record.get('username')}")
+                return False
+        self.enqueued += 1
+        return True
+
+    def write_nowait(self, record: Dict[str, Any]) -> bool:
+        """
+        将一条日志放入队列，队列已满时立即丢弃（用于不能等待的调用方）
+
+        Returns:
+            bool: 是否成功入队
+        """
+        if not self._accepting:
+            self.dropped += 1
+            return False
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        self.enqueued += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """写入器统计信息"""
+        return {
+            "running": self._accepting,
+            "queue_size": self._queue.qsize() if self._queue else 0,
+            "maxsize": self.maxsize,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+            "backpressure_waits": self.backpressure_waits
+        }
+
+    async def _run(self) -> None:
+        """后台任务：凑满一批或等待超时后批量写入，收到停止信号时写完当前批次后退出"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            record = await self._queue.get()
+            if record is _STOP:
+                break
+
+            batch = [record]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                # 先取走已经在队列中的日志，队列为空时再等待到截止时间
+                try:
+                    record = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        record = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if record is _STOP:
+                    stopping = True
+                    break
+                batch.append(record)
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        """批量插入一批日志（一次 executemany + 一次提交）"""
+        try:
+            async with self._session_factory() as db:
+                await db.execute(insert(OperationLog), batch)
+                await db.commit()
+            self.written += len(batch)
+            self.batches += 1
+        except Exception as e:
+            # 写入失败不影响后续批次
+            self.failed += len(batch)
+            logger.error(f"批量写入操作日志失败 ({len(batch)} 条): {e}")
+
+
+# 全局写入器实例，由应用生命周期启动和停止
+operation_log_writer = OperationLogWriter(
+    maxsize=settings.OPERATION_LOG_QUEUE_SIZE,
+    batch_size=settings.OPERATION_LOG_BATCH_SIZE,
+    flush_interval_ms=settings.OPERATION_LOG_FLUSH_INTERVAL_MS,
+    enqueue_timeout_ms=settings.OPERATION_LOG_ENQUEUE_TIMEOUT_MS
+)
@@ -1,10 +1,20 @@
 """
 Neo4j 数据库客户端
 提供 Neo4j 图数据库的连接和基础操作
+
+配置了 NEO4J_STANDBY_DATABASE 时，NEO4J_DATABASE 和备用数据库轮流作为在线数据库（蓝绿切换）：
+全量导入写入非在线的一侧，校验通过后再切换读指针，查询始终读取完整的图。
+读指针持久化在状态文件中，多个工作进程共享
 """
 from neo4j import GraphDatabase, AsyncGraphDatabase
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterator, AsyncIterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
 from app.core.config import settings
+import os
+import json
+import threading
 import logging
 
 # 配置 neo4j.notifications 日志级别为 WARNING，抑制 INFO 消息
@@ -13,11 +23,122 @@ logging.getLogger('neo4j.notifications').setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
 
+class ActiveDatabasePointer:
+    """
+    在线数据库读指针
+
+    状态文件格式：
+        {
+            "active": "neo4j",
+            "slots": {
+                "neo4j": {"file_id": "...", "total_nodes": 100, "relation_count": 200, "built_at": "..."},
+                "standby": {...}
+            }
+        }
+    slots 记录每个数据库中当前构建的是哪个上传文件，用于重新导入时直接切换回滚
+    """
+
+    # 状态文件路径（与上传文件放在同一目录）
+    STATE_FILE = Path(__file__).resolve().parent.parent.parent.parent / "database" / "data" / "neo4j_active.json"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._state: Dict[str, Any] = {"active": settings.NEO4J_DATABASE, "slots": {}}
+
+    @property
+    def databases(self) -> List[str]:
+        """参与蓝绿切换的数据库，未配置备用数据库时只有 NEO4J_DATABASE"""
+        if settings.NEO4J_STANDBY_DATABASE and settings.NEO4J_STANDBY_DATABASE != settings.NEO4J_DATABASE:
+            return [settings.NEO4J_DATABASE, settings.NEO4J_STANDBY_DATABASE]
+        return [settings.NEO4J_DATABASE]
+
+    @property
+    def blue_green_enabled(self) -> bool:
+        """是否启用蓝绿切换"""
+        return len(self.databases) > 1
+
+    def _reload(self) -> None:
+        """状态文件被其他进程修改后重新加载"""
+        try:
+            mtime = self.STATE_FILE.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime:
+            return
+        with self._lock:
+            try:
+                with open(self.STATE_FILE, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+                self._state = {"active": state.get("active"), "slots": state.get("slots") or {}}
+                self._mtime = mtime
+            except (OSError, ValueError) as e:
+                logger.warning(f"读取在线数据库状态失败，沿用当前状态: {e}")
+
+    def _save(self) -> None:
+        """原子写入状态文件（先写临时文件再替换）"""
+        self.STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.STATE_FILE.with_suffix(".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(self._state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, self.STATE_FILE)
+        self._mtime = self.STATE_FILE.stat().st_mtime
+
+    @property
+    def active(self) -> str:
+        """当前在线（供查询读取）的数据库"""
+        if not self.blue_green_enabled:
+            return settings.NEO4J_DATABASE
+        self._reload()
+        active = self._state.get("active")
+        return active if active in self.databases else settings.NEO4J_DATABASE
+
+    @property
+    def standby(self) -> Optional[str]:
+        """当前非在线的数据库，未启用蓝绿切换时为 None"""
+        if not self.blue_green_enabled:
+            return None
+        active = self.active
+        return next(name for name in self.databases if name != active)
+
+    def get_slot(self, database: str) -> Dict[str, Any]:
+        """获取数据库中已构建内容的元信息"""
+        self._reload()
+        return dict(self._state["slots"].get(database) or {})
+
+    def record_build(self, database: str, **info: Any) -> None:
+        """记录数据库中已构建的内容（文件ID、节点数、关系数）"""
+        self._reload()
+        with self._lock:
+            self._state["slots"][database] = {**info, "built_at": datetime.now().isoformat()}
+            self._save()
+
+    def invalidate(self, database: str) -> None:
+        """数据库内容即将被重建，清除其元信息"""
+        self._reload()
+        with self._lock:
+            if self._state["slots"].pop(database, None) is not None:
+                self._save()
+
+    def switch(self, database: str) -> None:
+        """切换在线数据库"""
+        if database not in self.databases:
+            raise ValueError(f"数据库不在蓝绿切换范围内: {database}")
+        self._reload()
+        with self._lock:
+            previous = self._state.get("active")
+            self._state["active"] = database
+            self._save()
+        logger.info(f"在线图数据库已切换: {previous} -> {database}")
+
+
 class Neo4jClient:
     """Neo4j 数据库客户端（同步）"""
 
     def __init__(self):
         self._driver: Optional[GraphDatabase.driver] = None
+        # 线程内的数据库覆盖（导入线程写入备用数据库时使用）
+        self._local = threading.local()
 
     def connect(self) -> None:
         """建立数据库连接"""
@@ -39,15 +160,52 @@ class Neo4jClient:
             self._driver.close()
             logger.info("Neo4j 数据库连接已关闭")
 
-    def get_session(self):
-        """获取数据库会话"""
+    @property
+    def current_database(self) -> str:
+        """当前线程使用的数据库：有覆盖时使用覆盖的数据库，否则使用在线数据库"""
+        return getattr(self._local, "database", None) or database_pointer.active
+
+    @contextmanager
+    def use_database(self, database: Optional[str]):
+        """
+        在当前线程内临时切换读写的数据库，不影响其他线程的查询
+
+        Args:
+            database: 数据库名称，None 表示不切换
+        """
+        previous = getattr(self._local, "database", None)
+        if database:
+            self._local.database = database
+        try:
+            yield
+        finally:
+            self._local.database = previous
+
+    def ensure_database(self, database: str) -> None:
+        """确保数据库存在（需要 Neo4j 企业版，社区版下数据库需预先存在）"""
+        escaped = database.replace('`', '``')
+        try:
+            if not self._driver:
+                self.connect()
+            with self._driver.session(database="system") as session:
+                session.run(f"CREATE DATABASE `{escaped}` IF NOT EXISTS WAIT").consume()
+        except Exception as e:
+            logger.warning(f"创建数据库 {database} 失败（可能已存在或不支持多数据库）: {e}")
+
+    def get_session(self, database: Optional[str] = None):
+        """
+        获取数据库会话
+
+        Args:
+            database: 数据库名称，默认为当前线程使用的数据库
+        """
         if not self._driver:
             try:
                 self.connect()
             except Exception as e:
                 logger.error(f"无法获取数据库会话: {e}")
                 raise RuntimeError(f"Neo4j 连接失败: {e}")
-        return self._driver.session(database=settings.NEO4J_DATABASE)
+        return self._driver.session(database=database or self.current_database)
 
     def execute_query(
         self,
@@ -72,20 +230,65 @@ class Neo4jClient:
             logger.error(f"查询执行失败: {e}")
             raise
 
+    def stream_query(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        database: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        执行 Cypher 查询并逐条返回结果
+
+        记录由驱动按批从服务器拉取，内存占用与结果总数无关；会话在迭代结束或生成器关闭时释放。
+        生成器可能在不同线程中迭代（如 StreamingResponse），因此不依赖线程内的数据库覆盖，
+        需要多次查询读取同一数据库时由调用方传入 database
+
+        Args:
+            query: Cypher 查询语句
+            parameters: 查询参数
+            database: 数据库名称，默认为调用时当前线程使用的数据库
+
+        Returns:
+            Iterator[dict]: 查询结果迭代器
+        """
+        # 生成器函数体在第一次迭代时才执行，数据库需要在调用时确定
+        return self._iter_query(query, parameters, database or self.current_database)
+
+    def _iter_query(self, query: str, parameters: Optional[Dict[str, Any]], database: str) -> Iterator[Dict[str, Any]]:
+        """stream_query 的生成器实现"""
+        try:
+            with self.get_session(database) as session:
+                result = session.run(query, parameters or {})
+                for record in result:
+                    yield record.data()
+        except Exception as e:
+            logger.error(f"查询执行失败: {e}")
+            raise
+
 
 class AsyncNeo4jClient:
-    """Neo4j 数据库客户端（异步）"""
+    """
+    Neo4j 数据库客户端（异步）
+
+    知识图谱查询接口使用，查询期间不阻塞事件循环；连接在应用启动时建立（见 main.py 的 lifespan），
+    始终读取在线数据库
+    """
 
     def __init__(self):
         self._driver: Optional[AsyncGraphDatabase.driver] = None
 
+    def _create_driver(self) -> None:
+        """创建驱动（不建立连接，连接在第一次查询时建立）"""
+        self._driver = AsyncGraphDatabase.driver(
+            settings.NEO4J_URI,
+            auth=(settings.NEO4J_USER, settings.NEO4J_PASSWORD)
+        )
+
     async def connect(self) -> None:
         """建立数据库连接"""
         try:
-            self._driver = AsyncGraphDatabase.driver(
-                settings.NEO4J_URI,
-                auth=(settings.NEO4J_USER, settings.NEO4J_PASSWORD)
-            )
+            if not self._driver:
+                self._create_driver()
             # 验证连接
             await self._driver.verify_connectivity()
             logger.info("Neo4j 异步数据库连接成功")
@@ -97,18 +300,30 @@ class AsyncNeo4jClient:
         """关闭数据库连接"""
         if self._driver:
             await self._driver.close()
+            self._driver = None
             logger.info("Neo4j 异步数据库连接已关闭")
 
-    def get_session(self):
-        """获取数据库会话"""
+    @property
+    def current_database(self) -> str:
+        """当前在线数据库"""
+        return database_pointer.active
+
+    def get_session(self, database: Optional[str] = None):
+        """
+        获取数据库会话（启动时连接失败的情况下，在第一次查询时重新连接）
+
+        Args:
+            database: 数据库名称，默认为在线数据库
+        """
         if not self._driver:
-            raise RuntimeError("数据库未连接，请先调用 connect()")
-        return self._driver.session(database=settings.NEO4J_DATABASE)
+            self._create_driver()
+        return self._driver.session(database=database or self.current_database)
 
     async def execute_query(
         self,
         query: str,
-        parameters: Optional[Dict[str, Any]] = None
+        parameters: Optional[Dict[str, Any]] = None,
+        database: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         执行 Cypher 查询
@@ -116,12 +331,13 @@ class AsyncNeo4jClient:
         Args:
             query: Cypher 查询语句
             parameters: 查询参数
+            database: 数据库名称，默认为在线数据库
 
         Returns:
             查询结果列表
         """
         try:
-            session = self.get_session()
+            session = self.get_session(database)
             async with session:
                 result = await session.run(query, parameters or {})
                 records = await result.data()
@@ -130,7 +346,38 @@ class AsyncNeo4jClient:
             logger.error(f"异步查询执行失败: {e}")
             raise
 
+    async def stream_query(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        database: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        执行 Cypher 查询并逐条返回结果
+
+        记录由驱动按批从服务器拉取，内存占用与结果总数无关；会话在迭代结束或生成器关闭时释放。
+        需要多次查询读取同一数据库时由调用方传入 database
+
+        Args:
+            query: Cypher 查询语句
+            parameters: 查询参数
+            database: 数据库名称，默认为在线数据库
+
+        Yields:
+            dict: 一条查询结果
+        """
+        try:
+            session = self.get_session(database)
+            async with session:
+                result = await session.run(query, parameters or {})
+                async for record in result:
+                    yield record.data()
+        except Exception as e:
+            logger.error(f"异步查询执行失败: {e}")
+            raise
+
 
 # 创建全局客户端实例
+database_pointer = ActiveDatabasePointer()
 neo4j_client = Neo4jClient()
 async_neo4j_client = AsyncNeo4jClient()
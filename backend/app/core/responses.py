@@ -0,0 +1,96 @@
+"""
+响应辅助工具
+提供基于 orjson 的 JSON 响应类和 NDJSON 流式响应（请求头 Accept: application/x-ndjson 时使用）
+"""
+import logging
+from decimal import Decimal
+from typing import Any, AsyncIterable, AsyncIterator, Dict
+
+import orjson
+from fastapi import Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+# NDJSON 媒体类型：每行一个 JSON 对象
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# orjson 选项：支持 numpy 数组/标量、非字符串键（与 jsonable_encoder 一样转换为字符串）
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _orjson_default(obj: Any) -> Any:
+    """
+    orjson 不能直接序列化的类型
+
+    datetime/date/time、UUID、dataclass、numpy 由 orjson 原生处理；
+    这里处理 Neo4j 时间类型、pandas 时间戳、Decimal、集合和 Pydantic 模型
+    """
+    if hasattr(obj, "iso_format"):
+        # neo4j.time.DateTime / Date / Time / Duration
+        return obj.iso_format()
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "isoformat"):
+        # pandas.Timestamp 等带 isoformat 的时间类型
+        return obj.isoformat()
+    if hasattr(obj, "item"):
+        # 其他 numpy 标量
+        return obj.item()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps_json(content: Any) -> bytes:
+    """使用 orjson 序列化（UTF-8 字节，中文不转义）"""
+    return orjson.dumps(content, default=_orjson_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    基于 orjson 的 JSON 响应
+
+    作为路由的 default_response_class 时仍会先经过 FastAPI 的 jsonable_encoder；
+    大结果的接口直接返回 ORJSONResponse(data) 可以跳过 jsonable_encoder，只做一次序列化
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
+def wants_ndjson(request: Request) -> bool:
+    """请求是否要求 NDJSON 流式响应"""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def ndjson_response(records: AsyncIterable[Dict[str, Any]]) -> StreamingResponse:
+    """
+    将记录迭代器包装为 NDJSON 流式响应
+
+    记录在发送时才逐条生成和序列化，服务端内存占用与结果总数无关。
+    响应头发出后无法再修改状态码，迭代中途出错时输出一行 {"type": "error"} 后结束
+
+    Args:
+        records: 记录异步迭代器
+
+    Returns:
+        StreamingResponse: NDJSON 响应
+    """
+    return StreamingResponse(
+        _encode_lines(records),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"X-Accel-Buffering": "no"}
+    )
+
+
+async def _encode_lines(records: AsyncIterable[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """逐条序列化为 NDJSON 行"""
+    try:
+        async for record in records:
+            yield dumps_json(record) + b"\n"
+    except Exception as e:
+        logger.error(f"流式输出失败: {e}")
+        yield dumps_json({"type": "error", "message": str(e)}) + b"\n"
@@ -2,10 +2,16 @@
 FastAPI 应用程序入口
 用户管理系统
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.core.audit import AuditMiddleware
+from app.core.neo4j_client import neo4j_client, async_neo4j_client
+from app.core.log_writer import operation_log_writer
+from app.models import async_engine, AsyncSessionLocal
+from app.services.import_job_service import ImportJobService
 import logging
 
 # 配置日志
@@ -18,11 +24,42 @@ logging.basicConfig(
 logging.getLogger("httpx").setLevel(logging.WARNING)
 logging.getLogger("httpcore").setLevel(logging.WARNING)
 
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    应用生命周期：启动时连接 Neo4j（异步客户端）、清理上次运行中断的导入任务并启动操作日志写入器，
+    关闭时写完缓冲的操作日志，再释放 Neo4j 和 MySQL 异步连接池
+    """
+    try:
+        await async_neo4j_client.connect()
+    except Exception as e:
+        # Neo4j 不可用时应用仍然启动，知识图谱接口在第一次查询时重新连接
+        logger.warning(f"启动时连接 Neo4j 失败: {e}")
+
+    try:
+        async with AsyncSessionLocal() as db:
+            await ImportJobService.fail_interrupted_jobs(db)
+    except Exception as e:
+        logger.warning(f"清理中断的导入任务失败: {e}")
+
+    operation_log_writer.start()
+
+    yield
+
+    await operation_log_writer.stop()
+    await async_neo4j_client.close()
+    neo4j_client.close()
+    await async_engine.dispose()
+
 # 创建 FastAPI 应用实例
 app = FastAPI(
     title="车间资源系统 API",
     description="基于 FastAPI 和 MySQL 的车间资源管理系统",
-    version="1.4.0"
+    version="1.4.0",
+    lifespan=lifespan
 )
 
 # 配置 CORS 中间件（跨域资源共享）
@@ -34,6 +71,9 @@ app.add_middleware(
     allow_headers=["*"],  # 允许所有请求头
 )
 
+# 请求审计中间件：按路由上的 @audit 声明记录操作日志
+app.add_middleware(AuditMiddleware)
+
 # 注册 API 路由
 app.include_router(api_router, prefix="/api")
 
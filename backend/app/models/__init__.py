@@ -3,7 +3,15 @@ Models 模块
 导出所有数据库模型和相关配置
 """
 # 导出基类和会话工厂
-from app.models.base import Base, SessionLocal, engine, get_db
+from app.models.base import (
+    Base,
+    SessionLocal,
+    engine,
+    get_db,
+    AsyncSessionLocal,
+    async_engine,
+    get_async_db
+)
 
 # 导出所有模型类
 from app.models.user import UserManage
@@ -15,6 +23,9 @@ __all__ = [
     "SessionLocal",
     "engine",
     "get_db",
+    "AsyncSessionLocal",
+    "async_engine",
+    "get_async_db",
     "UserManage",
     "OperationLog",
     "FileUploadRecord"
@@ -1,14 +1,19 @@
 """
 数据库基类和会话配置
-提供 SQLAlchemy Base 声明、引擎和会话管理
+提供 SQLAlchemy Base 声明、引擎和会话管理（同步会话用于后台导入线程，异步会话用于 async 接口）
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, BigInteger, Integer
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
 
 # 声明基类
 Base = declarative_base()
 
+# 自增主键类型：MySQL 中为 BIGINT；SQLite 只有 INTEGER PRIMARY KEY 会自增，
+# 在测试使用的 SQLite 中映射为 INTEGER
+BigIntPrimaryKey = BigInteger().with_variant(Integer, "sqlite")
+
 # 创建数据库引擎
 engine = create_engine(
     settings.DATABASE_URL,
@@ -20,6 +25,24 @@ engine = create_engine(
 # 创建数据库会话工厂
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 创建异步数据库引擎（async 接口使用，查询期间不阻塞事件循环）
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    echo=False
+)
+
+# 创建异步会话工厂
+# 提交后不让对象过期：接口在 commit 之后还要读取对象属性生成响应，
+# 异步会话中访问过期属性会触发隐式 IO 并报错
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 
 def get_db():
     """
@@ -32,3 +55,13 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    异步数据库会话依赖注入函数
+
+    用于 async 接口，自动管理会话生命周期
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -5,7 +5,7 @@
 from datetime import datetime
 from sqlalchemy import Column, BigInteger, String, Integer, Float, DateTime, Text
 
-from app.models.base import Base
+from app.models.base import Base, BigIntPrimaryKey
 
 
 class FileUploadRecord(Base):
@@ -16,7 +16,7 @@ class FileUploadRecord(Base):
     __tablename__ = "file_upload_record"
 
     # 主键：记录ID
-    id = Column(BigInteger, primary_key=True, autoincrement=True, comment="记录ID")
+    id = Column(BigIntPrimaryKey, primary_key=True, autoincrement=True, comment="记录ID")
 
     # 文件信息
     file_id = Column(String(64), unique=True, nullable=False, index=True, comment="文件唯一ID（UUID）")
@@ -37,6 +37,16 @@ class FileUploadRecord(Base):
         comment="导入状态: pending=待导入, importing=导入中, success=成功, failed=失败"
     )
 
+    # 后台导入任务与进度
+    job_id = Column(String(64), nullable=True, index=True, comment="后台导入任务ID")
+    import_phase = Column(
+        String(20),
+        nullable=True,
+        comment="导入阶段: queued=排队中, reading=读取文件, clearing=清空图谱, nodes=导入节点, relations=导入关系, switching=切换在线数据库, done=完成, failed=失败"
+    )
+    processed_rows = Column(Integer, default=0, comment="已处理行数")
+    total_rows = Column(Integer, default=0, comment="待处理总行数")
+
     # 导入统计（成功后填写）
     device_count = Column(Integer, default=0, comment="设备节点数")
     person_count = Column(Integer, default=0, comment="人员节点数")
@@ -65,6 +75,10 @@ class FileUploadRecord(Base):
             "uploader_id": self.uploader_id,
             "uploader_name": self.uploader_name,
             "import_status": self.import_status,
+            "job_id": self.job_id,
+            "import_phase": self.import_phase,
+            "processed_rows": self.processed_rows,
+            "total_rows": self.total_rows,
             "device_count": self.device_count,
             "person_count": self.person_count,
             "material_count": self.material_count,
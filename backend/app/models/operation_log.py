@@ -5,7 +5,7 @@
 from datetime import datetime
 from sqlalchemy import Column, BigInteger, String, Integer, DateTime, Index
 
-from app.models.base import Base
+from app.models.base import Base, BigIntPrimaryKey
 
 
 class OperationLog(Base):
@@ -16,7 +16,7 @@ class OperationLog(Base):
     __tablename__ = "operation_log"
 
     # 主键：日志ID
-    id = Column(BigInteger, primary_key=True, autoincrement=True, comment="日志ID")
+    id = Column(BigIntPrimaryKey, primary_key=True, autoincrement=True, comment="日志ID")
 
     # 用户ID：关联操作用户
     user_id = Column(BigInteger, nullable=False, index=True, comment="操作用户ID")
@@ -48,6 +48,9 @@ class OperationLog(Base):
     # 备注信息：额外说明（可选）
     remark = Column(String(500), nullable=True, comment="备注信息")
 
+    # 请求耗时：由审计中间件记录（毫秒）
+    duration_ms = Column(Integer, nullable=True, comment="请求耗时（毫秒）")
+
     def to_dict(self):
         """
         将模型转换为字典
@@ -63,7 +66,8 @@ class OperationLog(Base):
             "user_agent": self.user_agent,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "status": self.status,
-            "remark": self.remark
+            "remark": self.remark,
+            "duration_ms": self.duration_ms
         }
 
     def __repr__(self):
@@ -4,7 +4,7 @@
 from datetime import datetime
 from sqlalchemy import Column, BigInteger, String, Integer, DateTime
 
-from app.models.base import Base
+from app.models.base import Base, BigIntPrimaryKey
 
 
 class UserManage(Base):
@@ -13,7 +13,7 @@ class UserManage(Base):
     """
     __tablename__ = "user_manage"
 
-    id = Column(BigInteger, primary_key=True, autoincrement=True, comment="用户ID")
+    id = Column(BigIntPrimaryKey, primary_key=True, autoincrement=True, comment="用户ID")
     role_id = Column(BigInteger, nullable=True, comment="角色ID")
     user_type = Column(Integer, nullable=False, default=0, comment="用户类型：1=管理员，0=普通用户")
     username = Column(String(50), unique=True, nullable=False, index=True, comment="用户名")
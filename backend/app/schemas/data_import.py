@@ -17,10 +17,14 @@ class FileUploadResponse(BaseModel):
 
 class ImportStatus(BaseModel):
     """导入状态响应"""
-    status: str = Field(..., description="状态: pending, processing, completed, failed")
+    status: str = Field(..., description="状态: pending, importing, success, failed")
     message: str = Field(..., description="状态消息")
     file_id: Optional[str] = Field(None, description="关联的文件ID")
     progress: Optional[float] = Field(None, description="进度百分比 (0-100)")
+    job_id: Optional[str] = Field(None, description="后台导入任务ID")
+    phase: Optional[str] = Field(None, description="导入阶段: queued, reading, clearing, nodes, relations, switching, done, failed")
+    processed_rows: Optional[int] = Field(None, description="已处理行数")
+    total_rows: Optional[int] = Field(None, description="待处理总行数")
 
 
 class ImportStatistics(BaseModel):
@@ -33,6 +37,12 @@ class ImportStatistics(BaseModel):
     relation_count: int = Field(0, description="导入的关系数")
     total_nodes: int = Field(0, description="总节点数")
     duration_seconds: float = Field(0, description="导入耗时（秒）")
+    nodes_created: Optional[int] = Field(None, description="增量导入：新增的节点数")
+    nodes_updated: Optional[int] = Field(None, description="增量导入：更新的节点数")
+    nodes_deleted: Optional[int] = Field(None, description="增量导入：删除的节点数")
+    nodes_failed: Optional[int] = Field(None, description="增量导入：写入失败的节点数")
+    relations_created: Optional[int] = Field(None, description="增量导入：新增的关系数")
+    relations_deleted: Optional[int] = Field(None, description="增量导入：删除的关系数")
 
 
 class ImportError(BaseModel):
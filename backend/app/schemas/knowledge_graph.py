@@ -29,11 +29,24 @@ class GraphDataResponse(BaseModel):
     edges: List[Relationship]
 
 
+class NeighborBatchRequest(BaseModel):
+    """批量邻居展开请求"""
+    node_ids: List[str] = Field(..., min_length=1, max_length=1000, description="要展开的节点 elementId 列表")
+    depth: int = Field(1, ge=1, le=3, description="扩展深度")
+    max_nodes: Optional[int] = Field(
+        None, ge=1, le=5000, description="返回的邻居节点总数上限（默认 depth=1 不限制，depth>1 为 500）"
+    )
+    per_hop_limit: Optional[int] = Field(None, ge=1, le=5000, description="每一跳新增节点数上限")
+
+
 class GraphStatistics(BaseModel):
     """图谱统计信息"""
     node_count: Optional[int] = None
     relationship_count: Optional[int] = None
     labels: Optional[List[str]] = None
     relationship_types: Optional[List[str]] = None
+    label_counts: Optional[Dict[str, int]] = None
+    relationship_type_counts: Optional[Dict[str, int]] = None
+    refreshed_at: Optional[str] = None
     connected: Optional[bool] = None
     error: Optional[str] = None
@@ -52,6 +52,7 @@ class OperationLogResponse(BaseModel):
     created_at: datetime = Field(..., description="操作时间")
     status: int = Field(..., description="操作状态：1=成功，0=失败")
     remark: Optional[str] = Field(None, description="备注信息")
+    duration_ms: Optional[int] = Field(None, description="请求耗时（毫秒）")
 
     class Config:
         """配置类"""
@@ -67,7 +68,8 @@ class OperationLogResponse(BaseModel):
                 "user_agent": "Mozilla/5.0",
                 "created_at": "2026-02-05T12:00:00",
                 "status": 1,
-                "remark": "用户登录成功"
+                "remark": "用户登录成功",
+                "duration_ms": 35
             }
         }
 
@@ -116,6 +118,30 @@ class OperationLogListResponse(BaseModel):
         }
 
 
+class OperationLogPageResponse(BaseModel):
+    """
+    操作日志游标分页响应模型
+    用于返回按 (created_at, id) 键集分页的日志列表
+    """
+    items: list[OperationLogResponse] = Field(..., description="日志列表")
+    next_cursor: Optional[str] = Field(None, description="下一页游标，没有下一页时为空")
+    has_more: bool = Field(..., description="是否还有下一页")
+    total: Optional[int] = Field(None, description="总记录数（total_mode=none 时为空）")
+    total_exact: bool = Field(..., description="总数是否精确（capped 超过上限或 approx 估算时为 false）")
+
+    class Config:
+        """配置类"""
+        json_schema_extra = {
+            "example": {
+                "items": [],
+                "next_cursor": "eyJjcmVhdGVkX2F0IjoiMjAyNi0wMi0wNVQxMjowMDowMCIsImlkIjoxMDB9",
+                "has_more": True,
+                "total": 10000,
+                "total_exact": False
+            }
+        }
+
+
 class OperationLogStatistics(BaseModel):
     """
     操作日志统计响应模型
@@ -12,15 +12,26 @@ import os
 import uuid
 import shutil
 import time
+import multiprocessing
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from openpyxl import load_workbook
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Iterator, Sequence
 from datetime import datetime
 from sqlalchemy.orm import Session
 import logging
 
-from app.core.neo4j_client import neo4j_client
+from app.core.config import settings
+from app.core.neo4j_client import neo4j_client, database_pointer
 from app.models.file_upload_record import FileUploadRecord
+from app.services.knowledge_graph_service import KnowledgeGraphService
+from app.services.excel_reader import (
+    StreamingExcelReader,
+    DataFrameSheetSource,
+    read_sheet_columnar,
+    columnar_to_frame
+)
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +47,28 @@ UNIQUE_ID_COLUMNS = {
 }
 
 
+# 各节点工作表的配置：主标签、唯一标识列、子类型列（作为第二个标签）、统计字段，
+# 以及需要把百分比字符串转换为小数的列（可选）
+# 按导入顺序排列
+ENTITY_SHEETS = {
+    "设备台账": {"label": "设备", "id_column": "设备编号", "type_column": "设备类型", "stat_key": "device_count",
+                 "percent_columns": ("故障率",)},
+    "人员台账": {"label": "人员", "id_column": "工号", "type_column": "人员类型", "stat_key": "person_count"},
+    "物料台账": {"label": "物料", "id_column": "物料编号", "type_column": "物料类型", "stat_key": "material_count"},
+    "工艺台账": {"label": "工艺", "id_column": "工艺编号", "type_column": "工艺类型", "stat_key": "process_count"},
+    "故障台账": {"label": "故障", "id_column": "故障编号", "type_column": None, "stat_key": "fault_count"},
+}
+
+# 导入统计中描述图内容的字段
+GRAPH_STATISTIC_KEYS = [
+    "device_count", "person_count", "material_count", "process_count",
+    "fault_count", "relation_count", "total_nodes"
+]
+
+# 三元组关系工作表可能使用的名称（按优先级）
+TRIPLE_SHEET_NAMES = ["三元组关系", "三元组", "关系", "关系表"]
+
+
 class DataImportService:
     """数据导入服务类"""
 
@@ -130,17 +163,28 @@ class DataImportService:
         return None
 
     @classmethod
-    def read_excel_with_encoding(cls, file_path: str) -> Optional[Dict[str, pd.DataFrame]]:
+    def read_excel_with_encoding(
+        cls,
+        file_path: str,
+        parallel: Optional[bool] = None
+    ) -> Optional[Dict[str, pd.DataFrame]]:
         """
         读取 Excel 文件，处理中文编码
 
         Args:
             file_path: Excel 文件路径
+            parallel: 是否使用进程池并行解析各工作表，默认使用 settings.IMPORT_PARALLEL_PARSE
 
         Returns:
             包含各工作表的字典，key 为工作表名，value 为 DataFrame
         """
+        if parallel is None:
+            parallel = settings.IMPORT_PARALLEL_PARSE
+
         try:
+            if parallel:
+                return cls._read_excel_parallel(file_path)
+
             # 使用 openpyxl 引擎读取，支持中文
             excel_file = pd.ExcelFile(file_path, engine='openpyxl')
             sheets = {}
@@ -157,22 +201,120 @@ class DataImportService:
             return None
 
     @classmethod
-    def clear_neo4j_database(cls) -> bool:
+    def _read_excel_parallel(cls, file_path: str) -> Dict[str, pd.DataFrame]:
+        """
+        使用进程池并行解析各工作表
+
+        每个子进程以只读模式解析一个工作表并返回列式数据，
+        解析是 CPU 密集型操作，多进程可绕开 GIL，耗时取决于最大的工作表而不是工作表数量
+
+        Args:
+            file_path: Excel 文件路径
+
+        Returns:
+            包含各工作表的字典，key 为工作表名，value 为 DataFrame
+        """
+        workbook = load_workbook(file_path, read_only=True)
+        try:
+            sheet_names = workbook.sheetnames
+        finally:
+            workbook.close()
+
+        if not sheet_names:
+            return {}
+
+        max_workers = settings.IMPORT_PARSE_WORKERS or min(len(sheet_names), os.cpu_count() or 1)
+        logger.info(f"并行解析 {len(sheet_names)} 个工作表，进程数: {max_workers}")
+
+        # 使用 spawn 方式启动子进程，避免 fork 复制 Neo4j 驱动等后台线程的状态
+        sheets = {}
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            futures = {
+                sheet_name: executor.submit(read_sheet_columnar, file_path, sheet_name)
+                for sheet_name in sheet_names
+            }
+            # 按工作簿中的顺序组装结果
+            for sheet_name in sheet_names:
+                df = columnar_to_frame(futures[sheet_name].result())
+                sheets[sheet_name] = df
+                logger.info(f"读取工作表 '{sheet_name}': {len(df)} 行")
+
+        return sheets
+
+    @classmethod
+    def clear_neo4j_database(cls, batch_size: Optional[int] = None) -> bool:
         """
         清空 Neo4j 数据库（全局删除）
 
+        先删除关系、再删除节点，每批一个事务，避免单个大事务耗尽堆内存。
+        优先使用 CALL { } IN TRANSACTIONS（Neo4j 4.4+），不支持时退回 LIMIT 循环删除
+
+        Args:
+            batch_size: 每个事务删除的行数，默认使用 settings.IMPORT_DELETE_BATCH_SIZE
+
         Returns:
             是否成功
         """
+        batch_size = int(batch_size or settings.IMPORT_DELETE_BATCH_SIZE)
+        start_time = time.time()
         try:
-            # 使用 Cypher 语句删除所有节点和关系
-            neo4j_client.execute_query("MATCH (n) DETACH DELETE n")
-            logger.info("Neo4j 数据库已清空")
+            try:
+                relation_count = cls._delete_in_transactions(
+                    f"MATCH ()-[r]->() CALL {{ WITH r DELETE r }} IN TRANSACTIONS OF {batch_size} ROWS",
+                    "relationships_deleted"
+                )
+                node_count = cls._delete_in_transactions(
+                    f"MATCH (n) CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF {batch_size} ROWS",
+                    "nodes_deleted"
+                )
+            except Exception as e:
+                logger.warning(f"CALL {{ }} IN TRANSACTIONS 删除失败，改用分批循环删除: {e}")
+                relation_count = cls._delete_in_loop(
+                    "MATCH ()-[r]->() WITH r LIMIT $limit DELETE r", "relationships_deleted", batch_size
+                )
+                node_count = cls._delete_in_loop(
+                    "MATCH (n) WITH n LIMIT $limit DETACH DELETE n", "nodes_deleted", batch_size
+                )
+
+            duration = time.time() - start_time
+            rate = (relation_count + node_count) / duration if duration > 0 else 0
+            logger.info(
+                f"Neo4j 数据库已清空: 删除关系 {relation_count} 条、节点 {node_count} 个，"
+                f"耗时 {duration:.2f} 秒（{rate:.0f} 条/秒）"
+            )
             return True
         except Exception as e:
             logger.error(f"清空 Neo4j 数据库失败: {e}")
             return False
 
+    @staticmethod
+    def _delete_in_transactions(query: str, counter: str) -> int:
+        """
+        执行 CALL { } IN TRANSACTIONS 删除语句，返回删除数量
+
+        该语法只能在自动提交事务中执行，因此直接使用 session.run 而不是显式事务
+        """
+        with neo4j_client.get_session() as session:
+            summary = session.run(query).consume()
+        return getattr(summary.counters, counter)
+
+    @staticmethod
+    def _delete_in_loop(query: str, counter: str, batch_size: int) -> int:
+        """按 LIMIT 分批循环删除，直到没有可删除的数据，返回删除数量"""
+        total = 0
+        with neo4j_client.get_session() as session:
+            while True:
+                summary = session.run(query, {"limit": batch_size}).consume()
+                deleted = getattr(summary.counters, counter)
+                if deleted == 0:
+                    break
+                total += deleted
+                logger.debug(f"分批删除: 已删除 {total}")
+        return total
+
     @classmethod
     def create_indexes(cls) -> None:
         """创建 Neo4j 索引以提高查询性能"""
@@ -190,223 +332,140 @@ class DataImportService:
                 logger.warning(f"创建索引失败（可能已存在）: {e}")
 
     @classmethod
-    def _import_device_sheet(cls, df: pd.DataFrame) -> Tuple[int, Dict[str, str]]:
+    def _prepare_entity_rows(
+        cls,
+        sheet_name: str,
+        df: pd.DataFrame
+    ) -> Tuple[List[Tuple[List[str], Any, Dict[str, Any]]], int]:
         """
-        导入设备工作表
+        将节点工作表的行转换为待写入的节点
 
         Args:
-            df: 设备数据 DataFrame
+            sheet_name: 工作表名称（ENTITY_SHEETS 中的键）
+            df: 工作表数据
 
         Returns:
-            tuple: (导入数量, 节点ID映射)
+            tuple: (待写入节点列表，元素为 (标签列表, 规范化后的业务主键, 属性), 跳过或失败的行数)
+                   全量和增量导入都以规范化后的主键（_normalize_key）匹配三元组中的头/尾实体
         """
-        count = 0
-        node_id_map = {}
-        error_count = 0
-
-        for idx, row in df.iterrows():
-            try:
-                properties = {}
-                for col, val in row.items():
-                    if pd.notna(val):
-                        # 处理故障率百分比
-                        if col == '故障率' and isinstance(val, str):
-                            try:
-                                val = float(val.replace('%', '')) / 100
-                            except:
-                                pass
-                        properties[col] = val
-
-                device_type = properties.get('设备类型', '')
-                device_id = properties.get('设备编号')
-
-                if not device_id:
-                    logger.warning(f"设备台账第 {idx+2} 行缺少设备编号，跳过")
-                    error_count += 1
-                    continue
+        config = ENTITY_SHEETS[sheet_name]
+        main_label = config["label"]
+        id_column = config["id_column"]
+        type_column = config["type_column"]
 
-                # 构建节点标签（宽松模式：不检查子类型是否合法）
-                labels = ['设备']
-                if device_type:
-                    labels.append(device_type)
+        pending = []
+        error_count = 0
 
-                # 创建节点
-                element_id = cls._create_node(labels, properties)
-                if element_id:
-                    node_id_map[device_id] = element_id
-                    count += 1
-                else:
-                    logger.warning(f"设备 {device_id} 创建节点失败")
-                    error_count += 1
+        properties_list = cls._frame_to_property_dicts(df, config.get("percent_columns", ()))
+        for idx, properties in zip(df.index, properties_list):
+            entity_id = properties.get(id_column)
+            key = cls._normalize_key(entity_id) if entity_id is not None else ""
 
-            except Exception as e:
+            if not key:
+                logger.warning(f"{sheet_name}第 {idx+2} 行缺少{id_column}，跳过")
                 error_count += 1
-                logger.warning(f"导入设备行 {idx+2} 失败: {e}")
-
-        logger.info(f"导入设备节点: {count} 个，失败: {error_count} 个")
-        return count, node_id_map
-
-    @classmethod
-    def _import_person_sheet(cls, df: pd.DataFrame) -> Tuple[int, Dict[str, str]]:
-        """导入人员工作表"""
-        count = 0
-        node_id_map = {}
-        error_count = 0
+                continue
 
-        for idx, row in df.iterrows():
-            try:
-                properties = {}
-                for col, val in row.items():
-                    if pd.notna(val):
-                        properties[col] = val
+            # 构建节点标签（宽松模式：不检查子类型是否合法）
+            labels = [main_label]
+            sub_type = properties.get(type_column, '') if type_column else ''
+            if sub_type:
+                labels.append(sub_type)
 
-                person_type = properties.get('人员类型', '')
-                work_id = properties.get('工号')
+            pending.append((labels, key, properties))
 
-                if not work_id:
-                    logger.warning(f"人员台账第 {idx+2} 行缺少工号，跳过")
-                    error_count += 1
-                    continue
+        return pending, error_count
 
-                # 构建节点标签（宽松模式：不检查子类型是否合法）
-                labels = ['人员']
-                if person_type:
-                    labels.append(person_type)
+    @staticmethod
+    def _frame_to_property_dicts(df: pd.DataFrame, percent_columns: Sequence[str] = ()) -> List[Dict[str, Any]]:
+        """
+        将工作表数据转换为节点属性字典列表
 
-                element_id = cls._create_node(labels, properties)
-                if element_id:
-                    node_id_map[work_id] = element_id
-                    count += 1
-                else:
-                    logger.warning(f"人员 {work_id} 创建节点失败")
-                    error_count += 1
+        按列整体处理，代替逐行 iterrows 和逐个单元格判断：
+        - percent_columns 中的百分比字符串转换为小数（如 "5%" -> 0.05），无法解析的保留原值；
+          只有设备台账的故障率列需要转换，其他工作表保持原值
+        - 空值（NaN / None / NaT）不写入属性
+        - numpy 标量转换为 Python 原生类型，可直接交给 Bolt 驱动
 
-            except Exception as e:
-                error_count += 1
-                logger.warning(f"导入人员行 {idx+2} 失败: {e}")
+        Args:
+            df: 工作表数据
+            percent_columns: 需要转换百分比字符串的列
 
-        logger.info(f"导入人员节点: {count} 个，失败: {error_count} 个")
-        return count, node_id_map
+        Returns:
+            list: 每行一个属性字典，顺序与 df 的行一致
+        """
+        if df.empty:
+            return []
+
+        frame = df.astype(object)
+
+        # 处理百分比列（如设备台账的故障率）
+        for column in percent_columns:
+            if column not in frame.columns:
+                continue
+            rate = frame[column]
+            is_text = rate.map(lambda v: isinstance(v, str)).astype(bool)
+            if is_text.any():
+                parsed = pd.to_numeric(
+                    rate[is_text].str.replace('%', '', regex=False),
+                    errors='coerce'
+                ).dropna() / 100
+                rate = rate.copy()
+                rate.loc[parsed.index] = parsed.astype(object)
+                frame[column] = rate
+
+        frame = frame.where(frame.notna(), None)
+        columns = list(frame.columns)
+        return [
+            {column: value for column, value in zip(columns, row) if value is not None}
+            for row in frame.itertuples(index=False, name=None)
+        ]
 
     @classmethod
-    def _import_material_sheet(cls, df: pd.DataFrame) -> Tuple[int, Dict[str, str]]:
-        """导入物料工作表"""
-        count = 0
-        node_id_map = {}
-        error_count = 0
+    def _import_entity_sheet(cls, sheet_name: str, df: pd.DataFrame) -> Tuple[int, Dict[str, str]]:
+        """
+        导入节点工作表
 
-        for idx, row in df.iterrows():
-            try:
-                properties = {}
-                for col, val in row.items():
-                    if pd.notna(val):
-                        properties[col] = val
+        Args:
+            sheet_name: 工作表名称（ENTITY_SHEETS 中的键）
+            df: 工作表数据
 
-                material_type = properties.get('物料类型', '')
-                material_id = properties.get('物料编号')
+        Returns:
+            tuple: (导入数量, 节点ID映射)
+        """
+        pending, error_count = cls._prepare_entity_rows(sheet_name, df)
 
-                if not material_id:
-                    logger.warning(f"物料台账第 {idx+2} 行缺少物料编号，跳过")
-                    error_count += 1
-                    continue
+        # 批量写入节点
+        count, node_id_map, failed = cls._create_nodes_batch(pending)
+        error_count += failed
 
-                # 构建节点标签（宽松模式：不检查子类型是否合法）
-                labels = ['物料']
-                if material_type:
-                    labels.append(material_type)
+        logger.info(f"导入{ENTITY_SHEETS[sheet_name]['label']}节点: {count} 个，失败: {error_count} 个")
+        return count, node_id_map
 
-                element_id = cls._create_node(labels, properties)
-                if element_id:
-                    node_id_map[material_id] = element_id
-                    count += 1
-                else:
-                    logger.warning(f"物料 {material_id} 创建节点失败")
-                    error_count += 1
+    @classmethod
+    def _import_device_sheet(cls, df: pd.DataFrame) -> Tuple[int, Dict[str, str]]:
+        """导入设备工作表"""
+        return cls._import_entity_sheet("设备台账", df)
 
-            except Exception as e:
-                error_count += 1
-                logger.warning(f"导入物料行 {idx+2} 失败: {e}")
+    @classmethod
+    def _import_person_sheet(cls, df: pd.DataFrame) -> Tuple[int, Dict[str, str]]:
+        """导入人员工作表"""
+        return cls._import_entity_sheet("人员台账", df)
 
-        logger.info(f"导入物料节点: {count} 个，失败: {error_count} 个")
-        return count, node_id_map
+    @classmethod
+    def _import_material_sheet(cls, df: pd.DataFrame) -> Tuple[int, Dict[str, str]]:
+        """导入物料工作表"""
+        return cls._import_entity_sheet("物料台账", df)
 
     @classmethod
     def _import_process_sheet(cls, df: pd.DataFrame) -> Tuple[int, Dict[str, str]]:
         """导入工艺工作表"""
-        count = 0
-        node_id_map = {}
-        error_count = 0
-
-        for idx, row in df.iterrows():
-            try:
-                properties = {}
-                for col, val in row.items():
-                    if pd.notna(val):
-                        properties[col] = val
-
-                process_type = properties.get('工艺类型', '')
-                process_id = properties.get('工艺编号')
-
-                if not process_id:
-                    logger.warning(f"工艺台账第 {idx+2} 行缺少工艺编号，跳过")
-                    error_count += 1
-                    continue
-
-                # 构建节点标签（宽松模式：不检查子类型是否合法）
-                labels = ['工艺']
-                if process_type:
-                    labels.append(process_type)
-
-                element_id = cls._create_node(labels, properties)
-                if element_id:
-                    node_id_map[process_id] = element_id
-                    count += 1
-                else:
-                    logger.warning(f"工艺 {process_id} 创建节点失败")
-                    error_count += 1
-
-            except Exception as e:
-                error_count += 1
-                logger.warning(f"导入工艺行 {idx+2} 失败: {e}")
-
-        logger.info(f"导入工艺节点: {count} 个，失败: {error_count} 个")
-        return count, node_id_map
+        return cls._import_entity_sheet("工艺台账", df)
 
     @classmethod
     def _import_fault_sheet(cls, df: pd.DataFrame) -> Tuple[int, Dict[str, str]]:
         """导入故障工作表"""
-        count = 0
-        node_id_map = {}
-        error_count = 0
-
-        for idx, row in df.iterrows():
-            try:
-                properties = {}
-                for col, val in row.items():
-                    if pd.notna(val):
-                        properties[col] = val
-
-                fault_id = properties.get('故障编号')
-
-                if not fault_id:
-                    logger.warning(f"故障台账第 {idx+2} 行缺少故障编号，跳过")
-                    error_count += 1
-                    continue
-
-                element_id = cls._create_node(['故障'], properties)
-                if element_id:
-                    node_id_map[fault_id] = element_id
-                    count += 1
-                else:
-                    logger.warning(f"故障 {fault_id} 创建节点失败")
-                    error_count += 1
-
-            except Exception as e:
-                error_count += 1
-                logger.warning(f"导入故障行 {idx+2} 失败: {e}")
-
-        logger.info(f"导入故障节点: {count} 个，失败: {error_count} 个")
-        return count, node_id_map
+        return cls._import_entity_sheet("故障台账", df)
 
     @classmethod
     def _create_node(cls, labels: List[str], properties: Dict[str, Any]) -> Optional[str]:
@@ -421,18 +480,11 @@ class DataImportService:
             节点的 elementId，失败返回 None
         """
         try:
-            # 构建 Cypher 语句
-            labels_str = ':' + ':'.join(labels) if labels else ''
-
-            # 构建属性字符串（使用 $参数语法）
-            # 正确的 Cypher 语法：CREATE (n:Label {key1: $key1, key2: $key2})
-            if properties:
-                props_str = ', '.join([f"`{k}`: ${k}" for k in properties.keys()])
-                query = f"CREATE (n{labels_str} {{{props_str}}}) RETURN elementId(n) as id"
-            else:
-                query = f"CREATE (n{labels_str}) RETURN elementId(n) as id"
+            # 标签转义、属性整体作为一个参数，与批量写入接受的数据一致
+            # （列名中的空格、括号等字符不能用作 $参数名）
+            query = f"CREATE (n{cls._labels_clause(labels)}) SET n = $props RETURN elementId(n) as id"
 
-            result = neo4j_client.execute_query(query, properties)
+            result = neo4j_client.execute_query(query, {"props": properties})
 
             if result and len(result) > 0:
                 return result[0].get('id')
@@ -442,6 +494,75 @@ class DataImportService:
             logger.error(f"创建节点失败 [{labels}][ID:{id_prop}]: {e}")
         return None
 
+    @staticmethod
+    def _iter_chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+        """按固定大小切分列表"""
+        for i in range(0, len(items), size):
+            yield items[i:i + size]
+
+    @staticmethod
+    def _labels_clause(labels: Sequence[str]) -> str:
+        """构建 Cypher 标签片段（反引号转义），如 :`设备`:`加工设备`"""
+        return ''.join(f":`{str(label).replace('`', '``')}`" for label in labels)
+
+    @classmethod
+    def _create_nodes_batch(
+        cls,
+        pending: List[Tuple[List[str], Any, Dict[str, Any]]],
+        batch_size: Optional[int] = None
+    ) -> Tuple[int, Dict[Any, str], int]:
+        """
+        批量创建节点
+
+        按标签组合分组，每组通过 UNWIND 分块写入，每块一个事务；
+        某一块写入失败时退回逐行创建，避免一行坏数据拖垮整块
+
+        Args:
+            pending: 待创建节点列表，元素为 (标签列表, 业务主键, 属性)
+            batch_size: 每块行数，默认使用 settings.IMPORT_BATCH_SIZE
+
+        Returns:
+            tuple: (创建数量, 业务主键 -> elementId 映射, 失败数量)
+        """
+        batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for labels, key, properties in pending:
+            groups.setdefault(tuple(labels), []).append({"key": key, "props": properties})
+
+        count = 0
+        error_count = 0
+        node_id_map = {}
+
+        for labels, rows in groups.items():
+            query = f"""
+            UNWIND $rows AS row
+            CREATE (n{cls._labels_clause(labels)})
+            SET n = row.props
+            RETURN row.key AS key, elementId(n) AS id
+            """
+            for chunk in cls._iter_chunks(rows, batch_size):
+                try:
+                    result = neo4j_client.execute_query(query, {"rows": chunk})
+                except Exception as e:
+                    logger.warning(f"批量创建节点失败 [{list(labels)}]，逐行重试 {len(chunk)} 行: {e}")
+                    for row in chunk:
+                        element_id = cls._create_node(list(labels), row["props"])
+                        if element_id:
+                            node_id_map[row["key"]] = element_id
+                            count += 1
+                        else:
+                            error_count += 1
+                    continue
+
+                for record in result:
+                    node_id_map[record["key"]] = record["id"]
+                count += len(result)
+                error_count += len(chunk) - len(result)
+
+            logger.debug(f"批量创建节点 [{list(labels)}]: {len(rows)} 行")
+
+        return count, node_id_map, error_count
+
     @classmethod
     def _create_relationship(cls, source_element_id: str, target_element_id: str, rel_type: str) -> bool:
         """
@@ -479,6 +600,64 @@ class DataImportService:
             logger.error(f"创建关系失败 ({source_element_id} -[{rel_type}]-> {target_element_id}): {e}")
             return False
 
+    @classmethod
+    def _create_relationships_batch(
+        cls,
+        pending: Dict[str, List[Tuple[int, str, str, str, str]]],
+        batch_size: Optional[int] = None
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        批量创建关系
+
+        关系类型无法参数化，因此按关系类型分组，每组通过 UNWIND 分块写入，每块一个事务
+
+        Args:
+            pending: 关系类型 -> 关系行列表，元素为 (Excel 行号, 头实体, 尾实体, 源 elementId, 目标 elementId)
+            batch_size: 每块行数，默认使用 settings.IMPORT_BATCH_SIZE
+
+        Returns:
+            tuple: (创建数量, 错误列表，格式与 _import_triple_sheet 一致)
+        """
+        batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        count = 0
+        errors = []
+
+        for rel_type, triples in pending.items():
+            query = f"""
+            UNWIND $rows AS row
+            MATCH (a) WHERE elementId(a) = row.source_id
+            MATCH (b) WHERE elementId(b) = row.target_id
+            CREATE (a)-[r:`{rel_type.replace('`', '``')}`]->(b)
+            RETURN row.row AS row
+            """
+            for chunk in cls._iter_chunks(triples, batch_size):
+                rows = [
+                    {"row": row_no, "source_id": source_id, "target_id": target_id}
+                    for row_no, _, _, source_id, target_id in chunk
+                ]
+                try:
+                    result = neo4j_client.execute_query(query, {"rows": rows})
+                except Exception as e:
+                    logger.error(f"批量创建关系失败 [{rel_type}] ({len(chunk)} 条): {e}")
+                    errors.extend({
+                        "row": row_no,
+                        "error_type": "processing_error",
+                        "message": f"创建关系失败: {head} -[{rel_type}]-> {tail}: {e}"
+                    } for row_no, head, tail, _, _ in chunk)
+                    continue
+
+                created_rows = {record["row"] for record in result}
+                count += len(result)
+                errors.extend({
+                    "row": row_no,
+                    "error_type": "create_failed",
+                    "message": f"创建关系返回空结果: {head} -[{rel_type}]-> {tail}"
+                } for row_no, head, tail, _, _ in chunk if row_no not in created_rows)
+
+            logger.debug(f"批量创建关系 [{rel_type}]: {len(triples)} 条")
+
+        return count, errors
+
     @classmethod
     def _import_triple_sheet(cls, df: pd.DataFrame, node_id_map: Dict[str, str]) -> Tuple[int, List[Dict[str, Any]]]:
         """
@@ -491,23 +670,44 @@ class DataImportService:
         Returns:
             tuple: (导入数量, 错误列表)
         """
-        count = 0
+        pending, errors = cls._prepare_triples(df, node_id_map)
+
+        count, create_errors = cls._create_relationships_batch(pending)
+        errors.extend(create_errors)
+
+        logger.info(f"导入关系: {count} 条，错误: {len(errors)} 条")
+        return count, errors
+
+    @classmethod
+    def _prepare_triples(
+        cls,
+        df: pd.DataFrame,
+        node_id_map: Dict[str, str]
+    ) -> Tuple[Dict[str, List[Tuple[int, str, str, str, str]]], List[Dict[str, Any]]]:
+        """
+        解析三元组关系工作表，按关系类型分组
+
+        Args:
+            df: 三元组数据 DataFrame
+            node_id_map: 节点ID映射字典
+
+        Returns:
+            tuple: (关系类型 -> 关系行列表, 错误列表)，关系行格式与 _create_relationships_batch 一致
+        """
+        pending: Dict[str, List[Tuple[int, str, str, str, str]]] = {}
         errors = []
 
         # 输出列名和行数用于调试
         logger.info(f"三元组关系表列名: {list(df.columns)}, 行数: {len(df)}")
         logger.info(f"node_id_map 包含的节点数: {len(node_id_map)}, 示例: {list(node_id_map.keys())[:5]}")
 
+        heads = cls._text_column(df, '头实体')
+        rel_types = cls._text_column(df, '对象属性')
+        tails = cls._text_column(df, '尾实体')
+
         # 统计三元组中的实体ID，帮助调试
-        head_entities = set()
-        tail_entities = set()
-        for _, row in df.iterrows():
-            head = row.get('头实体')
-            tail = row.get('尾实体')
-            if pd.notna(head):
-                head_entities.add(str(head).strip())
-            if pd.notna(tail):
-                tail_entities.add(str(tail).strip())
+        head_entities = set(heads.dropna())
+        tail_entities = set(tails.dropna())
 
         logger.info(f"三元组中的头实体数量: {len(head_entities)}, 样本: {sorted(list(head_entities))[:10]}")
         logger.info(f"三元组中的尾实体数量: {len(tail_entities)}, 样本: {sorted(list(tail_entities))[:10]}")
@@ -527,21 +727,10 @@ class DataImportService:
             unmatched_tails = sorted([t for t in tail_entities if t not in node_id_map])[:20]
             logger.warning(f"未匹配的尾实体样本 (前20个): {unmatched_tails}")
 
-        for idx, row in df.iterrows():
+        for idx, head, rel_type, tail in zip(df.index, heads, rel_types, tails):
             try:
-                head = row.get('头实体')
-                rel_type = row.get('对象属性')
-                tail = row.get('尾实体')
-
                 # 跳过空行
-                if pd.isna(head) or pd.isna(rel_type) or pd.isna(tail):
-                    continue
-
-                head = str(head).strip() if head else ''
-                rel_type = str(rel_type).strip() if rel_type else ''
-                tail = str(tail).strip() if tail else ''
-
-                if not all([head, rel_type, tail]):
+                if not head or not rel_type or not tail:
                     continue
 
                 source_id = node_id_map.get(head)
@@ -555,9 +744,8 @@ class DataImportService:
                     })
                     continue
 
-                # 宽松模式：不验证关系类型，直接创建关系
-                if cls._create_relationship(source_id, target_id, rel_type):
-                    count += 1
+                # 宽松模式：不验证关系类型，按关系类型分组后批量创建
+                pending.setdefault(rel_type, []).append((idx + 2, head, tail, source_id, target_id))
 
             except Exception as e:
                 errors.append({
@@ -566,102 +754,404 @@ class DataImportService:
                     "message": str(e)
                 })
 
-        logger.info(f"导入关系: {count} 条，错误: {len(errors)} 条")
-        return count, errors
+        return pending, errors
+
+    @staticmethod
+    def _text_column(df: pd.DataFrame, column: str) -> pd.Series:
+        """取出文本列并去除首尾空白（整列处理），缺失的列和空值为 None"""
+        if column not in df.columns:
+            return pd.Series([None] * len(df), index=df.index, dtype=object)
+        values = df[column].map(lambda v: str(v).strip(), na_action='ignore').astype(object)
+        return values.where(values.notna(), None)
+
+    # ==================== 增量导入 ====================
+
+    @staticmethod
+    def _normalize_key(value: Any) -> str:
+        """规范化业务主键，与三元组中头/尾实体的处理方式一致"""
+        return str(value).strip()
+
+    @staticmethod
+    def _comparable(value: Any) -> Any:
+        """
+        将属性值转换为可比较的 Python 原生类型
+
+        Excel 中读出的 numpy/pandas 类型与从 Neo4j 读回的类型不同，比较前统一
+        """
+        if hasattr(value, "to_native"):
+            # neo4j.time.DateTime / Date 等
+            return value.to_native()
+        if isinstance(value, pd.Timestamp):
+            return value.to_pydatetime()
+        if hasattr(value, "item"):
+            # numpy 标量
+            try:
+                return value.item()
+            except (ValueError, TypeError):
+                return value
+        if isinstance(value, (list, tuple)):
+            return [DataImportService._comparable(v) for v in value]
+        return value
 
     @classmethod
-    def import_from_excel(
+    def _properties_changed(cls, live: Dict[str, Any], new: Dict[str, Any]) -> bool:
+        """比较现有节点属性和 Excel 中的属性是否不同"""
+        if live.keys() != new.keys():
+            return True
+        return any(cls._comparable(live[k]) != cls._comparable(new[k]) for k in new)
+
+    @classmethod
+    def _run_batched(cls, query: str, rows: List[Any], batch_size: Optional[int] = None) -> None:
+        """按块执行 UNWIND $rows 语句，每块一个事务"""
+        batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        for chunk in cls._iter_chunks(rows, batch_size):
+            neo4j_client.execute_query(query, {"rows": chunk})
+
+    @classmethod
+    def _fetch_live_nodes(cls, label: str, id_column: str) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """
+        读取图中某一主标签的全部节点
+
+        Returns:
+            tuple: (业务主键 -> {"id", "labels", "props"}, 需要删除的节点 elementId 列表)
+                   缺少业务主键或主键重复的节点会被列入删除列表
+        """
+        query = f"""
+        MATCH (n{cls._labels_clause([label])})
+        RETURN elementId(n) AS id, labels(n) AS labels, properties(n) AS props
+        """
+        live = {}
+        stale = []
+        for record in neo4j_client.execute_query(query):
+            key = record["props"].get(id_column)
+            if key is None or not cls._normalize_key(key):
+                stale.append(record["id"])
+                continue
+            key = cls._normalize_key(key)
+            if key in live:
+                stale.append(record["id"])
+                continue
+            live[key] = {"id": record["id"], "labels": record["labels"], "props": record["props"]}
+        return live, stale
+
+    @classmethod
+    def _sync_entity_nodes(
         cls,
-        file_path: str,
-        db: Session,
-        file_id: str
-    ) -> Dict[str, Any]:
+        sheet_name: str,
+        pending: List[Tuple[List[str], Any, Dict[str, Any]]]
+    ) -> Tuple[Dict[str, int], Dict[str, str], int]:
         """
-        从 Excel 文件导入数据到 Neo4j
-        采用全局删除、重新构建的方式，并更新数据库记录
+        将节点工作表与图中现有节点做差异比较，只写入新增、变更和删除的节点
+
+        节点按业务主键（UNIQUE_ID_COLUMNS）匹配：
+        - Excel 中有、图中没有：新建
+        - 两边都有但属性或子类型标签不同：更新属性（SET n = props）并调整标签
+        - 图中有、Excel 中没有：连同关系一起删除
 
         Args:
-            file_path: Excel 文件路径
-            db: 数据库会话
-            file_id: 文件ID（用于更新数据库记录）
+            sheet_name: 工作表名称（ENTITY_SHEETS 中的键）
+            pending: 该工作表全部待写入节点，元素为 (标签列表, 规范化后的业务主键, 属性)
 
         Returns:
-            导入结果字典，包含统计信息和错误列表
+            tuple: (差异统计 {"total", "created", "updated", "deleted"}, 业务主键 -> elementId 映射, 失败数量)
         """
-        start_time = time.time()
-        statistics = {
-            "device_count": 0,
-            "person_count": 0,
-            "material_count": 0,
-            "process_count": 0,
-            "fault_count": 0,
-            "relation_count": 0,
-            "total_nodes": 0
+        config = ENTITY_SHEETS[sheet_name]
+        main_label = config["label"]
+
+        # Excel 中重复的主键以最后一行为准（主键已由 _prepare_entity_rows 规范化）
+        desired = {}
+        for labels, key, properties in pending:
+            desired[key] = (labels, key, properties)
+        if len(desired) < len(pending):
+            logger.warning(f"{sheet_name}中有 {len(pending) - len(desired)} 行主键重复，以最后一行为准")
+
+        live, stale = cls._fetch_live_nodes(main_label, config["id_column"])
+
+        to_create = []
+        to_update = []
+        updated = 0
+        relabels: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], List[str]] = {}
+        node_id_map = {}
+
+        for key, (labels, _, properties) in desired.items():
+            node = live.get(key)
+            if node is None:
+                to_create.append((labels, key, properties))
+                continue
+
+            node_id_map[key] = node["id"]
+            props_changed = cls._properties_changed(node["props"], properties)
+            if props_changed:
+                to_update.append({"id": node["id"], "props": properties})
+
+            live_labels = set(node["labels"])
+            new_labels = {str(label) for label in labels}
+            labels_changed = live_labels != new_labels
+            if labels_changed:
+                removed = tuple(sorted(live_labels - new_labels))
+                added = tuple(sorted(new_labels - live_labels))
+                relabels.setdefault((removed, added), []).append(node["id"])
+
+            if props_changed or labels_changed:
+                updated += 1
+
+        unchanged = len(node_id_map) - updated
+
+        to_delete = stale + [node["id"] for key, node in live.items() if key not in desired]
+
+        # 新建
+        created, created_map, error_count = cls._create_nodes_batch(to_create)
+        node_id_map.update(created_map)
+
+        # 更新属性
+        cls._run_batched(
+            """
+            UNWIND $rows AS row
+            MATCH (n) WHERE elementId(n) = row.id
+            SET n = row.props
+            """,
+            to_update
+        )
+
+        # 调整子类型标签（标签无法参数化，按变更组合分组）
+        for (removed, added), ids in relabels.items():
+            clauses = []
+            if removed:
+                clauses.append(f"REMOVE n{cls._labels_clause(removed)}")
+            if added:
+                clauses.append(f"SET n{cls._labels_clause(added)}")
+            cls._run_batched(
+                f"""
+                UNWIND $rows AS id
+                MATCH (n) WHERE elementId(n) = id
+                {' '.join(clauses)}
+                """,
+                ids
+            )
+
+        # 删除
+        cls._run_batched(
+            """
+            UNWIND $rows AS id
+            MATCH (n) WHERE elementId(n) = id
+            DETACH DELETE n
+            """,
+            to_delete
+        )
+
+        diff = {
+            "total": len(node_id_map),
+            "created": created,
+            "updated": updated,
+            "deleted": len(to_delete),
         }
-        all_errors = []
+        logger.info(
+            f"增量同步{main_label}节点: 新增 {diff['created']}，更新 {diff['updated']}，"
+            f"删除 {diff['deleted']}，未变更 {unchanged}，失败 {error_count}"
+        )
+        return diff, node_id_map, error_count
 
-        # 获取数据库记录
-        record = db.query(FileUploadRecord).filter(FileUploadRecord.file_id == file_id).first()
-        if record:
-            record.import_status = "importing"
+    @classmethod
+    def _sync_relationships(
+        cls,
+        pending: Dict[str, List[Tuple[int, str, str, str, str]]],
+        labels: Sequence[str]
+    ) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+        """
+        将三元组与图中现有关系做差异比较，只创建新增的关系、删除已不存在的关系
+
+        关系按 (头实体, 关系类型, 尾实体) 匹配，头/尾实体已通过业务主键解析为节点 elementId；
+        关系本身没有属性，因此不存在更新。只处理起点带有指定主标签的关系
+
+        Args:
+            pending: 关系类型 -> 关系行列表（来自 _prepare_triples）
+            labels: 参与同步的节点主标签
+
+        Returns:
+            tuple: (差异统计 {"total", "created", "deleted"}, 错误列表)
+        """
+        # Excel 中重复的三元组只保留一条
+        desired: Dict[Tuple[str, str, str], Tuple[int, str, str, str, str]] = {}
+        for rel_type, triples in pending.items():
+            for triple in triples:
+                _, _, _, source_id, target_id = triple
+                desired.setdefault((source_id, rel_type, target_id), triple)
+
+        live = set()
+        to_delete = []
+        for label in labels:
+            query = f"""
+            MATCH (a{cls._labels_clause([label])})-[r]->(b)
+            RETURN elementId(r) AS id, elementId(a) AS source_id, type(r) AS type, elementId(b) AS target_id
+            """
+            for record in neo4j_client.execute_query(query):
+                key = (record["source_id"], record["type"], record["target_id"])
+                if key in live or key not in desired:
+                    to_delete.append(record["id"])
+                else:
+                    live.add(key)
+
+        to_create: Dict[str, List[Tuple[int, str, str, str, str]]] = {}
+        for key, triple in desired.items():
+            if key not in live:
+                to_create.setdefault(key[1], []).append(triple)
+
+        cls._run_batched(
+            """
+            UNWIND $rows AS id
+            MATCH ()-[r]->() WHERE elementId(r) = id
+            DELETE r
+            """,
+            to_delete
+        )
+        created, errors = cls._create_relationships_batch(to_create)
+
+        diff = {
+            "total": len(live) + created,
+            "created": created,
+            "deleted": len(to_delete),
+        }
+        logger.info(
+            f"增量同步关系: 新增 {diff['created']}，删除 {diff['deleted']}，未变更 {len(live)}，错误 {len(errors)}"
+        )
+        return diff, errors
+
+    @staticmethod
+    def _report_progress(
+        db: Session,
+        record: Optional[FileUploadRecord],
+        phase: str,
+        processed_rows: Optional[int] = None,
+        total_rows: Optional[int] = None
+    ) -> None:
+        """
+        更新上传记录中的导入阶段和行进度，供后台任务轮询
+
+        进度写入失败不影响导入本身
+        """
+        if not record:
+            return
+        record.import_phase = phase
+        if processed_rows is not None:
+            record.processed_rows = processed_rows
+        if total_rows is not None:
+            record.total_rows = total_rows
+        try:
             db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"更新导入进度失败: {e}")
 
+    @classmethod
+    def _build_graph(
+        cls,
+        file_path: str,
+        db: Session,
+        record: Optional[FileUploadRecord],
+        streaming: bool,
+        mode: str,
+        statistics: Dict[str, Any],
+        all_errors: List[Dict[str, Any]]
+    ) -> int:
+        """
+        读取 Excel 文件并写入当前线程使用的 Neo4j 数据库，统计信息和错误写入传入的字典和列表
+
+        Returns:
+            int: 需要导入的总行数
+        """
+        incremental = mode == "incremental"
+        source = None
         try:
-            # 1. 读取 Excel 文件
-            logger.info(f"开始导入 Excel 文件: {file_path}")
-            sheets = cls.read_excel_with_encoding(file_path)
-            if not sheets:
+            # 1. 读取 Excel 文件（流式模式下只打开工作簿，数据在导入时按批次读取）
+            logger.info(f"开始导入 Excel 文件: {file_path} (模式: {mode}, 流式读取: {streaming})")
+            cls._report_progress(db, record, "reading")
+            if streaming:
+                source = StreamingExcelReader(file_path, batch_size=settings.IMPORT_BATCH_SIZE)
+            else:
+                sheets = cls.read_excel_with_encoding(file_path)
+                if not sheets:
+                    raise ValueError("无法读取 Excel 文件或文件为空")
+                source = DataFrameSheetSource(sheets)
+
+            sheet_names = source.sheet_names
+            if not sheet_names:
                 raise ValueError("无法读取 Excel 文件或文件为空")
 
             # 输出所有sheet名称用于调试
-            logger.info(f"Excel 文件包含的工作表: {list(sheets.keys())}")
+            logger.info(f"Excel 文件包含的工作表: {sheet_names}")
+
+            # 检查可能的三元组 sheet 名称
+            triple_sheet_name = None
+            for possible_name in TRIPLE_SHEET_NAMES:
+                if possible_name in sheet_names:
+                    triple_sheet_name = possible_name
+                    break
 
-            # 2. 清空现有数据库
-            logger.info("清空 Neo4j 数据库...")
-            if not cls.clear_neo4j_database():
-                raise RuntimeError("清空数据库失败")
+            # 需要导入的总行数（节点工作表 + 三元组工作表），用于进度汇报
+            total_rows = sum(source.estimate_rows(name) for name in UNIQUE_ID_COLUMNS if name in sheet_names)
+            if triple_sheet_name:
+                total_rows += source.estimate_rows(triple_sheet_name)
+            processed_rows = 0
+
+            # 2. 清空现有数据库（增量模式不清空）
+            if not incremental:
+                logger.info("清空 Neo4j 数据库...")
+                cls._report_progress(db, record, "clearing", processed_rows, total_rows)
+                if not cls.clear_neo4j_database():
+                    raise RuntimeError("清空数据库失败")
 
             # 3. 创建索引
             cls.create_indexes()
 
             # 4. 导入各工作表的节点
             node_id_map = {}
+            for sheet_name, config in ENTITY_SHEETS.items():
+                if sheet_name not in sheet_names:
+                    if incremental:
+                        # 未包含的工作表对应的节点保持不变，仍可作为三元组的头/尾实体
+                        live, _ = cls._fetch_live_nodes(config["label"], config["id_column"])
+                        node_id_map.update((key, node["id"]) for key, node in live.items())
+                        statistics[config["stat_key"]] = len(live)
+                    continue
+                stat_key = config["stat_key"]
+
+                if not incremental:
+                    for df in source.iter_batches(sheet_name):
+                        cls._report_progress(db, record, "nodes", processed_rows)
+                        count, sheet_map = cls._import_entity_sheet(sheet_name, df)
+                        statistics[stat_key] += count
+                        node_id_map.update(sheet_map)
+                        processed_rows += len(df)
+                    continue
 
-            # 设备台账
-            if "设备台账" in sheets:
-                statistics["device_count"], device_map = cls._import_device_sheet(sheets["设备台账"])
-                node_id_map.update(device_map)
-
-            # 人员台账
-            if "人员台账" in sheets:
-                statistics["person_count"], person_map = cls._import_person_sheet(sheets["人员台账"])
-                node_id_map.update(person_map)
-
-            # 物料台账
-            if "物料台账" in sheets:
-                statistics["material_count"], material_map = cls._import_material_sheet(sheets["物料台账"])
-                node_id_map.update(material_map)
-
-            # 工艺台账
-            if "工艺台账" in sheets:
-                statistics["process_count"], process_map = cls._import_process_sheet(sheets["工艺台账"])
-                node_id_map.update(process_map)
-
-            # 故障台账
-            if "故障台账" in sheets:
-                statistics["fault_count"], fault_map = cls._import_fault_sheet(sheets["故障台账"])
-                node_id_map.update(fault_map)
-
-            statistics["total_nodes"] = sum([
-                statistics["device_count"],
-                statistics["person_count"],
-                statistics["material_count"],
-                statistics["process_count"],
-                statistics["fault_count"]
-            ])
+                # 增量模式需要整张工作表的主键集合才能判断删除，先收集全部行再比较
+                pending = []
+                for df in source.iter_batches(sheet_name):
+                    cls._report_progress(db, record, "nodes", processed_rows)
+                    rows, _ = cls._prepare_entity_rows(sheet_name, df)
+                    pending.extend(rows)
+                    processed_rows += len(df)
+
+                diff, sheet_map, failed = cls._sync_entity_nodes(sheet_name, pending)
+                statistics[stat_key] = diff["total"]
+                statistics["nodes_created"] += diff["created"]
+                statistics["nodes_updated"] += diff["updated"]
+                statistics["nodes_deleted"] += diff["deleted"]
+                statistics["nodes_failed"] += failed
+                if failed:
+                    all_errors.append({
+                        "sheet_name": sheet_name,
+                        "error_type": "node_write_failed",
+                        "message": f"{failed} 个{config['label']}节点写入失败，详见服务日志"
+                    })
+                node_id_map.update(sheet_map)
+
+            statistics["total_nodes"] = sum(
+                statistics[config["stat_key"]] for config in ENTITY_SHEETS.values()
+            )
 
             # 5. 导入三元组关系
-            logger.info(f"检查三元组关系工作表... 可用的工作表: {list(sheets.keys())}")
+            logger.info(f"检查三元组关系工作表... 可用的工作表: {sheet_names}")
             logger.info(f"node_id_map 中已导入的节点数: {len(node_id_map)}")
 
             # 显示node_id_map中的ID样本，帮助调试
@@ -669,21 +1159,184 @@ class DataImportService:
                 sample_ids = sorted(list(node_id_map.keys()))[:20]
                 logger.info(f"node_id_map 中的ID样本: {sample_ids}")
 
-            # 检查可能的sheet名称
-            triple_sheet_name = None
-            for possible_name in ["三元组关系", "三元组", "关系", "关系表"]:
-                if possible_name in sheets:
-                    triple_sheet_name = possible_name
-                    break
-
             if triple_sheet_name:
                 logger.info(f"找到三元组工作表: '{triple_sheet_name}'")
-                relation_count, errors = cls._import_triple_sheet(sheets[triple_sheet_name], node_id_map)
-                statistics["relation_count"] = relation_count
-                all_errors.extend(errors)
-                logger.info(f"三元组关系导入完成: 成功 {relation_count} 条，错误 {len(errors)} 条")
+                relation_errors = []
+                pending_triples: Dict[str, List[Tuple[int, str, str, str, str]]] = {}
+                for df in source.iter_batches(triple_sheet_name):
+                    cls._report_progress(db, record, "relations", processed_rows)
+                    if incremental:
+                        triples, errors = cls._prepare_triples(df, node_id_map)
+                        for rel_type, rows in triples.items():
+                            pending_triples.setdefault(rel_type, []).extend(rows)
+                    else:
+                        relation_count, errors = cls._import_triple_sheet(df, node_id_map)
+                        statistics["relation_count"] += relation_count
+                    relation_errors.extend(errors)
+                    processed_rows += len(df)
+
+                if incremental:
+                    synced_labels = [config["label"] for name, config in ENTITY_SHEETS.items() if name in sheet_names]
+                    diff, errors = cls._sync_relationships(pending_triples, synced_labels)
+                    statistics["relation_count"] = diff["total"]
+                    statistics["relations_created"] = diff["created"]
+                    statistics["relations_deleted"] = diff["deleted"]
+                    relation_errors.extend(errors)
+
+                all_errors.extend(relation_errors)
+                logger.info(f"三元组关系导入完成: 成功 {statistics['relation_count']} 条，错误 {len(relation_errors)} 条")
             else:
-                logger.warning(f"未找到三元组关系工作表，可用的工作表: {list(sheets.keys())}")
+                logger.warning(f"未找到三元组关系工作表，可用的工作表: {sheet_names}")
+                if incremental:
+                    # 增量模式不改动已有关系，记录图中现有的关系数
+                    _, statistics["relation_count"] = cls._count_graph()
+
+            # 6. 创建或刷新全文索引（属性集合在节点写入后才能确定）
+            KnowledgeGraphService.refresh_fulltext_index([config["label"] for config in ENTITY_SHEETS.values()])
+
+            return total_rows
+
+        finally:
+            if source:
+                source.close()
+
+    @classmethod
+    def _find_prebuilt(cls, database: str, file_id: str) -> Optional[Dict[str, Any]]:
+        """
+        判断备用数据库中是否已经是指定文件的完整数据
+
+        Returns:
+            该文件导入时的统计信息；不是该文件或数据已被修改时返回 None
+        """
+        slot = database_pointer.get_slot(database)
+        if slot.get("file_id") != file_id or not slot.get("statistics"):
+            return None
+        statistics = slot["statistics"]
+        try:
+            with neo4j_client.use_database(database):
+                node_count, relation_count = cls._count_graph()
+        except Exception as e:
+            logger.warning(f"检查备用数据库 {database} 失败: {e}")
+            return None
+        if node_count != statistics.get("total_nodes") or relation_count != statistics.get("relation_count"):
+            return None
+        return statistics
+
+    @staticmethod
+    def _count_graph() -> Tuple[int, int]:
+        """统计当前数据库的节点数和关系数"""
+        node_count = neo4j_client.execute_query("MATCH (n) RETURN count(n) AS count")[0]["count"]
+        relation_count = neo4j_client.execute_query("MATCH ()-[r]->() RETURN count(r) AS count")[0]["count"]
+        return node_count, relation_count
+
+    @classmethod
+    def _validate_build(cls, statistics: Dict[str, Any]) -> None:
+        """
+        校验新构建的图：节点和关系数量必须与导入统计一致，且不能为空，否则不切换在线数据库
+        """
+        node_count, relation_count = cls._count_graph()
+        if node_count == 0:
+            raise RuntimeError("新构建的图数据库为空，已保留原在线数据库")
+        if node_count != statistics["total_nodes"] or relation_count != statistics["relation_count"]:
+            raise RuntimeError(
+                f"新构建的图数据库校验失败（节点 {node_count}/{statistics['total_nodes']}，"
+                f"关系 {relation_count}/{statistics['relation_count']}），已保留原在线数据库"
+            )
+
+    @classmethod
+    def import_from_excel(
+        cls,
+        file_path: str,
+        db: Session,
+        file_id: str,
+        streaming: Optional[bool] = None,
+        mode: str = "full"
+    ) -> Dict[str, Any]:
+        """
+        从 Excel 文件导入数据到 Neo4j，并更新数据库记录
+
+        导入模式：
+        - full: 全局删除、重新构建。配置了 NEO4J_STANDBY_DATABASE 时在非在线的数据库中重建，
+          校验通过后切换在线数据库；备用数据库中已是该文件的数据时直接切换（回滚）
+        - incremental: 按业务主键和 (头实体, 关系类型, 尾实体) 与现有图做差异比较，
+          只写入新增、变更和删除的节点与关系，导入期间图数据始终可用。
+          Excel 中不存在的节点工作表对应的节点保持不变；没有三元组工作表时关系保持不变
+
+        Args:
+            file_path: Excel 文件路径
+            db: 数据库会话
+            file_id: 文件ID（用于更新数据库记录）
+            streaming: 是否使用只读流式解析，按批次读取并导入；
+                       默认使用 settings.IMPORT_STREAMING_READ
+            mode: 导入模式，full 或 incremental
+
+        Returns:
+            导入结果字典，包含统计信息和错误列表
+        """
+        if streaming is None:
+            streaming = settings.IMPORT_STREAMING_READ
+        if mode not in ("full", "incremental"):
+            raise ValueError(f"不支持的导入模式: {mode}")
+        incremental = mode == "incremental"
+
+        start_time = time.time()
+        statistics = {
+            "device_count": 0,
+            "person_count": 0,
+            "material_count": 0,
+            "process_count": 0,
+            "fault_count": 0,
+            "relation_count": 0,
+            "total_nodes": 0
+        }
+        if incremental:
+            statistics.update({
+                "nodes_created": 0,
+                "nodes_updated": 0,
+                "nodes_deleted": 0,
+                "nodes_failed": 0,
+                "relations_created": 0,
+                "relations_deleted": 0
+            })
+        all_errors = []
+
+        # 获取数据库记录
+        record = db.query(FileUploadRecord).filter(FileUploadRecord.file_id == file_id).first()
+        if record:
+            record.import_status = "importing"
+            record.processed_rows = 0
+            record.total_rows = 0
+            db.commit()
+
+        try:
+            # 全量导入且配置了备用数据库时写入非在线的一侧，校验通过后再切换，
+            # 导入期间查询仍读取原来的完整图
+            build_database = None if incremental else database_pointer.standby
+            prebuilt = cls._find_prebuilt(build_database, file_id) if build_database else None
+
+            if prebuilt:
+                # 备用数据库中已经是该文件的数据（如回滚到上一版本），无需重建，直接切换
+                logger.info(f"备用数据库 {build_database} 中已是文件 {file_id} 的数据，直接切换")
+                statistics.update(prebuilt)
+                total_rows = 0
+            else:
+                if build_database:
+                    logger.info(f"全量导入写入备用数据库: {build_database}（在线数据库: {database_pointer.active}）")
+                    neo4j_client.ensure_database(build_database)
+                    database_pointer.invalidate(build_database)
+                with neo4j_client.use_database(build_database):
+                    total_rows = cls._build_graph(file_path, db, record, streaming, mode, statistics, all_errors)
+                    if build_database:
+                        cls._validate_build(statistics)
+                database_pointer.record_build(
+                    build_database or neo4j_client.current_database,
+                    file_id=file_id,
+                    statistics={key: statistics[key] for key in GRAPH_STATISTIC_KEYS}
+                )
+
+            if build_database:
+                cls._report_progress(db, record, "switching", total_rows, total_rows)
+                database_pointer.switch(build_database)
 
             duration = time.time() - start_time
             statistics["duration_seconds"] = round(duration, 2)
@@ -694,6 +1347,8 @@ class DataImportService:
             # 更新数据库记录
             if record:
                 record.import_status = "success"
+                record.import_phase = "done"
+                record.processed_rows = total_rows
                 record.device_count = statistics["device_count"]
                 record.person_count = statistics["person_count"]
                 record.material_count = statistics["material_count"]
@@ -706,6 +1361,10 @@ class DataImportService:
                 record.import_time = datetime.now()
                 db.commit()
 
+            # 清空本进程的查询结果缓存并重建 n-gram 搜索索引
+            # （其他工作进程在下一次查询时通过图版本变化发现）
+            KnowledgeGraphService.on_graph_changed()
+
             return {
                 "success": True,
                 "statistics": statistics,
@@ -720,6 +1379,7 @@ class DataImportService:
             # 更新数据库记录为失败状态
             if record:
                 record.import_status = "failed"
+                record.import_phase = "failed"
                 record.error_message = error_msg[:1000] if len(error_msg) > 1000 else error_msg
                 record.import_time = datetime.now()
                 db.commit()
@@ -730,3 +1390,4 @@ class DataImportService:
                 "errors": all_errors,
                 "message": f"导入失败: {error_msg}"
             }
+
@@ -0,0 +1,202 @@
+"""
+Excel 流式读取
+基于 openpyxl 只读模式逐行解析工作表，按批次产出 DataFrame，
+避免一次性把整本工作簿物化为 DataFrame，降低大文件导入时的内存峰值和解析耗时
+
+批次 DataFrame 的索引为数据行序号（从 0 开始，不含表头），
+与 pandas.read_excel 的默认索引一致，导入逻辑中的 `idx + 2` 仍然对应 Excel 行号
+"""
+from typing import Any, Dict, Iterator, List, Sequence
+
+import pandas as pd
+from openpyxl import load_workbook
+
+
+def normalize_header(header: Sequence[Any]) -> List[Any]:
+    """
+    规范化表头，与 pandas.read_excel 保持一致：
+    空表头命名为 "Unnamed: 列序号"，重复表头追加 ".1"、".2" 后缀
+    """
+    columns = []
+    seen = {}
+    for i, name in enumerate(header):
+        if name is None or (isinstance(name, str) and not name.strip()):
+            name = f"Unnamed: {i}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name)
+    return columns
+
+
+def _iter_sheet_rows(worksheet, width: int) -> Iterator[tuple]:
+    """
+    逐行读取数据行（不含表头），产出 (数据行序号, 按表头对齐后的值)
+
+    完全为空的行会被跳过（但仍占用行号）
+    """
+    for row_index, values in enumerate(worksheet.iter_rows(min_row=2, values_only=True)):
+        if all(value is None for value in values):
+            continue
+
+        # 只读模式下行长度可能与表头不一致，按表头对齐
+        if len(values) < width:
+            values = tuple(values) + (None,) * (width - len(values))
+        elif len(values) > width:
+            values = values[:width]
+
+        yield row_index, values
+
+
+def read_sheet_columnar(file_path: str, sheet_name: str) -> Dict[str, Any]:
+    """
+    以只读模式读取单个工作表，返回紧凑的列式数据
+
+    作为 ProcessPoolExecutor 的任务函数在子进程中执行（因此为模块级函数，且不依赖应用配置）。
+    按列返回可以减少进程间传输的对象数量，重复的共享字符串在序列化时也会被复用
+
+    Args:
+        file_path: Excel 文件路径
+        sheet_name: 工作表名称
+
+    Returns:
+        dict: {"columns": 列名列表, "index": 数据行序号列表, "data": 每列的值元组列表}
+    """
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet_name]
+        worksheet.reset_dimensions()
+
+        header = next(worksheet.iter_rows(max_row=1, values_only=True), None)
+        if header is None:
+            return {"columns": [], "index": [], "data": []}
+
+        columns = normalize_header(header)
+        index = []
+        rows = []
+        for row_index, values in _iter_sheet_rows(worksheet, len(columns)):
+            index.append(row_index)
+            rows.append(values)
+
+        data = list(zip(*rows)) if rows else [()] * len(columns)
+        return {"columns": columns, "index": index, "data": data}
+    finally:
+        workbook.close()
+
+
+def columnar_to_frame(batch: Dict[str, Any]) -> pd.DataFrame:
+    """将 read_sheet_columnar 返回的列式数据还原为 DataFrame"""
+    return pd.DataFrame(
+        {column: list(values) for column, values in zip(batch["columns"], batch["data"])},
+        columns=batch["columns"],
+        index=batch["index"]
+    )
+
+
+class StreamingExcelReader:
+    """
+    只读流式 Excel 读取器
+
+    Example:
+        ```python
+        reader = StreamingExcelReader(file_path, batch_size=5000)
+        try:
+            for df in reader.iter_batches("设备台账"):
+                ...
+        finally:
+            reader.close()
+        ```
+    """
+
+    def __init__(self, file_path: str, batch_size: int = 5000):
+        """
+        Args:
+            file_path: Excel 文件路径（.xlsx）
+            batch_size: 每批次的数据行数
+        """
+        self.file_path = file_path
+        self.batch_size = batch_size
+        self._workbook = load_workbook(file_path, read_only=True, data_only=True)
+
+    @property
+    def sheet_names(self) -> List[str]:
+        """工作表名称列表"""
+        return self._workbook.sheetnames
+
+    def estimate_rows(self, sheet_name: str) -> int:
+        """
+        根据工作表的维度信息估算数据行数（不含表头）
+
+        维度信息由生成 Excel 的程序写入，可能不准确，仅用于进度展示
+        """
+        max_row = self._workbook[sheet_name].max_row
+        return max(max_row - 1, 0) if max_row else 0
+
+    def iter_batches(self, sheet_name: str) -> Iterator[pd.DataFrame]:
+        """
+        按批次读取工作表
+
+        第一行作为表头；完全为空的行会被跳过（但仍占用行号）
+
+        Args:
+            sheet_name: 工作表名称
+
+        Yields:
+            pd.DataFrame: 每批最多 batch_size 行
+        """
+        worksheet = self._workbook[sheet_name]
+        # 部分程序生成的文件维度信息不正确，重置后按实际内容读取
+        worksheet.reset_dimensions()
+
+        header = next(worksheet.iter_rows(max_row=1, values_only=True), None)
+        if header is None:
+            return
+
+        columns = normalize_header(header)
+
+        batch = []
+        index = []
+        for row_index, values in _iter_sheet_rows(worksheet, len(columns)):
+            batch.append(values)
+            index.append(row_index)
+
+            if len(batch) >= self.batch_size:
+                yield pd.DataFrame.from_records(batch, columns=columns, index=index)
+                batch = []
+                index = []
+
+        if batch:
+            yield pd.DataFrame.from_records(batch, columns=columns, index=index)
+
+    def close(self) -> None:
+        """关闭工作簿（只读模式会保持文件句柄打开）"""
+        self._workbook.close()
+
+
+class DataFrameSheetSource:
+    """
+    已读入内存的工作表集合
+
+    提供与 StreamingExcelReader 相同的接口，每个工作表作为一个批次产出
+    """
+
+    def __init__(self, sheets: Dict[str, pd.DataFrame]):
+        self._sheets = sheets
+
+    @property
+    def sheet_names(self) -> List[str]:
+        """工作表名称列表"""
+        return list(self._sheets.keys())
+
+    def estimate_rows(self, sheet_name: str) -> int:
+        """工作表数据行数"""
+        return len(self._sheets[sheet_name])
+
+    def iter_batches(self, sheet_name: str) -> Iterator[pd.DataFrame]:
+        """整张工作表作为一个批次"""
+        yield self._sheets[sheet_name]
+
+    def close(self) -> None:
+        """无需释放资源"""
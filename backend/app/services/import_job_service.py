@@ -0,0 +1,228 @@
+"""
+后台导入任务服务
+将 Excel 导入放到进程内的后台线程中执行，接口立即返回任务ID，前端轮询进度
+
+说明：
+- 导入会清空重建或增量改写整个图，同一时间只能有一个导入在执行，因此工作线程数固定为 1，
+  其余任务在队列中排队
+- 任务状态和进度持久化在 FileUploadRecord 上，由 DataImportService 在导入过程中更新
+- 接口通过异步会话提交和查询任务；导入流程本身在工作线程中使用独立的同步会话
+- 执行器在进程内，进程重启后原来排队中和执行中的任务不会再执行，应用启动时将其标记为失败
+"""
+import uuid
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.base import SessionLocal
+from app.models.file_upload_record import FileUploadRecord
+from app.schemas.data_import import ImportStatus
+from app.services.data_import_service import DataImportService
+
+logger = logging.getLogger(__name__)
+
+
+# 各导入阶段的状态消息
+PHASE_MESSAGES = {
+    "queued": "排队等待导入",
+    "reading": "正在读取 Excel 文件",
+    "clearing": "正在清空图数据库",
+    "nodes": "正在导入节点",
+    "relations": "正在导入关系",
+    "switching": "正在切换在线图数据库",
+    "done": "导入完成",
+}
+
+
+class ImportJobService:
+    """后台导入任务服务类"""
+
+    # 单线程执行器：保证导入串行执行
+    _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="import-job")
+
+    @staticmethod
+    def is_running(record: FileUploadRecord) -> bool:
+        """
+        判断记录是否已有排队中或执行中的导入任务
+
+        只看导入状态：失败或成功的记录即使阶段字段停留在中间值也不算进行中；
+        上传后从未提交过任务的 pending 记录（没有 job_id）也不算
+        """
+        if record.import_status == "importing":
+            return True
+        return record.import_status == "pending" and bool(record.job_id)
+
+    @staticmethod
+    async def fail_interrupted_jobs(db: AsyncSession) -> int:
+        """
+        将上一个进程遗留的排队中、执行中导入标记为失败（应用启动时调用）
+
+        执行器在进程内，重启后这些任务不会继续执行；不处理的话记录会一直停留在
+        进行中状态，is_running 永远为真，该文件无法再次导入
+
+        Args:
+            db: 数据库会话
+
+        Returns:
+            int: 标记为失败的记录数
+        """
+        result = await db.execute(
+            update(FileUploadRecord)
+            .where(or_(
+                FileUploadRecord.import_status == "importing",
+                (FileUploadRecord.import_status == "pending") & (FileUploadRecord.job_id.isnot(None))
+            ))
+            .values(
+                import_status="failed",
+                import_phase="failed",
+                error_message="服务重启，导入任务已中断，请重新导入"
+            )
+        )
+        await db.commit()
+        if result.rowcount:
+            logger.warning(f"已将 {result.rowcount} 个中断的导入任务标记为失败")
+        return result.rowcount
+
+    @classmethod
+    async def submit(cls, db: AsyncSession, record: FileUploadRecord, mode: str = "full") -> str:
+        """
+        提交后台导入任务
+
+        Args:
+            db: 数据库会话
+            record: 要导入的上传记录
+            mode: 导入模式，full（清空重建）或 incremental（增量）
+
+        Returns:
+            str: 任务ID
+        """
+        job_id = str(uuid.uuid4())
+
+        record.job_id = job_id
+        record.import_status = "pending"
+        record.import_phase = "queued"
+        record.processed_rows = 0
+        record.total_rows = 0
+        record.error_message = None
+        await db.commit()
+
+        cls._executor.submit(cls._run, job_id, record.file_id, record.file_path, mode)
+        logger.info(f"导入任务已提交: {job_id} (文件ID: {record.file_id}, 模式: {mode})")
+        return job_id
+
+    @staticmethod
+    def run_import(file_path: str, file_id: str, mode: str = "full") -> Dict[str, Any]:
+        """
+        使用独立的同步数据库会话执行导入（在工作线程中调用）
+
+        Args:
+            file_path: Excel 文件路径
+            file_id: 上传记录的文件ID
+            mode: 导入模式，full（清空重建）或 incremental（增量）
+
+        Returns:
+            dict: DataImportService.import_from_excel 的导入结果
+        """
+        db = SessionLocal()
+        try:
+            return DataImportService.import_from_excel(
+                file_path=file_path,
+                db=db,
+                file_id=file_id,
+                mode=mode
+            )
+        finally:
+            db.close()
+
+    @classmethod
+    async def run_import_serial(cls, file_path: str, file_id: str, mode: str = "full") -> Dict[str, Any]:
+        """
+        在导入执行器中执行导入并等待结果（同步导入接口使用）
+
+        与后台任务共用单线程执行器，保证同一时间只有一个导入在改写图数据库
+
+        Args:
+            file_path: Excel 文件路径
+            file_id: 上传记录的文件ID
+            mode: 导入模式，full（清空重建）或 incremental（增量）
+
+        Returns:
+            dict: DataImportService.import_from_excel 的导入结果
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(cls._executor, cls.run_import, file_path, file_id, mode)
+
+    @classmethod
+    def _run(cls, job_id: str, file_id: str, file_path: str, mode: str) -> None:
+        """在工作线程中执行导入任务"""
+        try:
+            logger.info(f"开始执行导入任务: {job_id}")
+            result = cls.run_import(file_path, file_id, mode)
+            logger.info(f"导入任务结束: {job_id}, 成功: {result['success']}")
+        except Exception as e:
+            logger.error(f"导入任务异常: {job_id}: {e}", exc_info=True)
+            cls._mark_failed(job_id, str(e))
+
+    @staticmethod
+    def _mark_failed(job_id: str, error_msg: str) -> None:
+        """导入流程未能更新记录就抛出异常时（如数据库连接失败、参数错误），将任务标记为失败"""
+        db = None
+        try:
+            db = SessionLocal()
+            record = db.query(FileUploadRecord).filter(FileUploadRecord.job_id == job_id).first()
+            if record and record.import_status in ("pending", "importing"):
+                record.import_status = "failed"
+                record.import_phase = "failed"
+                record.error_message = error_msg[:1000]
+                db.commit()
+        except Exception as e:
+            logger.error(f"标记导入任务失败状态时出错: {job_id}: {e}")
+        finally:
+            if db is not None:
+                db.close()
+
+    @staticmethod
+    async def get_status(db: AsyncSession, job_id: str) -> Optional[ImportStatus]:
+        """
+        查询任务状态和进度
+
+        Args:
+            db: 数据库会话
+            job_id: 任务ID
+
+        Returns:
+            ImportStatus: 任务状态，任务不存在返回 None
+        """
+        record = await db.scalar(select(FileUploadRecord).where(FileUploadRecord.job_id == job_id))
+        if not record:
+            return None
+
+        processed_rows = record.processed_rows or 0
+        total_rows = record.total_rows or 0
+
+        if record.import_status == "success":
+            progress = 100.0
+        elif total_rows > 0:
+            progress = round(min(processed_rows / total_rows, 1.0) * 100, 1)
+        else:
+            progress = 0.0
+
+        if record.import_status == "failed":
+            message = record.error_message or "导入失败"
+        else:
+            message = PHASE_MESSAGES.get(record.import_phase, "等待导入")
+
+        return ImportStatus(
+            status=record.import_status,
+            message=message,
+            file_id=record.file_id,
+            progress=progress,
+            job_id=record.job_id,
+            phase=record.import_phase,
+            processed_rows=processed_rows,
+            total_rows=total_rows
+        )
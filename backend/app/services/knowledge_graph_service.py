@@ -1,22 +1,72 @@
 """
 知识图谱服务
 提供知识图谱的关键词检索和可视化数据获取功能
+
+查询接口使用异步 Neo4j 客户端（async_neo4j_client），不阻塞事件循环；
+导入过程中调用的全文索引刷新和 n-gram 索引重建在导入线程中执行，使用同步客户端
 """
-from typing import Dict, Any, List
-from app.core.neo4j_client import neo4j_client
+from typing import (
+    Dict, Any, List, Sequence, Optional, Tuple, Callable, Hashable,
+    Iterable, AsyncIterable, AsyncIterator, Awaitable, Union
+)
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.neo4j_client import neo4j_client, async_neo4j_client, database_pointer
+from app.services.ngram_index import NGramIndex
+from datetime import datetime
+import asyncio
+import base64
+import json
+import re
+import time
+import threading
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 全文索引名称（导入时创建和刷新，覆盖各主标签节点的全部属性）
+FULLTEXT_INDEX_NAME = "entity_fulltext"
+
+# 等待全文索引填充完成的超时时间（秒）
+FULLTEXT_INDEX_AWAIT_SECONDS = 300
+
+# 多跳邻居展开默认返回的节点数上限（depth=1 只查一跳，默认不限制）
+NEIGHBOR_DEFAULT_MAX_NODES = 500
+
+# 分页获取图谱数据时的默认每页节点数
+GRAPH_PAGE_DEFAULT_SIZE = 500
+
+# 流式（NDJSON）获取图谱数据时允许的最大节点数（非流式接口仍限制为 1000）
+GRAPH_STREAM_MAX_NODES = 100000
+
+# Lucene 查询语法中的特殊字符
+LUCENE_SPECIAL_CHARS = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
 
 class KnowledgeGraphService:
     """知识图谱服务类"""
 
+    # 进程内 n-gram 倒排索引（SEARCH_NGRAM_INDEX 开启时使用）及其对应的图版本
+    _ngram_index: Optional[NGramIndex] = None
+    _ngram_version: Optional[Tuple[str, Optional[str]]] = None
+    _ngram_lock = threading.RLock()
+
+    # 搜索、邻居展开和图谱数据的结果缓存，键中包含图版本，导入完成后旧结果不再命中
+    _result_cache = TTLCache(maxsize=settings.GRAPH_CACHE_MAXSIZE, ttl=settings.GRAPH_CACHE_TTL)
+    # 本进程内的图版本计数，导入成功后递增
+    _graph_version = 0
+
+    # 图谱统计快照（健康检查和统计接口共用）及其对应的图版本和过期时间
+    _statistics_snapshot: Optional[Dict[str, Any]] = None
+    _statistics_version: Optional[Tuple[Any, ...]] = None
+    _statistics_expires_at = 0.0
+    _statistics_lock = asyncio.Lock()
+
     # 宽松模式：搜索所有节点属性，不再限制特定字段
     # 任何包含关键词的属性都会被匹配（包括维护周期、出厂日期等）
 
     @staticmethod
-    def search_all_nodes(keyword: str, limit: int = 100) -> Dict[str, Any]:
+    async def search_all_nodes(keyword: str, limit: int = 100) -> Dict[str, Any]:
         """
         宽松模式：搜索节点的所有属性字段
 
@@ -36,25 +86,512 @@ class KnowledgeGraphService:
         keyword = keyword.strip()
 
         try:
-            nodes, node_ids = KnowledgeGraphService._search_by_multiple_fields(keyword, limit)
+            return await KnowledgeGraphService._cached(
+                ("search", keyword, limit),
+                lambda: KnowledgeGraphService._search_all_nodes(keyword, limit)
+            )
+        except Exception as e:
+            logger.error(f"搜索失败: {e}")
+            return {"nodes": [], "edges": []}
 
-            # 获取这些节点之间的关系
-            edges = []
-            if node_ids:
-                edges = KnowledgeGraphService._get_relations_between_nodes(node_ids)
+    @staticmethod
+    async def _search_all_nodes(keyword: str, limit: int) -> Dict[str, Any]:
+        """执行搜索（不经过缓存），失败时抛出异常"""
+        nodes, node_ids = await KnowledgeGraphService._find_nodes(keyword, limit)
 
-            logger.info(f"搜索 '{keyword}' 找到 {len(nodes)} 个节点, {len(edges)} 条关系")
-            return {
-                "nodes": nodes,
-                "edges": edges
+        # 获取这些节点之间的关系
+        edges = []
+        if node_ids:
+            edges = await KnowledgeGraphService._get_relations_between_nodes(node_ids)
+
+        logger.info(f"搜索 '{keyword}' 找到 {len(nodes)} 个节点, {len(edges)} 条关系")
+        return {
+            "nodes": nodes,
+            "edges": edges
+        }
+
+    @staticmethod
+    async def _find_nodes(keyword: str, limit: int) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        查找匹配关键词的节点（不含关系）
+
+        开启 n-gram 索引时直接在内存中做子串匹配（结果与全属性扫描一致）；
+        否则优先使用全文索引（按相关度排序），命中不足 limit 个（包括索引不可用）时
+        用全属性扫描补足：分词匹配不到的子串（如"10天"）仍能通过扫描找到，
+        全文索引的结果排在前面，扫描结果按节点去重后追加
+        """
+        ngram_result = await KnowledgeGraphService._search_ngram(keyword, limit)
+        if ngram_result is not None:
+            return ngram_result
+        nodes, node_ids = await KnowledgeGraphService._search_fulltext(keyword, limit)
+        if len(nodes) >= limit:
+            return nodes, node_ids
+
+        # 扫描结果中至多有 len(nodes) 个与全文索引重复，取 limit 个即可补足
+        scan_nodes, _ = await KnowledgeGraphService._search_by_multiple_fields(keyword, limit)
+        seen = set(node_ids)
+        for scan_node in scan_nodes:
+            if len(nodes) >= limit:
+                break
+            if scan_node["id"] not in seen:
+                seen.add(scan_node["id"])
+                nodes.append(scan_node)
+                node_ids.append(scan_node["id"])
+        return nodes, node_ids
+
+    # ==================== 流式输出 ====================
+
+    @staticmethod
+    async def stream_search(keyword: str, limit: int = 100) -> AsyncIterator[Dict[str, Any]]:
+        """
+        流式搜索：先逐个输出匹配的节点，再从查询游标逐条输出节点之间的关系
+
+        匹配节点数受 limit 限制，在调用时查出；关系在迭代时才查询。查询失败时抛出异常
+
+        Returns:
+            AsyncIterator[dict]: {"type": "node"/"edge"/"end", ...} 记录
+        """
+        keyword = (keyword or "").strip()
+        nodes, _ = await KnowledgeGraphService._find_nodes(keyword, limit) if keyword else ([], [])
+        database = async_neo4j_client.current_database
+        return KnowledgeGraphService._stream_subgraph(
+            nodes,
+            lambda node_ids: KnowledgeGraphService._iter_relations_between_nodes(node_ids, database)
+        )
+
+    @staticmethod
+    async def stream_graph_data(limit: int = 100) -> AsyncIterator[Dict[str, Any]]:
+        """
+        流式获取图谱数据：节点和关系都直接从查询游标逐条输出，服务端只保留节点 ID 列表
+
+        Returns:
+            AsyncIterator[dict]: {"type": "node"/"edge"/"end", ...} 记录
+        """
+        # 节点和关系从同一个数据库读取（迭代期间发生蓝绿切换也不受影响）
+        database = async_neo4j_client.current_database
+        records = async_neo4j_client.stream_query(
+            """
+            MATCH (n)
+            RETURN elementId(n) as id, labels(n) as labels, properties(n) as properties
+            LIMIT $limit
+            """,
+            {"limit": limit},
+            database
+        )
+        nodes = (
+            {
+                "id": record.get("id"),
+                "labels": record.get("labels") or [],
+                "properties": record.get("properties") or {}
             }
+            async for record in records
+        )
+        return KnowledgeGraphService._stream_subgraph(
+            nodes,
+            lambda node_ids: KnowledgeGraphService._iter_relations_between_nodes(node_ids, database)
+        )
+
+    @staticmethod
+    async def stream_node_neighbors(
+        node_id: str,
+        depth: int = 1,
+        max_nodes: Optional[int] = None,
+        per_hop_limit: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        流式获取节点邻居
+
+        depth 为 1 时邻居和关系都直接从查询游标逐条输出（不经过结果缓存），服务端只保留节点 ID 列表；
+        depth 大于 1 时逐跳扩展需要已访问节点集合，结果在调用时整体查出（经过结果缓存），迭代时逐条输出。
+        max_nodes 的默认值与 get_node_neighbors 相同
+
+        Returns:
+            AsyncIterator[dict]: {"type": "node"/"edge"/"end", ...} 记录，end 记录包含 truncated
+        """
+        max_nodes = KnowledgeGraphService._resolve_max_nodes(depth, max_nodes)
+        if depth <= 1:
+            return KnowledgeGraphService._stream_direct_neighbors(
+                node_id, max_nodes, async_neo4j_client.current_database
+            )
+
+        result = await KnowledgeGraphService.get_node_neighbors(node_id, depth, max_nodes, per_hop_limit)
+        return KnowledgeGraphService._stream_subgraph(
+            result["nodes"],
+            lambda node_ids: result["edges"],
+            truncated=result["truncated"]
+        )
+
+    @staticmethod
+    async def _stream_direct_neighbors(
+        node_id: str,
+        max_nodes: Optional[int],
+        database: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        从查询游标逐条输出节点的直接邻居，再逐条输出中心节点与邻居之间的关系
+
+        与 _get_direct_neighbors 的结果一致：邻居去重后限制数量（max_nodes 为 None 时不限制），
+        中心节点自身不作为邻居输出（自环关系仍然输出）；多读一条记录用于判断是否被截断，截断标记在 end 记录中
+        """
+        limit_clause = "LIMIT $limit" if max_nodes is not None else ""
+        neighbor_query = f"""
+        MATCH (n)--(neighbor)
+        WHERE elementId(n) = $node_id
+        WITH DISTINCT neighbor
+        {limit_clause}
+        RETURN elementId(neighbor) as id, labels(neighbor) as labels, properties(neighbor) as properties
+        """
+        state = {"truncated": False}
+
+        async def neighbors() -> AsyncIterator[Dict[str, Any]]:
+            parameters = {"node_id": node_id}
+            if max_nodes is not None:
+                parameters["limit"] = max_nodes + 1
+            records = async_neo4j_client.stream_query(neighbor_query, parameters, database)
+            count = 0
+            try:
+                async for record in records:
+                    count += 1
+                    if max_nodes is not None and count > max_nodes:
+                        state["truncated"] = True
+                        break
+                    neighbor_id = record.get("id")
+                    if neighbor_id and neighbor_id != node_id:
+                        yield {
+                            "id": neighbor_id,
+                            "labels": record.get("labels") or [],
+                            "properties": record.get("properties") or {}
+                        }
+            finally:
+                # 提前结束迭代时立即释放会话，再执行关系查询
+                await records.aclose()
+
+        async for item in KnowledgeGraphService._stream_subgraph(
+            neighbors(),
+            lambda neighbor_ids: KnowledgeGraphService._iter_neighbor_relations(node_id, neighbor_ids, database)
+        ):
+            if item["type"] == "end":
+                item["truncated"] = state["truncated"]
+            yield item
+
+    @staticmethod
+    async def _iter_neighbor_relations(
+        node_id: str,
+        neighbor_ids: List[str],
+        database: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """逐条返回中心节点与指定邻居（及自身）之间的关系（保留方向，从查询游标读取）"""
+        rel_query = """
+        MATCH (n)-[r]-(m)
+        WHERE elementId(n) = $node_id AND elementId(m) IN $node_ids
+        WITH DISTINCT r
+        RETURN elementId(startNode(r)) as from_node, elementId(endNode(r)) as to_node,
+               type(r) as type, elementId(r) as rel_id
+        """
+
+        rel_results = async_neo4j_client.stream_query(
+            rel_query, {"node_id": node_id, "node_ids": [node_id] + list(neighbor_ids)}, database
+        )
+        async for rel_record in rel_results:
+            from_id = rel_record.get("from_node")
+            to_id = rel_record.get("to_node")
+            rel_id = rel_record.get("rel_id")
+
+            if from_id and to_id and rel_id is not None:
+                yield {
+                    "id": rel_id,
+                    "from_node": from_id,
+                    "to_node": to_id,
+                    "type": rel_record.get("type", "")
+                }
+
+    @staticmethod
+    async def _stream_subgraph(
+        nodes: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+        edges_for: Callable[[List[str]], Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]]],
+        **summary: Any
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        按 节点 -> 关系 -> 结束标记 的顺序输出子图
 
+        Args:
+            nodes: 节点（列表或异步迭代器）
+            edges_for: 根据全部节点 ID 获取关系的函数（节点输出完后调用），返回列表或异步迭代器
+            summary: 附加到结束标记中的字段
+        """
+        node_ids = []
+        async for node in KnowledgeGraphService._aiter(nodes):
+            node_ids.append(node["id"])
+            yield {"type": "node", "data": node}
+
+        edge_count = 0
+        async for edge in KnowledgeGraphService._aiter(edges_for(node_ids)):
+            edge_count += 1
+            yield {"type": "edge", "data": edge}
+
+        yield {"type": "end", "node_count": len(node_ids), "edge_count": edge_count, **summary}
+
+    @staticmethod
+    async def _aiter(items: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[Any]:
+        """将列表或异步迭代器统一为异步迭代器"""
+        if hasattr(items, "__aiter__"):
+            async for item in items:
+                yield item
+        else:
+            for item in items:
+                yield item
+
+    # ==================== 结果缓存 ====================
+
+    @classmethod
+    async def _cached(cls, key: Tuple[Hashable, ...], loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        通过结果缓存读取，未命中时调用 loader 查询 Neo4j
+
+        缓存键为 (图版本, 操作名, 规范化后的参数)；查询失败时抛出异常且不缓存。
+        返回的结果可能被多个请求共享，调用方不应修改
+        """
+        if not settings.GRAPH_CACHE_ENABLED:
+            return await loader()
+        cache_key = ((cls._graph_version,) + cls._current_graph_version(),) + key
+        hit, value = cls._result_cache.get(cache_key)
+        if hit:
+            return value
+        value = await loader()
+        cls._result_cache.set(cache_key, value)
+        return value
+
+    @classmethod
+    def on_graph_changed(cls) -> None:
+        """
+        图数据已变化（导入成功后调用）：递增图版本、清空结果缓存、丢弃统计快照、重建 n-gram 索引
+
+        在导入线程中调用（同步）；统计快照在下一次请求时重新查询。
+        其他工作进程通过状态文件中的最近导入时间发现版本变化
+        """
+        cls._graph_version += 1
+        cls._result_cache.clear()
+        cls._statistics_snapshot = None
+        logger.info(f"图数据已更新，结果缓存已清空（版本 {cls._graph_version}）")
+        cls.rebuild_ngram_index()
+
+    @classmethod
+    def get_cache_stats(cls) -> Dict[str, Any]:
+        """结果缓存的命中统计"""
+        return cls._result_cache.stats({
+            "enabled": settings.GRAPH_CACHE_ENABLED,
+            "graph_version": cls._graph_version,
+            "active_database": database_pointer.active,
+            "ngram_index_nodes": len(cls._ngram_index) if cls._ngram_index is not None else None
+        })
+
+    @staticmethod
+    def _current_graph_version() -> Tuple[str, Optional[str]]:
+        """
+        当前在线图的版本：(在线数据库, 最近一次导入完成时间)
+
+        导入完成后由导入进程写入状态文件，其他工作进程据此发现图已变化
+        """
+        active = database_pointer.active
+        return active, database_pointer.get_slot(active).get("built_at")
+
+    @classmethod
+    def rebuild_ngram_index(cls) -> Optional[NGramIndex]:
+        """
+        从 Neo4j 读取全部节点属性，重建 n-gram 倒排索引
+
+        数据导入完成后调用；其他工作进程在下一次搜索时发现图版本变化后重建。
+        未开启 SEARCH_NGRAM_INDEX 时不做任何事
+
+        Returns:
+            NGramIndex: 新索引，未开启或失败时返回 None
+        """
+        if not settings.SEARCH_NGRAM_INDEX:
+            return None
+
+        with cls._ngram_lock:
+            version = cls._current_graph_version()
+            start_time = time.time()
+            try:
+                results = neo4j_client.execute_query(
+                    "MATCH (n) RETURN elementId(n) as id, properties(n) as properties"
+                )
+                index = NGramIndex.build((record["id"], record["properties"]) for record in results)
+            except Exception as e:
+                logger.warning(f"构建 n-gram 索引失败，搜索将使用全文索引/全属性扫描: {e}")
+                return None
+
+            cls._ngram_index = index
+            cls._ngram_version = version
+            logger.info(
+                f"n-gram 索引已构建: {len(index)} 个节点，{index.gram_count} 个 n-gram，"
+                f"耗时 {time.time() - start_time:.2f} 秒"
+            )
+            return index
+
+    @classmethod
+    def _current_ngram_index(cls) -> Optional[NGramIndex]:
+        """返回已构建且与当前在线图一致的 n-gram 索引，需要构建或重建时返回 None（不访问 Neo4j）"""
+        index = cls._ngram_index
+        if index is not None and cls._ngram_version == cls._current_graph_version():
+            return index
+        return None
+
+    @classmethod
+    def _get_ngram_index(cls) -> Optional[NGramIndex]:
+        """获取与当前在线图一致的 n-gram 索引，首次使用或图已变化时重建"""
+        if not settings.SEARCH_NGRAM_INDEX:
+            return None
+        version = cls._current_graph_version()
+        if cls._ngram_index is not None and cls._ngram_version == version:
+            return cls._ngram_index
+
+        with cls._ngram_lock:
+            # 等待锁期间可能已被其他线程重建
+            if cls._ngram_index is not None and cls._ngram_version == version:
+                return cls._ngram_index
+            return cls.rebuild_ngram_index()
+
+    @staticmethod
+    async def _search_ngram(keyword: str, limit: int) -> Optional[tuple]:
+        """
+        通过进程内 n-gram 索引搜索节点，只从 Neo4j 读取命中的节点
+
+        Returns:
+            tuple: (节点列表, 节点ID列表)；未开启或索引不可用时返回 None
+        """
+        if not settings.SEARCH_NGRAM_INDEX:
+            return None
+        # 索引已是最新时直接使用；首次构建或图已变化时需要用同步客户端重建，放到线程池中执行
+        index = KnowledgeGraphService._current_ngram_index()
+        if index is None:
+            index = await asyncio.to_thread(KnowledgeGraphService._get_ngram_index)
+        if index is None:
+            return None
+
+        matched_ids = index.search(keyword, limit)
+        if not matched_ids:
+            return [], []
+
+        hydrate_query = """
+        MATCH (n)
+        WHERE elementId(n) IN $node_ids
+        RETURN elementId(n) as id, labels(n) as labels, properties(n) as properties
+        """
+        results = await async_neo4j_client.execute_query(hydrate_query, {"node_ids": matched_ids})
+        records = {record.get("id"): record for record in results}
+
+        # 按索引命中的顺序返回（索引构建后被删除的节点会被跳过）
+        nodes = []
+        node_ids = []
+        for node_id in matched_ids:
+            record = records.get(node_id)
+            if record is None:
+                continue
+            node_ids.append(node_id)
+            nodes.append({
+                "id": node_id,
+                "labels": record.get("labels") or [],
+                "properties": record.get("properties") or {}
+            })
+
+        return nodes, node_ids
+
+    @staticmethod
+    async def _search_fulltext(keyword: str, limit: int) -> tuple:
+        """
+        通过全文索引搜索节点，按相关度从高到低返回
+
+        关键词作为短语查询（转义 Lucene 特殊字符），cjk 分词器下中文按二元组匹配
+
+        Returns:
+            tuple: (节点列表, 节点ID列表)，节点包含 score 字段；索引不可用时返回空列表
+        """
+        search_query = """
+        CALL db.index.fulltext.queryNodes($index_name, $query, {limit: $limit})
+        YIELD node, score
+        RETURN elementId(node) as id, labels(node) as labels, properties(node) as properties, score
+        """
+        phrase = '"' + LUCENE_SPECIAL_CHARS.sub(r'\\\1', keyword) + '"'
+
+        try:
+            results = await async_neo4j_client.execute_query(
+                search_query,
+                {"index_name": FULLTEXT_INDEX_NAME, "query": phrase, "limit": limit}
+            )
         except Exception as e:
-            logger.error(f"搜索失败: {e}")
-            return {"nodes": [], "edges": []}
+            logger.warning(f"全文索引搜索失败，退回全属性扫描（重新导入数据后会创建索引）: {e}")
+            return [], []
+
+        nodes = []
+        node_ids = []
+        for record in results:
+            node_id = record.get("id")
+            if node_id is None:
+                continue
+            node_ids.append(node_id)
+            nodes.append({
+                "id": node_id,
+                "labels": record.get("labels") or [],
+                "properties": record.get("properties") or {},
+                "score": record.get("score")
+            })
+
+        return nodes, node_ids
+
+    @staticmethod
+    def refresh_fulltext_index(labels: Sequence[str]) -> None:
+        """
+        创建或刷新全文索引（数据导入后调用）
+
+        索引覆盖指定标签节点的全部属性：属性名取自 db.propertyKeys()，
+        标签或属性集合与现有索引不一致时删除重建，并等待索引填充完成。
+        失败只记录警告，搜索会退回全属性扫描
+
+        Args:
+            labels: 需要建立索引的节点标签
+        """
+        index_name = FULLTEXT_INDEX_NAME.replace('`', '``')
+        try:
+            keys = neo4j_client.execute_query(
+                "CALL db.propertyKeys() YIELD propertyKey RETURN collect(propertyKey) as keys"
+            )[0]["keys"]
+            if not keys or not labels:
+                return
+
+            existing = neo4j_client.execute_query(
+                """
+                SHOW FULLTEXT INDEXES YIELD name, labelsOrTypes, properties
+                WHERE name = $name
+                RETURN labelsOrTypes, properties
+                """,
+                {"name": FULLTEXT_INDEX_NAME}
+            )
+            if existing and set(existing[0]["labelsOrTypes"]) == set(labels) \
+                    and set(existing[0]["properties"]) == set(keys):
+                logger.info(f"全文索引 {FULLTEXT_INDEX_NAME} 已是最新")
+                return
+
+            if existing:
+                neo4j_client.execute_query(f"DROP INDEX `{index_name}` IF EXISTS")
+
+            labels_str = '|'.join(f"`{label.replace('`', '``')}`" for label in labels)
+            properties_str = ', '.join(f"n.`{key.replace('`', '``')}`" for key in keys)
+            neo4j_client.execute_query(f"""
+            CREATE FULLTEXT INDEX `{index_name}` IF NOT EXISTS
+            FOR (n:{labels_str}) ON EACH [{properties_str}]
+            OPTIONS {{indexConfig: {{`fulltext.analyzer`: 'cjk'}}}}
+            """)
+            neo4j_client.execute_query(
+                "CALL db.awaitIndex($name, $timeout)",
+                {"name": FULLTEXT_INDEX_NAME, "timeout": FULLTEXT_INDEX_AWAIT_SECONDS}
+            )
+            logger.info(f"全文索引 {FULLTEXT_INDEX_NAME} 已创建: 标签 {list(labels)}, 属性 {len(keys)} 个")
+        except Exception as e:
+            logger.warning(f"创建全文索引失败，搜索将使用全属性扫描: {e}")
 
     @staticmethod
-    def _search_by_multiple_fields(keyword: str, limit: int) -> tuple:
+    async def _search_by_multiple_fields(keyword: str, limit: int) -> tuple:
         """
         宽松模式：搜索节点的所有属性字段
         不再限制特定字段，任何属性包含关键词都会被匹配
@@ -71,7 +608,7 @@ class KnowledgeGraphService:
         LIMIT $limit
         """
 
-        results = neo4j_client.execute_query(
+        results = await async_neo4j_client.execute_query(
             search_query,
             {"keyword": keyword, "limit": limit}
         )
@@ -95,11 +632,12 @@ class KnowledgeGraphService:
         return nodes, node_ids
 
     @staticmethod
-    def _get_relations_between_nodes(node_ids: list) -> list:
+    async def _get_relations_between_nodes(node_ids: list) -> list:
         """
-        获取指定节点列表之间的关系（保留方向）
+        获取指定节点列表之间的全部关系（保留方向）
 
-        使用有向模式 (a)-[r]->(b) 确保从头实体指向尾实体
+        一次查询返回节点集合的导出子图：从每个节点出发按 elementId 定位，
+        只保留终点也在集合中的出边，每条关系恰好返回一次
 
         Args:
             node_ids: 节点ID列表
@@ -107,146 +645,301 @@ class KnowledgeGraphService:
         Returns:
             list: 关系列表
         """
-        edges = []
-        batch_size = 100
-
-        for i in range(0, len(node_ids), batch_size):
-            batch = node_ids[i:i + batch_size]
-            # 使用有向关系模式，并直接在 Cypher 中获取起始和结束节点的 elementId
-            rel_query = """
-            MATCH (a)-[r]->(b)
-            WHERE elementId(a) IN $node_ids AND elementId(b) IN $node_ids
-            RETURN elementId(a) as from_node, elementId(b) as to_node, type(r) as type, elementId(r) as rel_id
-            """
+        return [edge async for edge in KnowledgeGraphService._iter_relations_between_nodes(node_ids)]
 
-            rel_results = neo4j_client.execute_query(rel_query, {"node_ids": batch})
-            for rel_record in rel_results:
-                from_id = rel_record.get("from_node")
-                to_id = rel_record.get("to_node")
-                rel_id = rel_record.get("rel_id")
-                rel_type = rel_record.get("type", "")
+    @staticmethod
+    async def _iter_relations_between_nodes(
+        node_ids: list,
+        database: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        逐条返回指定节点列表之间的关系（从查询游标读取，不在内存中汇总）
 
-                if from_id and to_id and rel_id is not None:
-                    edges.append({
-                        "id": rel_id,
-                        "from_node": from_id,
-                        "to_node": to_id,
-                        "type": rel_type
-                    })
+        Args:
+            node_ids: 节点ID列表
+            database: 数据库名称，默认为在线数据库
+        """
+        if not node_ids:
+            return
+
+        rel_query = """
+        UNWIND $node_ids AS node_id
+        MATCH (a)-[r]->(b)
+        WHERE elementId(a) = node_id AND elementId(b) IN $node_ids
+        RETURN elementId(a) as from_node, elementId(b) as to_node, type(r) as type, elementId(r) as rel_id
+        """
+
+        rel_results = async_neo4j_client.stream_query(rel_query, {"node_ids": list(dict.fromkeys(node_ids))}, database)
+        async for rel_record in rel_results:
+            from_id = rel_record.get("from_node")
+            to_id = rel_record.get("to_node")
+            rel_id = rel_record.get("rel_id")
+            rel_type = rel_record.get("type", "")
 
-        return edges
+            if from_id and to_id and rel_id is not None:
+                yield {
+                    "id": rel_id,
+                    "from_node": from_id,
+                    "to_node": to_id,
+                    "type": rel_type
+                }
 
     @staticmethod
-    def get_node_neighbors(node_id: str, depth: int = 1) -> Dict[str, Any]:
+    def _resolve_max_nodes(depth: int, max_nodes: Optional[int]) -> Optional[int]:
+        """未指定邻居数上限时，多跳展开使用默认上限，直接邻居不限制"""
+        if max_nodes is None and depth > 1:
+            return NEIGHBOR_DEFAULT_MAX_NODES
+        return max_nodes
+
+    @staticmethod
+    async def get_node_neighbors(
+        node_id: str,
+        depth: int = 1,
+        max_nodes: Optional[int] = None,
+        per_hop_limit: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
         获取指定节点的邻居节点和关系（保留方向）
 
+        depth 为 1 时一次查询返回直接邻居及其与中心节点之间的关系；
+        depth 大于 1 时逐跳扩展（每跳一次查询），返回整个邻域的导出子图
+
         Args:
             node_id: 节点的 elementId
             depth: 扩展深度（默认为1，即直接邻居）
+            max_nodes: 返回的邻居节点总数上限，防止从枢纽节点展开时结果爆炸；
+                为 None 时 depth 为 1 不限制（直接邻居由图本身决定），depth 大于 1 使用 NEIGHBOR_DEFAULT_MAX_NODES
+            per_hop_limit: 每一跳新增节点数上限，默认不单独限制（只受 max_nodes 约束）
 
         Returns:
-            包含邻居节点和关系的字典
+            包含邻居节点、关系和是否被截断（truncated）的字典
         """
+        max_nodes = KnowledgeGraphService._resolve_max_nodes(depth, max_nodes)
         try:
-            # 使用有向关系模式查询邻居，同时获取出边和入边
-            # 查询出边：中心节点 -> 邻居
-            outgoing_query = """
-            MATCH (n)-[r]->(neighbor)
-            WHERE elementId(n) = $node_id
-            RETURN elementId(n) as center_id,
-                   elementId(neighbor) as id,
-                   labels(neighbor) as labels,
-                   properties(neighbor) as properties,
-                   elementId(r) as rel_id,
-                   type(r) as rel_type,
-                   elementId(n) as from_node,
-                   elementId(neighbor) as to_node
-            """
+            if depth <= 1:
+                loader = lambda: KnowledgeGraphService._get_direct_neighbors([node_id], max_nodes)
+            else:
+                loader = lambda: KnowledgeGraphService._expand_neighborhood([node_id], depth, max_nodes, per_hop_limit)
+            result = await KnowledgeGraphService._cached(
+                ("neighbors", node_id, depth, max_nodes, per_hop_limit if depth > 1 else None),
+                loader
+            )
 
-            # 查询入边：邻居 -> 中心节点
-            incoming_query = """
-            MATCH (neighbor)-[r]->(n)
-            WHERE elementId(n) = $node_id
-            RETURN elementId(n) as center_id,
-                   elementId(neighbor) as id,
-                   labels(neighbor) as labels,
-                   properties(neighbor) as properties,
-                   elementId(r) as rel_id,
-                   type(r) as rel_type,
-                   elementId(neighbor) as from_node,
-                   elementId(n) as to_node
-            """
+            logger.info(
+                f"节点 {node_id} 的 {depth} 跳邻居: {len(result['nodes'])} 个节点, "
+                f"{len(result['edges'])} 条关系{'（已截断）' if result['truncated'] else ''}"
+            )
+            return result
 
-            nodes = {}
-            edges = []
+        except Exception as e:
+            logger.error(f"获取节点邻居失败: {e}")
+            raise
 
-            # 处理出边
-            results = neo4j_client.execute_query(outgoing_query, {"node_id": node_id})
-            for record in results:
-                neighbor_id = record.get("id")
-                neighbor_labels = record.get("labels", [])
-                neighbor_properties = record.get("properties", {})
+    @staticmethod
+    async def get_neighbors_batch(
+        node_ids: List[str],
+        depth: int = 1,
+        max_nodes: Optional[int] = None,
+        per_hop_limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        批量展开多个节点的邻居，返回合并后的子图（节点和关系均已去重）
+
+        depth 为 1 时一次 UNWIND 查询完成；depth 大于 1 时以全部节点为起点逐跳扩展。
+        结果经过结果缓存，同一组节点（与顺序无关）和参数再次展开时直接返回
+
+        Args:
+            node_ids: 要展开的节点 elementId 列表
+            depth: 扩展深度
+            max_nodes: 返回的邻居节点总数上限，默认值与 get_node_neighbors 相同
+            per_hop_limit: 每一跳新增节点数上限
+
+        Returns:
+            包含邻居节点（不含传入的节点）、关系和 truncated 的字典
+        """
+        max_nodes = KnowledgeGraphService._resolve_max_nodes(depth, max_nodes)
+        node_ids = list(dict.fromkeys(node_ids))
+        if not node_ids:
+            return {"nodes": [], "edges": [], "truncated": False}
+
+        try:
+            if depth <= 1:
+                loader = lambda: KnowledgeGraphService._get_direct_neighbors(node_ids, max_nodes)
+            else:
+                loader = lambda: KnowledgeGraphService._expand_neighborhood(node_ids, depth, max_nodes, per_hop_limit)
+            # 结果与传入顺序无关，按排序后的节点集合缓存
+            result = await KnowledgeGraphService._cached(
+                ("neighbors_batch", tuple(sorted(node_ids)), depth, max_nodes, per_hop_limit if depth > 1 else None),
+                loader
+            )
+
+            logger.info(
+                f"批量展开 {len(node_ids)} 个节点的 {depth} 跳邻居: {len(result['nodes'])} 个节点, "
+                f"{len(result['edges'])} 条关系{'（已截断）' if result['truncated'] else ''}"
+            )
+            return result
+
+        except Exception as e:
+            logger.error(f"批量获取节点邻居失败: {e}")
+            raise
+
+    @staticmethod
+    async def _get_direct_neighbors(node_ids: List[str], max_nodes: Optional[int]) -> Dict[str, Any]:
+        """
+        一次查询获取一组节点的直接邻居：使用无向模式同时匹配出边和入边，
+        关系方向由 startNode/endNode 给出（头实体 -> 尾实体）；
+        按邻居聚合关系（邻居去重）后再限制邻居数量（max_nodes 为 None 时不限制）
+
+        传入的节点互为邻居时只返回它们之间的关系，不重复返回节点
+
+        Returns:
+            包含邻居节点、关系和 truncated 的字典
+        """
+        limit_clause = "LIMIT $limit" if max_nodes is not None else ""
+        neighbor_query = f"""
+        UNWIND $node_ids AS node_id
+        MATCH (n)-[r]-(neighbor)
+        WHERE elementId(n) = node_id
+        WITH neighbor, collect(DISTINCT {{
+            rel_id: elementId(r),
+            rel_type: type(r),
+            from_node: elementId(startNode(r)),
+            to_node: elementId(endNode(r))
+        }}) as rels
+        {limit_clause}
+        RETURN elementId(neighbor) as id,
+               labels(neighbor) as labels,
+               properties(neighbor) as properties,
+               rels
+        """
 
-                if neighbor_id and neighbor_id not in nodes:
-                    nodes[neighbor_id] = {
-                        "id": neighbor_id,
-                        "labels": neighbor_labels if isinstance(neighbor_labels, list) else [],
-                        "properties": neighbor_properties if isinstance(neighbor_properties, dict) else {}
-                    }
+        parameters = {"node_ids": node_ids}
+        if max_nodes is not None:
+            # 多取一个用于判断是否被截断
+            parameters["limit"] = max_nodes + 1
+        results = await async_neo4j_client.execute_query(neighbor_query, parameters)
+        truncated = max_nodes is not None and len(results) > max_nodes
+
+        seeds = set(node_ids)
+        nodes = {}
+        edges = []
+        seen_rel_ids = set()
 
-                rel_id = record.get("rel_id")
-                rel_type = record.get("rel_type", "")
-                from_id = record.get("from_node")
-                to_id = record.get("to_node")
+        for record in results[:max_nodes]:
+            neighbor_id = record.get("id")
+            neighbor_labels = record.get("labels", [])
+            neighbor_properties = record.get("properties", {})
 
-                if rel_id is not None and from_id and to_id:
+            if neighbor_id and neighbor_id not in nodes and neighbor_id not in seeds:
+                nodes[neighbor_id] = {
+                    "id": neighbor_id,
+                    "labels": neighbor_labels if isinstance(neighbor_labels, list) else [],
+                    "properties": neighbor_properties if isinstance(neighbor_properties, dict) else {}
+                }
+
+            for rel in record.get("rels") or []:
+                rel_id = rel.get("rel_id")
+                from_id = rel.get("from_node")
+                to_id = rel.get("to_node")
+
+                # 传入节点之间的关系会从两端各匹配一次，只保留一次
+                if rel_id is not None and from_id and to_id and rel_id not in seen_rel_ids:
+                    seen_rel_ids.add(rel_id)
                     edges.append({
                         "id": rel_id,
                         "from_node": from_id,
                         "to_node": to_id,
-                        "type": rel_type
+                        "type": rel.get("rel_type", "")
                     })
 
-            # 处理入边
-            results = neo4j_client.execute_query(incoming_query, {"node_id": node_id})
+        return {
+            "nodes": list(nodes.values()),
+            "edges": edges,
+            "truncated": truncated
+        }
+
+    @staticmethod
+    async def _expand_neighborhood(
+        seed_ids: List[str],
+        depth: int,
+        max_nodes: int,
+        per_hop_limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        从一组起始节点逐跳扩展邻域（广度优先）
+
+        每一跳一次 UNWIND 查询：以上一跳新增的节点为边界，取出尚未访问过的邻居（去重），
+        并受每跳上限和总数上限约束；扩展结束后一次查询取回所有节点（含起始节点）之间的关系
+
+        Args:
+            seed_ids: 起始节点 elementId 列表
+            depth: 扩展深度
+            max_nodes: 新增节点总数上限
+            per_hop_limit: 每一跳新增节点数上限
+
+        Returns:
+            包含邻居节点（不含起始节点）、关系和 truncated 的字典
+        """
+        frontier_query = """
+        UNWIND $frontier AS node_id
+        MATCH (n)--(neighbor)
+        WHERE elementId(n) = node_id
+        WITH DISTINCT neighbor
+        WHERE NOT elementId(neighbor) IN $visited
+        LIMIT $limit
+        RETURN elementId(neighbor) as id,
+               labels(neighbor) as labels,
+               properties(neighbor) as properties
+        """
+
+        visited = list(dict.fromkeys(seed_ids))
+        frontier = list(visited)
+        nodes = {}
+        truncated = False
+
+        for _ in range(depth):
+            if not frontier:
+                break
+            budget = max_nodes - len(nodes)
+            if budget <= 0:
+                truncated = True
+                break
+            limit = min(budget, per_hop_limit) if per_hop_limit else budget
+
+            # 多取一个用于判断是否被截断
+            results = await async_neo4j_client.execute_query(
+                frontier_query,
+                {"frontier": frontier, "visited": visited, "limit": limit + 1}
+            )
+            if len(results) > limit:
+                truncated = True
+                results = results[:limit]
+
+            frontier = []
             for record in results:
                 neighbor_id = record.get("id")
+                if not neighbor_id or neighbor_id in nodes:
+                    continue
                 neighbor_labels = record.get("labels", [])
                 neighbor_properties = record.get("properties", {})
+                nodes[neighbor_id] = {
+                    "id": neighbor_id,
+                    "labels": neighbor_labels if isinstance(neighbor_labels, list) else [],
+                    "properties": neighbor_properties if isinstance(neighbor_properties, dict) else {}
+                }
+                frontier.append(neighbor_id)
+                visited.append(neighbor_id)
 
-                if neighbor_id and neighbor_id not in nodes:
-                    nodes[neighbor_id] = {
-                        "id": neighbor_id,
-                        "labels": neighbor_labels if isinstance(neighbor_labels, list) else [],
-                        "properties": neighbor_properties if isinstance(neighbor_properties, dict) else {}
-                    }
-
-                rel_id = record.get("rel_id")
-                rel_type = record.get("rel_type", "")
-                from_id = record.get("from_node")
-                to_id = record.get("to_node")
-
-                if rel_id is not None and from_id and to_id:
-                    edges.append({
-                        "id": rel_id,
-                        "from_node": from_id,
-                        "to_node": to_id,
-                        "type": rel_type
-                    })
-
-            logger.info(f"节点 {node_id} 的邻居: {len(nodes)} 个节点, {len(edges)} 条关系")
-            return {
-                "nodes": list(nodes.values()),
-                "edges": edges
-            }
+        edges = await KnowledgeGraphService._get_relations_between_nodes(visited)
 
-        except Exception as e:
-            logger.error(f"获取节点邻居失败: {e}")
-            raise
+        return {
+            "nodes": list(nodes.values()),
+            "edges": edges,
+            "truncated": truncated
+        }
 
     @staticmethod
-    def get_graph_data(limit: int = 100) -> Dict[str, Any]:
+    async def get_graph_data(limit: int = 100) -> Dict[str, Any]:
         """
         获取图谱数据（节点和关系）用于可视化
 
@@ -256,6 +949,14 @@ class KnowledgeGraphService:
         Returns:
             包含节点和关系的字典
         """
+        return await KnowledgeGraphService._cached(
+            ("graph_data", limit),
+            lambda: KnowledgeGraphService._load_graph_data(limit)
+        )
+
+    @staticmethod
+    async def _load_graph_data(limit: int) -> Dict[str, Any]:
+        """从 Neo4j 读取图谱数据（不经过缓存）"""
         # 获取节点，使用显式投影返回完整的节点信息
         nodes_query = """
         MATCH (n)
@@ -265,7 +966,7 @@ class KnowledgeGraphService:
 
         try:
             # 获取节点
-            results = neo4j_client.execute_query(nodes_query, {"limit": limit})
+            results = await async_neo4j_client.execute_query(nodes_query, {"limit": limit})
 
             nodes = []
             node_ids = []
@@ -284,7 +985,7 @@ class KnowledgeGraphService:
                     })
 
             # 获取这些节点之间的关系
-            edges = KnowledgeGraphService._get_relations_between_nodes(node_ids)
+            edges = await KnowledgeGraphService._get_relations_between_nodes(node_ids)
 
             logger.info(f"获取图谱数据成功: {len(nodes)} 个节点, {len(edges)} 条关系")
             return {
@@ -297,39 +998,268 @@ class KnowledgeGraphService:
             raise
 
     @staticmethod
-    def get_graph_statistics() -> Dict[str, Any]:
+    async def get_graph_data_page(page_size: int = GRAPH_PAGE_DEFAULT_SIZE, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        按游标分页获取图谱数据，用于逐页加载大图
+
+        依次按导入的各主标签（设备、人员、物料、工艺、故障）分页，标签内按业务主键
+        （设备编号、工号等，导入时创建了范围索引）和 elementId 排序。游标记录上一页最后一个
+        节点的 (标签序号, 业务主键, elementId)，每页是一次索引范围查找（键集分页，不使用 SKIP），
+        代价与页码无关。每页返回的关系是本页节点与已加载节点（包括本页）之间的关系，
+        每条关系只在其较晚加载的端点所在页返回一次，逐页合并后即为完整的图
+
+        说明：只包含带有导入主标签且业务主键不为空的节点（导入的节点都满足）；
+        同一标签下业务主键的类型需一致（Excel 中的编号列）
+
+        Args:
+            page_size: 每页节点数
+            cursor: 上一页返回的 next_cursor，为空时从第一页开始
+
+        Returns:
+            dict: nodes、edges、next_cursor（没有下一页时为 None）、has_more
+
+        Raises:
+            ValueError: 游标无效，或分页期间图已重新导入（需从第一页重新加载）
+        """
+        version = KnowledgeGraphService._current_graph_version()
+        after = None
+        if cursor:
+            after = KnowledgeGraphService._decode_page_cursor(cursor, version)
+
+        return await KnowledgeGraphService._cached(
+            ("graph_page", after, page_size),
+            lambda: KnowledgeGraphService._load_graph_page(after, page_size, version)
+        )
+
+    @staticmethod
+    def _page_labels() -> List[Tuple[str, str]]:
+        """分页使用的 (主标签, 业务主键属性) 列表，顺序即加载顺序"""
+        # 延迟导入：data_import_service 依赖本模块
+        from app.services.data_import_service import ENTITY_SHEETS
+        return [(config["label"], config["id_column"]) for config in ENTITY_SHEETS.values()]
+
+    @staticmethod
+    async def _load_graph_page(
+        after: Optional[Tuple[int, Any, str]],
+        page_size: int,
+        version: Tuple[str, Optional[str]]
+    ) -> Dict[str, Any]:
+        """从 Neo4j 读取一页图谱数据（不经过缓存）"""
+        page_labels = KnowledgeGraphService._page_labels()
+        start_ord = after[0] if after else 0
+
+        # 多取一个节点用于判断是否还有下一页；当前标签取不满时继续下一个标签
+        results = []
+        for ord_ in range(start_ord, len(page_labels)):
+            remaining = page_size + 1 - len(results)
+            if remaining <= 0:
+                break
+            label, key_prop = page_labels[ord_]
+            label_str = label.replace('`', '``')
+            key_str = key_prop.replace('`', '``')
+            params = {"limit": remaining}
+            if after and ord_ == start_ord:
+                # 范围条件写成 key >= $after_key，可以使用业务主键上的范围索引
+                where = (
+                    f"n.`{key_str}` >= $after_key AND "
+                    f"(n.`{key_str}` > $after_key OR elementId(n) > $after_id)"
+                )
+                params.update({"after_key": after[1], "after_id": after[2]})
+            else:
+                where = f"n.`{key_str}` IS NOT NULL"
+            nodes_query = f"""
+            MATCH (n:`{label_str}`)
+            WHERE {where}
+            WITH n, n.`{key_str}` as key, elementId(n) as id
+            ORDER BY key, id
+            LIMIT $limit
+            RETURN id, key, labels(n) as labels, properties(n) as properties
+            """
+            for record in await async_neo4j_client.execute_query(nodes_query, params):
+                results.append((ord_, record))
+
+        has_more = len(results) > page_size
+        results = results[:page_size]
+
+        nodes = [
+            {
+                "id": record.get("id"),
+                "labels": record.get("labels") or [],
+                "properties": record.get("properties") or {}
+            }
+            for _, record in results
+        ]
+
+        # 另一端已加载（排序位置不晚于本端）的关系在本端所在页返回
+        edges = []
+        if results:
+            ord_cases = " ".join(
+                f"WHEN m:`{label.replace('`', '``')}` THEN {i}" for i, (label, _) in enumerate(page_labels)
+            )
+            rel_query = f"""
+            UNWIND $rows AS row
+            MATCH (n)-[r]-(m)
+            WHERE elementId(n) = row.id
+            WITH row, r, m, CASE {ord_cases} ELSE null END AS m_ord
+            WITH row, r, m, m_ord, CASE WHEN m_ord IS NULL THEN null ELSE m[$key_props[m_ord]] END AS m_key
+            WHERE m_ord < row.ord OR (m_ord = row.ord AND (
+                m_key < row.key OR (m_key = row.key AND elementId(m) <= row.id)
+            ))
+            RETURN DISTINCT elementId(startNode(r)) as from_node, elementId(endNode(r)) as to_node,
+                   type(r) as type, elementId(r) as rel_id
+            """
+            rows = [{"id": record.get("id"), "ord": ord_, "key": record.get("key")} for ord_, record in results]
+            key_props = [key_prop for _, key_prop in page_labels]
+            for rel_record in await async_neo4j_client.execute_query(rel_query, {"rows": rows, "key_props": key_props}):
+                edges.append({
+                    "id": rel_record.get("rel_id"),
+                    "from_node": rel_record.get("from_node"),
+                    "to_node": rel_record.get("to_node"),
+                    "type": rel_record.get("type", "")
+                })
+
+        next_cursor = None
+        if has_more and results:
+            last_ord, last = results[-1]
+            next_cursor = KnowledgeGraphService._encode_page_cursor(
+                (last_ord, last.get("key"), last.get("id")), version
+            )
+
+        logger.info(f"分页获取图谱数据: {len(nodes)} 个节点, {len(edges)} 条关系, 还有下一页: {has_more}")
+        return {
+            "nodes": nodes,
+            "edges": edges,
+            "next_cursor": next_cursor,
+            "has_more": has_more
+        }
+
+    @staticmethod
+    def _encode_page_cursor(after: Tuple[int, Any, str], version: Tuple[str, Optional[str]]) -> str:
+        """生成分页游标：上一页最后一个节点的 (标签序号, 业务主键, elementId) 和当前图版本，base64url 编码"""
+        payload = json.dumps(
+            {"after": list(after), "db": version[0], "built_at": version[1]},
+            separators=(",", ":"), ensure_ascii=False, default=str
+        )
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def _decode_page_cursor(cursor: str, version: Tuple[str, Optional[str]]) -> Tuple[int, Any, str]:
+        """解析分页游标，返回上一页最后一个节点的 (标签序号, 业务主键, elementId)"""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            ord_, key, element_id = payload["after"]
+        except Exception:
+            raise ValueError("无效的分页游标")
+        if not isinstance(ord_, int) or key is None or not isinstance(element_id, str):
+            raise ValueError("无效的分页游标")
+        # 重新导入后 elementId 不再对应原来的节点，必须从第一页重新加载
+        if (payload.get("db"), payload.get("built_at")) != tuple(version):
+            raise ValueError("图谱数据已更新，请从第一页重新加载")
+        return ord_, key, element_id
+
+    @classmethod
+    async def get_graph_statistics(cls, refresh: bool = False) -> Dict[str, Any]:
         """
         获取图谱统计信息
 
+        返回进程内的统计快照，快照在导入完成后或超过 GRAPH_STATISTICS_TTL 秒后重新查询，
+        健康检查等高频调用不会每次都访问 Neo4j。查询失败时不缓存，下次调用重新查询
+
+        Args:
+            refresh: 是否忽略快照强制重新查询
+
         Returns:
-            包含节点数、关系数等统计信息
+            包含节点数、关系数、各标签节点数、各关系类型关系数等统计信息
+        """
+        version = (cls._graph_version,) + cls._current_graph_version()
+        if not refresh and cls._statistics_fresh(version):
+            return cls._statistics_snapshot
+
+        async with cls._statistics_lock:
+            # 等待锁期间其他请求可能已经刷新
+            if not refresh and cls._statistics_fresh(version):
+                return cls._statistics_snapshot
+
+            stats = await cls._collect_graph_statistics()
+            if stats["connected"]:
+                cls._statistics_snapshot = stats
+                cls._statistics_version = version
+                cls._statistics_expires_at = time.monotonic() + settings.GRAPH_STATISTICS_TTL
+            return stats
+
+    @classmethod
+    def _statistics_fresh(cls, version: Tuple[Any, ...]) -> bool:
+        """统计快照是否属于当前图版本且未过期"""
+        return (
+            cls._statistics_snapshot is not None
+            and cls._statistics_version == version
+            and time.monotonic() < cls._statistics_expires_at
+        )
+
+    @staticmethod
+    async def _collect_graph_statistics() -> Dict[str, Any]:
+        """
+        从 Neo4j 查询统计信息（不经过快照）
+
+        节点总数、关系总数以及按单个标签/关系类型的计数都由计数存储直接给出，
+        不需要扫描节点和关系：先取出标签和关系类型列表，再拼成一条 UNION ALL 查询一次返回全部计数
         """
         stats = {
             "node_count": None,
             "relationship_count": None,
             "labels": [],
             "relationship_types": [],
+            "label_counts": {},
+            "relationship_type_counts": {},
             "connected": False
         }
 
         try:
-            # 尝试连接并查询
-            results = neo4j_client.execute_query("MATCH (n) RETURN count(n) as count")
+            results = await async_neo4j_client.execute_query(
+                """
+                CALL db.labels() YIELD label
+                WITH collect(label) as labels
+                // 子查询中聚合，没有关系类型时也返回一行，标签不会丢失
+                CALL {
+                    CALL db.relationshipTypes() YIELD relationshipType
+                    RETURN collect(relationshipType) as types
+                }
+                RETURN labels, types
+                """
+            )
+            stats["connected"] = True
             if results:
-                stats["node_count"] = results[0].get("count")
-                stats["connected"] = True
+                stats["labels"] = results[0].get("labels") or []
+                stats["relationship_types"] = results[0].get("types") or []
 
-            results = neo4j_client.execute_query("MATCH ()-[r]->() RETURN count(r) as count")
-            if results:
-                stats["relationship_count"] = results[0].get("count")
+            parts = [
+                "MATCH (n) RETURN 'total' as kind, 'node' as name, count(n) as count",
+                "MATCH ()-[r]->() RETURN 'total' as kind, 'relationship' as name, count(r) as count",
+            ]
+            params = {}
+            for i, label in enumerate(stats["labels"]):
+                params[f"label_{i}"] = label
+                parts.append(
+                    f"MATCH (n:`{label.replace('`', '``')}`) "
+                    f"RETURN 'label' as kind, $label_{i} as name, count(n) as count"
+                )
+            for i, rel_type in enumerate(stats["relationship_types"]):
+                params[f"type_{i}"] = rel_type
+                parts.append(
+                    f"MATCH ()-[r:`{rel_type.replace('`', '``')}`]->() "
+                    f"RETURN 'type' as kind, $type_{i} as name, count(r) as count"
+                )
 
-            results = neo4j_client.execute_query("CALL db.labels() YIELD label RETURN collect(label) as labels")
-            if results:
-                stats["labels"] = results[0].get("labels", [])
+            for record in await async_neo4j_client.execute_query("\nUNION ALL\n".join(parts), params):
+                kind, name, count = record.get("kind"), record.get("name"), record.get("count")
+                if kind == "total":
+                    stats["node_count" if name == "node" else "relationship_count"] = count
+                elif kind == "label":
+                    stats["label_counts"][name] = count
+                else:
+                    stats["relationship_type_counts"][name] = count
 
-            results = neo4j_client.execute_query("CALL db.relationshipTypes() YIELD relationshipType RETURN collect(relationshipType) as types")
-            if results:
-                stats["relationship_types"] = results[0].get("types", [])
+            stats["refreshed_at"] = datetime.now().isoformat(timespec="seconds")
 
         except Exception as e:
             logger.warning(f"获取统计信息失败: {e}")
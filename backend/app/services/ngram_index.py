@@ -0,0 +1,150 @@
+"""
+进程内 n-gram 倒排索引
+用于中文短片段（如"开机"、"10天"）的子串搜索，语义与 Cypher 的 toString(n[key]) CONTAINS $keyword 一致
+
+索引对每个节点的每个属性值按字符切分 1~3 元组（同一属性值内切分，不跨属性），
+查询时对关键词的 n-gram 倒排表求交集得到候选节点，再用子串匹配校验，
+只有最终命中的前 N 个节点才需要回 Neo4j 读取完整数据
+"""
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+def property_to_text(value: Any) -> Optional[str]:
+    """
+    将属性值转换为文本，尽量与 Cypher 的 toString() 保持一致
+
+    列表类型的属性逐个元素转换后以逗号连接
+    """
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (list, tuple)):
+        return ", ".join(text for text in (property_to_text(v) for v in value) if text is not None)
+    if hasattr(value, "iso_format"):
+        # neo4j.time.DateTime / Date 等
+        return value.iso_format()
+    return str(value)
+
+
+class NGramIndex:
+    """
+    字符 n-gram 倒排索引（不可变，构建完成后只读，可在多线程间共享）
+
+    Example:
+        ```python
+        index = NGramIndex.build([("4:abc:1", {"设备名称": "数控车床"})])
+        index.search("车床", limit=10)  # ["4:abc:1"]
+        ```
+    """
+
+    def __init__(self, max_n: int = 3):
+        """
+        Args:
+            max_n: 最大 n-gram 长度，关键词长度超过 max_n 时按 max_n 元组求交集后再校验
+        """
+        self.max_n = max_n
+        # 文档序号 -> 节点 elementId
+        self._doc_ids: List[str] = []
+        # 文档序号 -> 属性文本列表（用于子串校验）
+        self._doc_texts: List[Tuple[str, ...]] = []
+        # n-gram -> 文档序号集合
+        self._postings: Dict[str, Set[int]] = {}
+
+    @classmethod
+    def build(cls, documents: Iterable[Tuple[str, Dict[str, Any]]], max_n: int = 3) -> "NGramIndex":
+        """
+        构建索引
+
+        Args:
+            documents: (节点 elementId, 节点属性) 的可迭代对象
+            max_n: 最大 n-gram 长度
+
+        Returns:
+            NGramIndex: 构建好的索引
+        """
+        index = cls(max_n=max_n)
+        for doc_id, properties in documents:
+            index._add(doc_id, properties)
+        return index
+
+    def _add(self, doc_id: str, properties: Dict[str, Any]) -> None:
+        """添加一个节点"""
+        texts = tuple(
+            text for text in (property_to_text(v) for v in (properties or {}).values()) if text
+        )
+        ordinal = len(self._doc_ids)
+        self._doc_ids.append(doc_id)
+        self._doc_texts.append(texts)
+
+        for gram in self._grams_of_texts(texts):
+            posting = self._postings.get(gram)
+            if posting is None:
+                self._postings[gram] = {ordinal}
+            else:
+                posting.add(ordinal)
+
+    def _grams_of_texts(self, texts: Iterable[str]) -> Set[str]:
+        """切分文本的全部 1~max_n 元组"""
+        grams = set()
+        for text in texts:
+            length = len(text)
+            for n in range(1, self.max_n + 1):
+                for i in range(length - n + 1):
+                    grams.add(text[i:i + n])
+        return grams
+
+    def _query_grams(self, keyword: str) -> List[str]:
+        """关键词用于求交集的 n-gram：长度不超过 max_n 时为关键词本身，否则为全部 max_n 元组"""
+        if len(keyword) <= self.max_n:
+            return [keyword]
+        n = self.max_n
+        return list({keyword[i:i + n] for i in range(len(keyword) - n + 1)})
+
+    def search(self, keyword: str, limit: Optional[int] = None) -> List[str]:
+        """
+        子串搜索
+
+        Args:
+            keyword: 关键词（区分大小写，与 CONTAINS 一致）
+            limit: 最大返回数量，None 表示不限制
+
+        Returns:
+            list: 命中节点的 elementId，按加入索引的顺序
+        """
+        if not keyword:
+            return []
+
+        postings = []
+        for gram in self._query_grams(keyword):
+            posting = self._postings.get(gram)
+            if not posting:
+                return []
+            postings.append(posting)
+
+        # 从最短的倒排表开始求交集
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                return []
+
+        # 关键词不超过 max_n 时倒排表即为精确结果，否则需要校验 n-gram 是否连续出现
+        exact = len(keyword) <= self.max_n
+        result = []
+        for ordinal in sorted(candidates):
+            if exact or any(keyword in text for text in self._doc_texts[ordinal]):
+                result.append(self._doc_ids[ordinal])
+                if limit is not None and len(result) >= limit:
+                    break
+        return result
+
+    def __len__(self) -> int:
+        """索引中的节点数"""
+        return len(self._doc_ids)
+
+    @property
+    def gram_count(self) -> int:
+        """不同 n-gram 的数量"""
+        return len(self._postings)
@@ -2,11 +2,14 @@
 操作日志服务
 提供日志记录、查询、统计等功能
 """
-from typing import Optional, List, Dict
+import json
+import base64
+from typing import Any, Optional, List, Dict, Tuple
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy import and_, or_, func, desc, select, delete, text
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.models.operation_log import OperationLog
 from app.schemas.operation_log import OperationLogCreate, OperationLogQuery
 
@@ -26,6 +29,9 @@ class OperationLogService:
     ACTION_DELETE = "DELETE"
     ACTION_EXPORT = "EXPORT"
     ACTION_SEARCH = "SEARCH"
+    ACTION_UPLOAD = "UPLOAD"
+    ACTION_IMPORT = "IMPORT"
+    ACTION_REIMPORT = "REIMPORT"
 
     # 模块枚举
     MODULE_AUTH = "认证"
@@ -33,10 +39,18 @@ class OperationLogService:
     MODULE_KNOWLEDGE_GRAPH = "知识图谱"
     MODULE_CHAT = "智能问答"
     MODULE_SYSTEM = "系统"
+    MODULE_DATA_IMPORT = "data_import"
+
+    # 游标分页的总数计算方式
+    TOTAL_EXACT = "exact"
+    TOTAL_CAPPED = "capped"
+    TOTAL_APPROX = "approx"
+    TOTAL_NONE = "none"
+    TOTAL_MODES = (TOTAL_EXACT, TOTAL_CAPPED, TOTAL_APPROX, TOTAL_NONE)
 
     @staticmethod
-    def create_log(
-        db: Session,
+    async def create_log(
+        db: AsyncSession,
         user_id: int,
         username: str,
         action_type: str,
@@ -74,13 +88,13 @@ class OperationLogService:
             remark=remark
         )
         db.add(log)
-        db.commit()
-        db.refresh(log)
+        await db.commit()
+        await db.refresh(log)
         return log
 
     @staticmethod
-    def create_log_from_schema(
-        db: Session,
+    async def create_log_from_schema(
+        db: AsyncSession,
         log_data: OperationLogCreate
     ) -> OperationLog:
         """
@@ -93,7 +107,7 @@ class OperationLogService:
         Returns:
             OperationLog: 创建的日志对象
         """
-        return OperationLogService.create_log(
+        return await OperationLogService.create_log(
             db=db,
             user_id=log_data.user_id,
             username=log_data.username,
@@ -106,8 +120,8 @@ class OperationLogService:
         )
 
     @staticmethod
-    def get_logs(
-        db: Session,
+    async def get_logs(
+        db: AsyncSession,
         skip: int = 0,
         limit: int = 10,
         query: Optional[OperationLogQuery] = None
@@ -115,6 +129,8 @@ class OperationLogService:
         """
         获取操作日志列表（支持分页和筛选）
 
+        使用 COUNT + OFFSET，页码越大越慢，日志量大时使用 get_logs_page
+
         Args:
             db: 数据库会话
             skip: 跳过记录数
@@ -125,48 +141,172 @@ class OperationLogService:
             tuple: (日志列表, 总记录数)
         """
         # 构建查询
-        q = db.query(OperationLog)
+        q = select(OperationLog)
+        filters = OperationLogService._build_filters(query)
+        if filters:
+            q = q.where(and_(*filters))
 
-        # 应用筛选条件
-        if query:
-            filters = []
+        # 获取总数
+        total = await db.scalar(select(func.count()).select_from(q.subquery()))
 
-            # 按用户名筛选
-            if query.username:
-                filters.append(OperationLog.username.like(f"%{query.username}%"))
+        # 分页查询，按时间倒序排列
+        result = await db.execute(q.order_by(desc(OperationLog.created_at)).offset(skip).limit(limit))
+        logs = list(result.scalars().all())
 
-            # 按行为类型筛选
-            if query.action_type:
-                filters.append(OperationLog.action_type == query.action_type)
+        return logs, total or 0
 
-            # 按模块筛选
-            if query.module:
-                filters.append(OperationLog.module == query.module)
+    @staticmethod
+    async def get_logs_page(
+        db: AsyncSession,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        query: Optional[OperationLogQuery] = None,
+        total_mode: str = TOTAL_CAPPED
+    ) -> Dict[str, Any]:
+        """
+        按游标分页获取操作日志（键集分页）
 
-            # 按状态筛选
-            if query.status is not None:
-                filters.append(OperationLog.status == query.status)
+        按 (created_at, id) 倒序排列，游标记录上一页最后一条日志的 created_at 和 id，
+        查询条件为 created_at < t OR (created_at = t AND id < id)，不使用 OFFSET。
+        InnoDB 二级索引末尾隐含主键，idx_created_at 和 idx_user_time / idx_module_time /
+        idx_action_time 分别相当于 (created_at, id) 和 (筛选列, created_at, id)，
+        每一页都是一次索引范围扫描，代价与翻到第几页无关
 
-            # 按时间范围筛选
-            if query.start_date:
-                filters.append(OperationLog.created_at >= query.start_date)
-            if query.end_date:
-                filters.append(OperationLog.created_at <= query.end_date)
+        总数的计算方式（total_mode）：
+        - exact: COUNT(*) 精确计数，日志量大时很慢
+        - capped: 最多数到 OPERATION_LOG_COUNT_CAP 条，超过时返回上限并标记为不精确
+        - approx: 无筛选条件时读取 MySQL 表统计信息中的估算行数，其他情况按 capped 计算
+        - none: 不计算总数（翻页时沿用第一页的总数）
 
-            # 应用所有筛选条件
-            if filters:
-                q = q.filter(and_(*filters))
+        Args:
+            db: 数据库会话
+            limit: 每页记录数
+            cursor: 上一页返回的 next_cursor，为空时从第一页开始
+            query: 查询条件
+            total_mode: 总数计算方式
 
-        # 获取总数
-        total = q.count()
+        Returns:
+            dict: items、next_cursor（没有下一页时为 None）、has_more、total、total_exact
 
-        # 分页查询，按时间倒序排列
-        logs = q.order_by(desc(OperationLog.created_at)).offset(skip).limit(limit).all()
+        Raises:
+            ValueError: 游标无效或总数计算方式不支持
+        """
+        if total_mode not in OperationLogService.TOTAL_MODES:
+            raise ValueError(f"不支持的总数计算方式: {total_mode}")
+
+        filters = OperationLogService._build_filters(query)
+        page_filters = list(filters)
+        if cursor:
+            created_at, log_id = OperationLogService._decode_page_cursor(cursor)
+            page_filters.append(or_(
+                OperationLog.created_at < created_at,
+                and_(OperationLog.created_at == created_at, OperationLog.id < log_id)
+            ))
+
+        # 多取一条用于判断是否还有下一页
+        q = select(OperationLog)
+        if page_filters:
+            q = q.where(and_(*page_filters))
+        result = await db.execute(
+            q.order_by(desc(OperationLog.created_at), desc(OperationLog.id)).limit(limit + 1)
+        )
+        logs = list(result.scalars().all())
+        has_more = len(logs) > limit
+        logs = logs[:limit]
+
+        next_cursor = None
+        if has_more and logs:
+            next_cursor = OperationLogService._encode_page_cursor(logs[-1])
 
-        return logs, total
+        total, total_exact = None, False
+        if total_mode != OperationLogService.TOTAL_NONE:
+            total, total_exact = await OperationLogService._count_logs(db, filters, total_mode)
+
+        return {
+            "items": logs,
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+            "total": total,
+            "total_exact": total_exact
+        }
+
+    @staticmethod
+    async def _count_logs(db: AsyncSession, filters: list, total_mode: str) -> Tuple[int, bool]:
+        """按 total_mode 计算日志总数，返回 (总数, 是否精确)"""
+        if total_mode == OperationLogService.TOTAL_APPROX and not filters and db.get_bind().dialect.name == "mysql":
+            estimate = await db.scalar(
+                text(
+                    "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+                ),
+                {"table": OperationLog.__tablename__}
+            )
+            if estimate is not None:
+                return int(estimate), False
+
+        q = select(OperationLog.id)
+        if filters:
+            q = q.where(and_(*filters))
+
+        if total_mode == OperationLogService.TOTAL_EXACT:
+            total = await db.scalar(select(func.count()).select_from(q.subquery()))
+            return total or 0, True
+
+        # 最多扫描 cap + 1 条索引记录，多出的一条说明实际总数超过上限
+        cap = settings.OPERATION_LOG_COUNT_CAP
+        total = await db.scalar(select(func.count()).select_from(q.limit(cap + 1).subquery())) or 0
+        if total > cap:
+            return cap, False
+        return total, True
 
     @staticmethod
-    def get_log_by_id(db: Session, log_id: int) -> Optional[OperationLog]:
+    def _build_filters(query: Optional[OperationLogQuery]) -> list:
+        """根据查询条件生成筛选表达式列表"""
+        filters = []
+        if not query:
+            return filters
+
+        # 按用户名筛选
+        if query.username:
+            filters.append(OperationLog.username.like(f"%{query.username}%"))
+
+        # 按行为类型筛选
+        if query.action_type:
+            filters.append(OperationLog.action_type == query.action_type)
+
+        # 按模块筛选
+        if query.module:
+            filters.append(OperationLog.module == query.module)
+
+        # 按状态筛选
+        if query.status is not None:
+            filters.append(OperationLog.status == query.status)
+
+        # 按时间范围筛选
+        if query.start_date:
+            filters.append(OperationLog.created_at >= query.start_date)
+        if query.end_date:
+            filters.append(OperationLog.created_at <= query.end_date)
+
+        return filters
+
+    @staticmethod
+    def _encode_page_cursor(log: OperationLog) -> str:
+        """生成分页游标：上一页最后一条日志的操作时间和ID，base64url 编码"""
+        payload = json.dumps({"created_at": log.created_at.isoformat(), "id": log.id}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def _decode_page_cursor(cursor: str) -> Tuple[datetime, int]:
+        """解析分页游标，返回上一页最后一条日志的 (操作时间, ID)"""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            return datetime.fromisoformat(payload["created_at"]), int(payload["id"])
+        except Exception:
+            raise ValueError("无效的分页游标")
+
+    @staticmethod
+    async def get_log_by_id(db: AsyncSession, log_id: int) -> Optional[OperationLog]:
         """
         根据 ID 获取操作日志
 
@@ -177,10 +317,10 @@ class OperationLogService:
         Returns:
             Optional[OperationLog]: 日志对象，不存在则返回 None
         """
-        return db.query(OperationLog).filter(OperationLog.id == log_id).first()
+        return await db.get(OperationLog, log_id)
 
     @staticmethod
-    def get_statistics(db: Session) -> Dict:
+    async def get_statistics(db: AsyncSession) -> Dict:
         """
         获取操作日志统计信息
 
@@ -191,40 +331,40 @@ class OperationLogService:
             dict: 统计信息字典
         """
         # 总日志数
-        total_logs = db.query(func.count(OperationLog.id)).scalar()
+        total_logs = await db.scalar(select(func.count(OperationLog.id)))
 
         # 今日日志数
         today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        today_logs = db.query(func.count(OperationLog.id)).filter(
-            OperationLog.created_at >= today_start
-        ).scalar()
+        today_logs = await db.scalar(
+            select(func.count(OperationLog.id)).where(OperationLog.created_at >= today_start)
+        )
 
         # 按行为类型统计
         action_type_stats = {}
-        action_type_results = db.query(
-            OperationLog.action_type,
-            func.count(OperationLog.id)
-        ).group_by(OperationLog.action_type).all()
+        action_type_results = await db.execute(
+            select(OperationLog.action_type, func.count(OperationLog.id))
+            .group_by(OperationLog.action_type)
+        )
         for action_type, count in action_type_results:
             action_type_stats[action_type] = count
 
         # 按模块统计
         module_stats = {}
-        module_results = db.query(
-            OperationLog.module,
-            func.count(OperationLog.id)
-        ).group_by(OperationLog.module).all()
+        module_results = await db.execute(
+            select(OperationLog.module, func.count(OperationLog.id))
+            .group_by(OperationLog.module)
+        )
         for module, count in module_results:
             module_stats[module] = count
 
         # 按用户统计（前10名）
         user_stats = {}
-        user_results = db.query(
-            OperationLog.username,
-            func.count(OperationLog.id)
-        ).group_by(OperationLog.username).order_by(
-            desc(func.count(OperationLog.id))
-        ).limit(10).all()
+        user_results = await db.execute(
+            select(OperationLog.username, func.count(OperationLog.id))
+            .group_by(OperationLog.username)
+            .order_by(desc(func.count(OperationLog.id)))
+            .limit(10)
+        )
         for username, count in user_results:
             user_stats[username] = count
 
@@ -237,8 +377,8 @@ class OperationLogService:
         }
 
     @staticmethod
-    def get_user_logs(
-        db: Session,
+    async def get_user_logs(
+        db: AsyncSession,
         user_id: int,
         skip: int = 0,
         limit: int = 10
@@ -255,14 +395,21 @@ class OperationLogService:
         Returns:
             tuple: (日志列表, 总记录数)
         """
-        q = db.query(OperationLog).filter(OperationLog.user_id == user_id)
-        total = q.count()
-        logs = q.order_by(desc(OperationLog.created_at)).offset(skip).limit(limit).all()
-        return logs, total
+        total = await db.scalar(
+            select(func.count(OperationLog.id)).where(OperationLog.user_id == user_id)
+        )
+        result = await db.execute(
+            select(OperationLog)
+            .where(OperationLog.user_id == user_id)
+            .order_by(desc(OperationLog.created_at))
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all()), total or 0
 
     @staticmethod
-    def get_recent_logs(
-        db: Session,
+    async def get_recent_logs(
+        db: AsyncSession,
         limit: int = 10
     ) -> List[OperationLog]:
         """
@@ -275,12 +422,13 @@ class OperationLogService:
         Returns:
             list: 日志列表
         """
-        return db.query(OperationLog).order_by(
-            desc(OperationLog.created_at)
-        ).limit(limit).all()
+        result = await db.execute(
+            select(OperationLog).order_by(desc(OperationLog.created_at)).limit(limit)
+        )
+        return list(result.scalars().all())
 
     @staticmethod
-    def delete_old_logs(db: Session, days: int = 90) -> int:
+    async def delete_old_logs(db: AsyncSession, days: int = 90) -> int:
         """
         删除指定天数之前的旧日志
 
@@ -292,8 +440,8 @@ class OperationLogService:
             int: 删除的记录数
         """
         cutoff_date = datetime.utcnow() - timedelta(days=days)
-        deleted = db.query(OperationLog).filter(
-            OperationLog.created_at < cutoff_date
-        ).delete()
-        db.commit()
-        return deleted
+        result = await db.execute(
+            delete(OperationLog).where(OperationLog.created_at < cutoff_date)
+        )
+        await db.commit()
+        return result.rowcount
@@ -2,8 +2,10 @@
 用户服务层
 处理用户相关的业务逻辑
 """
+import asyncio
 from typing import List, Optional, Tuple
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import UserManage
 from app.core.security import verify_password, get_password_hash
@@ -13,7 +15,7 @@ class UserService:
     """用户服务类"""
 
     @staticmethod
-    def authenticate_user(db: Session, username: str, password: str) -> Optional[UserManage]:
+    async def authenticate_user(db: AsyncSession, username: str, password: str) -> Optional[UserManage]:
         """
         通过用户名和密码认证用户
 
@@ -25,17 +27,18 @@ class UserService:
         Returns:
             Optional[UserManage]: 认证成功返回用户对象，失败返回 None
         """
-        user = db.query(UserManage).filter(UserManage.username == username).first()
+        user = await UserService.get_user_by_username(db, username)
         if not user:
             return None
-        if not verify_password(password, user.password):
+        # bcrypt 校验是 CPU 密集操作，放到线程中执行，避免阻塞事件循环
+        if not await asyncio.to_thread(verify_password, password, user.password):
             return None
         if user.status != 1:
             return None
         return user
 
     @staticmethod
-    def get_user_by_id(db: Session, user_id: int) -> Optional[UserManage]:
+    async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[UserManage]:
         """
         根据 ID 获取用户
 
@@ -46,10 +49,10 @@ class UserService:
         Returns:
             Optional[UserManage]: 用户对象或 None
         """
-        return db.query(UserManage).filter(UserManage.id == user_id).first()
+        return await db.get(UserManage, user_id)
 
     @staticmethod
-    def get_user_by_username(db: Session, username: str) -> Optional[UserManage]:
+    async def get_user_by_username(db: AsyncSession, username: str) -> Optional[UserManage]:
         """
         根据用户名获取用户
 
@@ -60,11 +63,12 @@ class UserService:
         Returns:
             Optional[UserManage]: 用户对象或 None
         """
-        return db.query(UserManage).filter(UserManage.username == username).first()
+        result = await db.execute(select(UserManage).where(UserManage.username == username))
+        return result.scalars().first()
 
     @staticmethod
-    def get_users(
-        db: Session,
+    async def get_users(
+        db: AsyncSession,
         skip: int = 0,
         limit: int = 10,
         username: Optional[str] = None,
@@ -85,24 +89,24 @@ class UserService:
         Returns:
             Tuple[List[UserManage], int]: 用户列表和总数
         """
-        query = db.query(UserManage)
+        filters = []
 
         # 用户名模糊查询
         if username:
-            query = query.filter(UserManage.username.like(f"%{username}%"))
+            filters.append(UserManage.username.like(f"%{username}%"))
         # 用户类型筛选
         if user_type is not None:
-            query = query.filter(UserManage.user_type == user_type)
+            filters.append(UserManage.user_type == user_type)
         # 状态筛选
         if status is not None:
-            query = query.filter(UserManage.status == status)
+            filters.append(UserManage.status == status)
 
-        total = query.count()
-        users = query.offset(skip).limit(limit).all()
-        return users, total
+        total = await db.scalar(select(func.count(UserManage.id)).where(*filters))
+        result = await db.execute(select(UserManage).where(*filters).offset(skip).limit(limit))
+        return list(result.scalars().all()), total or 0
 
     @staticmethod
-    def create_user(db: Session, username: str, password: str, user_type: int = 0) -> UserManage:
+    async def create_user(db: AsyncSession, username: str, password: str, user_type: int = 0) -> UserManage:
         """
         创建新用户
 
@@ -115,7 +119,7 @@ class UserService:
         Returns:
             UserManage: 创建的用户对象
         """
-        hashed_password = get_password_hash(password)
+        hashed_password = await asyncio.to_thread(get_password_hash, password)
         db_user = UserManage(
             username=username,
             password=hashed_password,
@@ -123,12 +127,12 @@ class UserService:
             status=1
         )
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
+        await db.refresh(db_user)
         return db_user
 
     @staticmethod
-    def update_user_password(db: Session, user_id: int, new_password: str) -> Optional[UserManage]:
+    async def update_user_password(db: AsyncSession, user_id: int, new_password: str) -> Optional[UserManage]:
         """
         更新用户密码
 
@@ -140,15 +144,15 @@ class UserService:
         Returns:
             Optional[UserManage]: 更新后的用户对象
         """
-        user = db.query(UserManage).filter(UserManage.id == user_id).first()
+        user = await db.get(UserManage, user_id)
         if user:
-            user.password = get_password_hash(new_password)
-            db.commit()
-            db.refresh(user)
+            user.password = await asyncio.to_thread(get_password_hash, new_password)
+            await db.commit()
+            await db.refresh(user)
         return user
 
     @staticmethod
-    def update_user_status(db: Session, user_id: int, status: int) -> Optional[UserManage]:
+    async def update_user_status(db: AsyncSession, user_id: int, status: int) -> Optional[UserManage]:
         """
         更新用户状态
 
@@ -160,15 +164,15 @@ class UserService:
         Returns:
             Optional[UserManage]: 更新后的用户对象
         """
-        user = db.query(UserManage).filter(UserManage.id == user_id).first()
+        user = await db.get(UserManage, user_id)
         if user:
             user.status = status
-            db.commit()
-            db.refresh(user)
+            await db.commit()
+            await db.refresh(user)
         return user
 
     @staticmethod
-    def delete_user(db: Session, user_id: int) -> bool:
+    async def delete_user(db: AsyncSession, user_id: int) -> bool:
         """
         删除用户
 
@@ -179,15 +183,15 @@ class UserService:
         Returns:
             bool: 删除成功返回 True
         """
-        user = db.query(UserManage).filter(UserManage.id == user_id).first()
+        user = await db.get(UserManage, user_id)
         if user:
-            db.delete(user)
-            db.commit()
+            await db.delete(user)
+            await db.commit()
             return True
         return False
 
     @staticmethod
-    def username_exists(db: Session, username: str, exclude_id: Optional[int] = None) -> bool:
+    async def username_exists(db: AsyncSession, username: str, exclude_id: Optional[int] = None) -> bool:
         """
         检查用户名是否已存在
 
@@ -199,7 +203,7 @@ class UserService:
         Returns:
             bool: 用户名存在返回 True
         """
-        query = db.query(UserManage).filter(UserManage.username == username)
+        query = select(UserManage.id).where(UserManage.username == username)
         if exclude_id:
-            query = query.filter(UserManage.id != exclude_id)
-        return query.first() is not None
+            query = query.where(UserManage.id != exclude_id)
+        return (await db.scalar(query.limit(1))) is not None
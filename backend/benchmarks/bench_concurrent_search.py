@@ -0,0 +1,151 @@
+"""
+并发搜索延迟对比脚本
+对比原来在 async 接口中直接调用同步驱动（阻塞事件循环，并发请求被串行执行），
+和 KnowledgeGraphService 使用异步驱动时，同时发起 N 个搜索请求的延迟分布（p50/p95/p99）
+
+两种方式执行相同的查询：全文索引搜索 + 节点之间的关系；测试期间关闭结果缓存
+
+需要连接 .env 中配置的 Neo4j（在线数据库），并且已经导入数据（全文索引已创建）
+
+使用方式（在 backend 目录下）:
+    python benchmarks/bench_concurrent_search.py
+
+    python benchmarks/bench_concurrent_search.py --concurrency 100 --rounds 5 --keywords 数控 张三 焊接
+"""
+import sys
+import math
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.config import settings
+from app.core.neo4j_client import neo4j_client, async_neo4j_client
+from app.services.knowledge_graph_service import (
+    KnowledgeGraphService,
+    FULLTEXT_INDEX_NAME,
+    LUCENE_SPECIAL_CHARS
+)
+
+
+def search_blocking(keyword: str, limit: int) -> int:
+    """原来的方式：同步驱动执行全文搜索和关系查询"""
+    results = neo4j_client.execute_query(
+        """
+        CALL db.index.fulltext.queryNodes($index_name, $query, {limit: $limit})
+        YIELD node, score
+        RETURN elementId(node) as id, labels(node) as labels, properties(node) as properties, score
+        """,
+        {
+            "index_name": FULLTEXT_INDEX_NAME,
+            "query": '"' + LUCENE_SPECIAL_CHARS.sub(r'\\\1', keyword) + '"',
+            "limit": limit
+        }
+    )
+    node_ids = [record["id"] for record in results]
+    if node_ids:
+        neo4j_client.execute_query(
+            """
+            UNWIND $node_ids AS node_id
+            MATCH (a)-[r]->(b)
+            WHERE elementId(a) = node_id AND elementId(b) IN $node_ids
+            RETURN elementId(a) as from_node, elementId(b) as to_node, type(r) as type, elementId(r) as rel_id
+            """,
+            {"node_ids": node_ids}
+        )
+    return len(node_ids)
+
+
+async def request_blocking(keyword: str, limit: int) -> int:
+    """async 接口中直接调用同步查询（阻塞事件循环）"""
+    return search_blocking(keyword, limit)
+
+
+async def request_async(keyword: str, limit: int) -> int:
+    """async 接口中 await 异步服务"""
+    result = await KnowledgeGraphService.search_all_nodes(keyword, limit)
+    return len(result["nodes"])
+
+
+METHODS = {
+    "blocking": request_blocking,
+    "async": request_async,
+}
+
+
+async def run_round(method, keywords: list, concurrency: int, limit: int) -> tuple:
+    """同时发起 concurrency 个请求，返回 (每个请求的完成延迟列表, 总耗时)"""
+    start = time.perf_counter()
+    latencies = []
+
+    async def timed(keyword: str):
+        await method(keyword, limit)
+        latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(timed(keywords[i % len(keywords)]) for i in range(concurrency)))
+    return latencies, time.perf_counter() - start
+
+
+def percentile(values: list, p: float) -> float:
+    """最近秩百分位数"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+async def main_async(args):
+    # 关闭结果缓存，每个请求都真正查询 Neo4j
+    settings.GRAPH_CACHE_ENABLED = False
+    await async_neo4j_client.connect()
+    neo4j_client.connect()
+
+    try:
+        print("=" * 84)
+        print(f"并发搜索延迟对比: 并发 {args.concurrency}，{args.rounds} 轮，关键词 {args.keywords}")
+        print("=" * 84)
+        print(f"{'方式':<10}{'p50(毫秒)':>12}{'p95(毫秒)':>12}{'p99(毫秒)':>12}{'最大(毫秒)':>12}{'总耗时(秒)':>12}{'请求/秒':>12}")
+        print("-" * 84)
+
+        for name, method in METHODS.items():
+            # 预热（建立连接池、查询计划缓存）
+            await run_round(method, args.keywords, min(args.concurrency, 10), args.limit)
+
+            latencies = []
+            elapsed = 0.0
+            for _ in range(args.rounds):
+                round_latencies, round_elapsed = await run_round(method, args.keywords, args.concurrency, args.limit)
+                latencies.extend(round_latencies)
+                elapsed += round_elapsed
+
+            print(
+                f"{name:<10}"
+                f"{percentile(latencies, 50) * 1000:>12.1f}"
+                f"{percentile(latencies, 95) * 1000:>12.1f}"
+                f"{percentile(latencies, 99) * 1000:>12.1f}"
+                f"{max(latencies) * 1000:>12.1f}"
+                f"{elapsed:>12.2f}"
+                f"{len(latencies) / elapsed:>12.1f}"
+            )
+
+        print("=" * 84)
+    finally:
+        await async_neo4j_client.close()
+        neo4j_client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="并发搜索延迟对比")
+    parser.add_argument("--concurrency", type=int, default=100, help="同时发起的请求数")
+    parser.add_argument("--rounds", type=int, default=3, help="测试轮数")
+    parser.add_argument("--limit", type=int, default=100, help="每次搜索的最大节点数")
+    parser.add_argument("--keywords", nargs="+", default=["数控", "张三", "焊接", "开机", "10天"], help="搜索关键词")
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Excel 解析性能对比脚本
+对比 pandas 全量读取（DataImportService.read_excel_with_encoding 的方式）、
+openpyxl 只读流式读取（StreamingExcelReader）和进程池并行解析的耗时和内存峰值
+
+每种方式在独立子进程中运行，分别统计墙钟时间和峰值 RSS
+（并行方式的峰值 RSS 只统计主进程，不含解析子进程）
+
+使用方式（在 backend 目录下）:
+    # 自动生成测试工作簿（每个台账 50000 行）
+    python benchmarks/bench_excel_parsing.py --rows 50000
+
+    # 使用已有的 Excel 文件
+    python benchmarks/bench_excel_parsing.py --file ../database/data/数据台账.xlsx
+"""
+import sys
+import time
+import argparse
+import resource
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+# 测试工作簿的表头（与车间台账格式一致）
+SHEET_COLUMNS = {
+    "设备台账": ["设备编号", "设备名称", "设备类型", "设备型号", "工位", "维护周期", "故障率", "出厂日期"],
+    "人员台账": ["工号", "姓名", "人员类型", "技能等级", "班组"],
+    "物料台账": ["物料编号", "物料名称", "物料类型", "规格", "库存"],
+    "工艺台账": ["工艺编号", "工艺名称", "工艺类型", "工序", "标准工时"],
+    "故障台账": ["故障编号", "故障名称", "故障现象", "处理方法"],
+}
+
+
+def generate_workbook(path: Path, rows: int) -> None:
+    """生成测试工作簿（write_only 模式，避免生成过程本身占用大量内存）"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for sheet_name, columns in SHEET_COLUMNS.items():
+        sheet = workbook.create_sheet(sheet_name)
+        sheet.append(columns)
+        prefix = columns[0][:1]
+        for i in range(rows):
+            values = [f"{prefix}{i:06d}"]
+            for col in columns[1:]:
+                if col == "故障率":
+                    values.append(f"{i % 100 / 10:.1f}%")
+                elif col in ("库存", "标准工时"):
+                    values.append(i % 500)
+                else:
+                    values.append(f"{col}{i % 1000}")
+            sheet.append(values)
+
+    triple_sheet = workbook.create_sheet("三元组关系")
+    triple_sheet.append(["头实体", "对象属性", "尾实体"])
+    for i in range(rows):
+        triple_sheet.append([f"设{i:06d}", "关联故障", f"故{i:06d}"])
+
+    workbook.save(path)
+
+
+def parse_full(file_path: str) -> int:
+    """pandas 全量读取，与 DataImportService.read_excel_with_encoding 相同"""
+    import pandas as pd
+
+    excel_file = pd.ExcelFile(file_path, engine='openpyxl')
+    total = 0
+    sheets = {}
+    for sheet_name in excel_file.sheet_names:
+        df = pd.read_excel(excel_file, sheet_name=sheet_name, engine='openpyxl')
+        sheets[sheet_name] = df
+        total += len(df)
+    return total
+
+
+def parse_streaming(file_path: str) -> int:
+    """openpyxl 只读流式读取，逐批处理后即释放"""
+    from app.services.excel_reader import StreamingExcelReader
+
+    reader = StreamingExcelReader(file_path, batch_size=5000)
+    total = 0
+    try:
+        for sheet_name in reader.sheet_names:
+            for df in reader.iter_batches(sheet_name):
+                total += len(df)
+    finally:
+        reader.close()
+    return total
+
+
+def parse_parallel(file_path: str) -> int:
+    """进程池并行解析各工作表，与 DataImportService._read_excel_parallel 相同"""
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+    from openpyxl import load_workbook
+    from app.services.excel_reader import read_sheet_columnar, columnar_to_frame
+
+    workbook = load_workbook(file_path, read_only=True)
+    sheet_names = workbook.sheetnames
+    workbook.close()
+
+    total = 0
+    with ProcessPoolExecutor(
+        max_workers=min(len(sheet_names), os.cpu_count() or 1),
+        mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        futures = [executor.submit(read_sheet_columnar, file_path, name) for name in sheet_names]
+        for future in futures:
+            total += len(columnar_to_frame(future.result()))
+    return total
+
+
+PARSERS = {
+    "full": parse_full,
+    "streaming": parse_streaming,
+    "parallel": parse_parallel,
+}
+
+
+def _run_mode(mode: str, file_path: str, queue) -> None:
+    """子进程入口：执行解析并回传耗时、行数和内存峰值"""
+    import pandas  # noqa: F401  先导入依赖，基线内存不计入解析开销
+    import openpyxl  # noqa: F401
+
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    rows = PARSERS[mode](file_path)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((rows, elapsed, baseline_kb, peak_kb))
+
+
+def measure(mode: str, file_path: str) -> tuple:
+    """在独立子进程中运行，保证各方式的内存峰值互不影响"""
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_run_mode, args=(mode, file_path, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Excel 解析性能对比")
+    parser.add_argument("--file", help="Excel 文件路径（不指定则自动生成）")
+    parser.add_argument("--rows", type=int, default=50000, help="自动生成时每个工作表的行数")
+    parser.add_argument("--repeat", type=int, default=3, help="每种方式的重复次数")
+    args = parser.parse_args()
+
+    tmp_dir = None
+    if args.file:
+        file_path = args.file
+    else:
+        tmp_dir = tempfile.TemporaryDirectory()
+        file_path = str(Path(tmp_dir.name) / "bench.xlsx")
+        print(f"生成测试工作簿: 每个工作表 {args.rows} 行 ...")
+        generate_workbook(Path(file_path), args.rows)
+
+    size_mb = Path(file_path).stat().st_size / 1024 / 1024
+    print("=" * 70)
+    print(f"Excel 解析性能对比: {file_path} ({size_mb:.1f} MB)")
+    print("=" * 70)
+    print(f"{'方式':<12}{'行数':>10}{'耗时(秒)':>12}{'峰值RSS(MB)':>14}{'解析增量(MB)':>16}")
+    print("-" * 70)
+
+    for mode in PARSERS:
+        for _ in range(args.repeat):
+            rows, elapsed, baseline_kb, peak_kb = measure(mode, file_path)
+            print(
+                f"{mode:<12}{rows:>10}{elapsed:>12.2f}"
+                f"{peak_kb / 1024:>14.1f}{(peak_kb - baseline_kb) / 1024:>16.1f}"
+            )
+
+    print("=" * 70)
+    if tmp_dir:
+        tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+图谱响应序列化性能对比脚本
+对比 FastAPI 默认的 jsonable_encoder + json.dumps、
+jsonable_encoder + orjson（ORJSONResponse 作为 default_response_class）
+和直接返回 ORJSONResponse（跳过 jsonable_encoder）三种方式的编码耗时和吞吐量
+
+使用方式（在 backend 目录下）:
+    python benchmarks/bench_json_response.py
+
+    python benchmarks/bench_json_response.py --nodes 100 1000 5000 --repeat 20
+"""
+import sys
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.responses import ORJSONResponse
+
+
+def generate_payload(node_count: int) -> dict:
+    """生成与搜索/图谱数据接口格式一致的响应（中文属性键，每个节点约 2 条关系）"""
+    rng = random.Random(42)
+    nodes = []
+    for i in range(node_count):
+        nodes.append({
+            "id": f"4:8f2c1a3e-0b7d-4c55-9a61-2f5e7d9c1b40:{i}",
+            "labels": ["设备", f"类型{i % 20}"],
+            "properties": {
+                "设备编号": f"设{i:06d}",
+                "设备名称": f"数控车床{i % 1000}",
+                "设备型号": f"CK{i % 300:04d}",
+                "工位": i % 50,
+                "维护周期": f"{i % 90}天",
+                "故障率": round(rng.uniform(0, 0.1), 4),
+                "出厂日期": f"20{i % 24:02d}-01-01",
+                "备注": "定期检查主轴润滑，更换冷却液",
+            }
+        })
+    edges = []
+    for i in range(node_count * 2):
+        edges.append({
+            "id": f"5:8f2c1a3e-0b7d-4c55-9a61-2f5e7d9c1b40:{i}",
+            "from_node": nodes[i % node_count]["id"],
+            "to_node": nodes[(i * 7 + 1) % node_count]["id"],
+            "type": "使用"
+        })
+    return {"nodes": nodes, "edges": edges}
+
+
+def encode_default(payload: dict) -> bytes:
+    """FastAPI 默认方式：jsonable_encoder 后由 JSONResponse.render 序列化"""
+    content = jsonable_encoder(payload)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def encode_orjson_class(payload: dict) -> bytes:
+    """ORJSONResponse 作为 default_response_class：仍经过 jsonable_encoder"""
+    return ORJSONResponse(jsonable_encoder(payload)).body
+
+
+def encode_orjson_direct(payload: dict) -> bytes:
+    """接口直接返回 ORJSONResponse(data)：跳过 jsonable_encoder"""
+    return ORJSONResponse(payload).body
+
+
+ENCODERS = {
+    "default": encode_default,
+    "orjson_class": encode_orjson_class,
+    "orjson_direct": encode_orjson_direct,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="图谱响应序列化性能对比")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[100, 1000, 5000], help="响应中的节点数")
+    parser.add_argument("--repeat", type=int, default=20, help="每种方式的重复次数")
+    args = parser.parse_args()
+
+    print("=" * 78)
+    print("图谱响应序列化性能对比")
+    print("=" * 78)
+    print(f"{'节点数':>8}  {'方式':<16}{'响应大小(KB)':>14}{'最佳耗时(毫秒)':>18}{'MB/秒':>10}{'次/秒':>10}")
+    print("-" * 78)
+
+    for node_count in args.nodes:
+        payload = generate_payload(node_count)
+
+        # 先校验三种方式输出的 JSON 内容一致
+        expected = json.loads(encode_default(payload))
+        for name, encoder in ENCODERS.items():
+            assert json.loads(encoder(payload)) == expected, f"{name} 的输出不一致"
+
+        best = {}
+        for name, encoder in ENCODERS.items():
+            timings = []
+            size = 0
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                size = len(encoder(payload))
+                timings.append(time.perf_counter() - start)
+            best[name] = min(timings)
+            print(
+                f"{node_count:>8}  {name:<16}{size / 1024:>14.1f}{best[name] * 1000:>18.2f}"
+                f"{size / best[name] / 1024 / 1024:>10.1f}{1 / best[name]:>10.0f}"
+            )
+
+        print(
+            f"{'':>8}  加速比: orjson_class {best['default'] / best['orjson_class']:.1f}x, "
+            f"orjson_direct {best['default'] / best['orjson_direct']:.1f}x"
+        )
+        print("-" * 78)
+
+
+if __name__ == "__main__":
+    main()
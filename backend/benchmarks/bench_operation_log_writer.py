@@ -0,0 +1,146 @@
+"""
+操作日志写入方式对比脚本
+对比原来每个请求单独 add + commit + refresh 写入一条日志，
+和放入缓冲队列由后台任务批量插入两种方式，同时发起 N 个请求时
+请求侧的等待延迟（p50/p95/p99）和全部日志落库的总耗时
+
+需要连接 .env 中配置的 MySQL（也可以用 DATABASE_ASYNC_URL 指向其他数据库），
+测试写入的日志在结束时删除
+
+使用方式（在 backend 目录下）:
+    python benchmarks/bench_operation_log_writer.py
+
+    python benchmarks/bench_operation_log_writer.py --concurrency 200 --rounds 5
+"""
+import sys
+import math
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import delete
+
+from app.core.config import settings
+from app.core.log_writer import OperationLogWriter
+from app.models import AsyncSessionLocal, OperationLog, async_engine
+from app.services.operation_log_service import OperationLogService
+
+# 测试日志的备注，用于结束时清理
+BENCH_REMARK = "bench_operation_log_writer"
+
+
+def make_record() -> dict:
+    return {
+        "user_id": 0,
+        "username": "bench",
+        "action_type": OperationLogService.ACTION_SEARCH,
+        "module": OperationLogService.MODULE_KNOWLEDGE_GRAPH,
+        "ip_address": "127.0.0.1",
+        "user_agent": "bench",
+        "status": 1,
+        "remark": BENCH_REMARK
+    }
+
+
+async def log_direct(writer: OperationLogWriter) -> None:
+    """原来的方式：请求中单独提交一条日志"""
+    async with AsyncSessionLocal() as db:
+        await OperationLogService.create_log(db, **make_record())
+
+
+async def log_buffered(writer: OperationLogWriter) -> None:
+    """缓冲写入：入队后立即返回"""
+    await writer.write(make_record())
+
+
+METHODS = {
+    "direct": log_direct,
+    "buffered": log_buffered,
+}
+
+
+async def run_round(method, writer: OperationLogWriter, concurrency: int) -> list:
+    """同时发起 concurrency 个请求，返回每个请求等待日志写入的延迟"""
+    latencies = []
+
+    async def timed():
+        start = time.perf_counter()
+        await method(writer)
+        latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(timed() for _ in range(concurrency)))
+    return latencies
+
+
+def percentile(values: list, p: float) -> float:
+    """最近秩百分位数"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+async def cleanup() -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(OperationLog).where(OperationLog.remark == BENCH_REMARK))
+        await db.commit()
+
+
+async def main_async(args):
+    try:
+        print("=" * 78)
+        print(f"操作日志写入对比: 并发 {args.concurrency}，{args.rounds} 轮，批量 {args.batch_size}")
+        print("=" * 78)
+        print(f"{'方式':<10}{'p50(毫秒)':>12}{'p95(毫秒)':>12}{'p99(毫秒)':>12}{'落库总耗时(秒)':>16}{'条/秒':>12}")
+        print("-" * 78)
+
+        for name, method in METHODS.items():
+            writer = OperationLogWriter(
+                maxsize=args.concurrency * args.rounds,
+                batch_size=args.batch_size,
+                flush_interval_ms=settings.OPERATION_LOG_FLUSH_INTERVAL_MS,
+                enqueue_timeout_ms=settings.OPERATION_LOG_ENQUEUE_TIMEOUT_MS
+            )
+            writer.start()
+
+            # 预热（建立连接池）
+            await run_round(method, writer, min(args.concurrency, 10))
+
+            latencies = []
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                latencies.extend(await run_round(method, writer, args.concurrency))
+            # 缓冲写入要等后台任务把队列写完才算全部落库
+            await writer.stop()
+            elapsed = time.perf_counter() - start
+
+            print(
+                f"{name:<10}"
+                f"{percentile(latencies, 50) * 1000:>12.2f}"
+                f"{percentile(latencies, 95) * 1000:>12.2f}"
+                f"{percentile(latencies, 99) * 1000:>12.2f}"
+                f"{elapsed:>16.2f}"
+                f"{len(latencies) / elapsed:>12.0f}"
+            )
+
+        print("=" * 78)
+    finally:
+        await cleanup()
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="操作日志写入方式对比")
+    parser.add_argument("--concurrency", type=int, default=100, help="同时发起的请求数")
+    parser.add_argument("--rounds", type=int, default=5, help="测试轮数")
+    parser.add_argument("--batch-size", type=int, default=settings.OPERATION_LOG_BATCH_SIZE, help="每批插入的日志数")
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
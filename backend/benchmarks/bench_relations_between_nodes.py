@@ -0,0 +1,108 @@
+"""
+节点集合间关系查询性能对比脚本
+对比原来按 100 个节点分批、每批一次 IN 查询的方式，
+和 KnowledgeGraphService._get_relations_between_nodes 的单次导出子图查询
+
+原方式只匹配两端都在同一批内的关系，跨批次的关系会丢失，表中同时列出两种方式返回的关系数
+
+需要连接 .env 中配置的 Neo4j（在线数据库），图中节点数应不少于测试规模
+
+使用方式（在 backend 目录下）:
+    python benchmarks/bench_relations_between_nodes.py
+
+    python benchmarks/bench_relations_between_nodes.py --sizes 100 1000 10000 --repeat 5
+"""
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.neo4j_client import neo4j_client, async_neo4j_client
+from app.services.knowledge_graph_service import KnowledgeGraphService
+
+# 服务的查询方法是异步的，所有调用使用同一个事件循环（异步驱动绑定在创建它的事件循环上）
+loop = asyncio.new_event_loop()
+
+
+def fetch_batched(node_ids: list) -> tuple:
+    """原来的方式：每 100 个节点一次查询"""
+    batch_size = 100
+    rel_query = """
+    MATCH (a)-[r]->(b)
+    WHERE elementId(a) IN $node_ids AND elementId(b) IN $node_ids
+    RETURN elementId(a) as from_node, elementId(b) as to_node, type(r) as type, elementId(r) as rel_id
+    """
+    edges = []
+    round_trips = 0
+    for i in range(0, len(node_ids), batch_size):
+        edges.extend(neo4j_client.execute_query(rel_query, {"node_ids": node_ids[i:i + batch_size]}))
+        round_trips += 1
+    return edges, round_trips
+
+
+def fetch_single(node_ids: list) -> tuple:
+    """单次导出子图查询"""
+    return loop.run_until_complete(KnowledgeGraphService._get_relations_between_nodes(node_ids)), 1
+
+
+METHODS = {
+    "batched": fetch_batched,
+    "single": fetch_single,
+}
+
+
+def sample_node_ids(size: int) -> list:
+    """取有关系的节点优先，保证子图中有足够的边"""
+    results = neo4j_client.execute_query(
+        """
+        MATCH (n)
+        WITH n ORDER BY COUNT { (n)--() } DESC
+        LIMIT $limit
+        RETURN elementId(n) as id
+        """,
+        {"limit": size}
+    )
+    return [record["id"] for record in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="节点集合间关系查询性能对比")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="结果节点数")
+    parser.add_argument("--repeat", type=int, default=3, help="每种方式的重复次数")
+    args = parser.parse_args()
+
+    neo4j_client.connect()
+    try:
+        print("=" * 72)
+        print("节点集合间关系查询性能对比")
+        print("=" * 72)
+        print(f"{'节点数':>8}  {'方式':<10}{'往返次数':>10}{'关系数':>10}{'最佳耗时(毫秒)':>18}")
+        print("-" * 72)
+
+        for size in args.sizes:
+            node_ids = sample_node_ids(size)
+            if len(node_ids) < size:
+                print(f"{size:>8}  图中只有 {len(node_ids)} 个节点，按实际数量测试")
+
+            for name, method in METHODS.items():
+                timings = []
+                edge_count = round_trips = 0
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    edges, round_trips = method(node_ids)
+                    timings.append(time.perf_counter() - start)
+                    edge_count = len(edges)
+                print(f"{len(node_ids):>8}  {name:<10}{round_trips:>10}{edge_count:>10}{min(timings) * 1000:>18.1f}")
+
+        print("=" * 72)
+    finally:
+        neo4j_client.close()
+        loop.run_until_complete(async_neo4j_client.close())
+
+
+if __name__ == "__main__":
+    main()
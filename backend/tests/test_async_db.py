@@ -0,0 +1,281 @@
+"""
+异步数据库会话测试代码
+
+使用 SQLite + aiosqlite 内存数据库代替 MySQL，测试异步会话下的用户服务和操作日志服务
+（需要安装 aiosqlite，未安装时跳过）
+"""
+import sys
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.models import Base, FileUploadRecord, OperationLog
+from app.schemas.operation_log import OperationLogQuery
+from app.services.user_service import UserService
+from app.services.operation_log_service import OperationLogService
+from app.services.import_job_service import ImportJobService
+
+
+class TestAsyncDatabase:
+    """异步会话服务测试类"""
+
+    def setup_method(self):
+        """每个测试使用新的内存数据库"""
+        self.loop = asyncio.new_event_loop()
+        self.engine = create_async_engine("sqlite+aiosqlite://")
+        self.session_factory = async_sessionmaker(
+            bind=self.engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False
+        )
+        self.run(self._create_tables())
+
+    def teardown_method(self):
+        """释放连接池和事件循环"""
+        self.run(self.engine.dispose())
+        self.loop.close()
+
+    def run(self, coro):
+        """在测试的事件循环中执行协程"""
+        return self.loop.run_until_complete(coro)
+
+    async def _create_tables(self):
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    def test_01_create_and_authenticate(self):
+        """测试 1: 创建用户后用正确密码认证成功，错误密码和禁用用户认证失败"""
+        async def scenario():
+            async with self.session_factory() as db:
+                user = await UserService.create_user(db, "张三", "secret123", user_type=1)
+                assert user.id is not None
+
+                assert (await UserService.authenticate_user(db, "张三", "secret123")).id == user.id
+                assert await UserService.authenticate_user(db, "张三", "wrong") is None
+                assert await UserService.authenticate_user(db, "李四", "secret123") is None
+
+                await UserService.update_user_status(db, user.id, 0)
+                assert await UserService.authenticate_user(db, "张三", "secret123") is None
+
+        self.run(scenario())
+
+    def test_02_list_users(self):
+        """测试 2: 用户列表的筛选、分页和总数"""
+        async def scenario():
+            async with self.session_factory() as db:
+                for i in range(5):
+                    await UserService.create_user(db, f"操作员{i}", "pw", user_type=0)
+                await UserService.create_user(db, "管理员", "pw", user_type=1)
+
+                users, total = await UserService.get_users(db, skip=0, limit=2, username="操作员")
+                assert total == 5
+                assert len(users) == 2
+
+                users, total = await UserService.get_users(db, user_type=1)
+                assert total == 1
+                assert users[0].username == "管理员"
+
+                assert await UserService.username_exists(db, "管理员")
+                assert not await UserService.username_exists(db, "管理员", exclude_id=users[0].id)
+
+        self.run(scenario())
+
+    def test_03_update_and_delete(self):
+        """测试 3: 修改密码和删除用户"""
+        async def scenario():
+            async with self.session_factory() as db:
+                user = await UserService.create_user(db, "王五", "old")
+                await UserService.update_user_password(db, user.id, "new")
+                assert await UserService.authenticate_user(db, "王五", "new") is not None
+
+                assert await UserService.delete_user(db, user.id)
+                assert await UserService.get_user_by_id(db, user.id) is None
+                assert not await UserService.delete_user(db, user.id)
+
+        self.run(scenario())
+
+    def test_04_operation_logs(self):
+        """测试 4: 操作日志的写入、筛选、统计和清理"""
+        async def scenario():
+            async with self.session_factory() as db:
+                for i in range(3):
+                    await OperationLogService.create_log(
+                        db, user_id=1, username="张三",
+                        action_type=OperationLogService.ACTION_SEARCH,
+                        module=OperationLogService.MODULE_KNOWLEDGE_GRAPH
+                    )
+                await OperationLogService.create_log(
+                    db, user_id=2, username="李四",
+                    action_type=OperationLogService.ACTION_LOGIN,
+                    module=OperationLogService.MODULE_AUTH,
+                    status=0
+                )
+                old = OperationLog(
+                    user_id=2, username="李四",
+                    action_type=OperationLogService.ACTION_LOGOUT,
+                    module=OperationLogService.MODULE_AUTH,
+                    created_at=datetime.utcnow() - timedelta(days=100)
+                )
+                db.add(old)
+                await db.commit()
+
+                logs, total = await OperationLogService.get_logs(
+                    db, skip=0, limit=2,
+                    query=OperationLogQuery(module=OperationLogService.MODULE_KNOWLEDGE_GRAPH)
+                )
+                assert total == 3
+                assert len(logs) == 2
+
+                logs, total = await OperationLogService.get_user_logs(db, user_id=2)
+                assert total == 2
+                # 按时间倒序，最早的日志排在最后
+                assert logs[-1].id == old.id
+
+                stats = await OperationLogService.get_statistics(db)
+                assert stats["total_logs"] == 5
+                assert stats["today_logs"] == 4
+                assert stats["user_stats"] == {"张三": 3, "李四": 2}
+
+                assert await OperationLogService.delete_old_logs(db, days=90) == 1
+                assert len(await OperationLogService.get_recent_logs(db, limit=10)) == 4
+
+        self.run(scenario())
+
+    def test_05_operation_log_keyset_page(self, monkeypatch):
+        """测试 5: 游标分页逐页取完且不重复，同一时间的日志按 ID 区分；封顶计数超过上限时标记为不精确"""
+        monkeypatch.setattr(settings, "OPERATION_LOG_COUNT_CAP", 20)
+
+        async def scenario():
+            async with self.session_factory() as db:
+                base = datetime(2026, 2, 5, 12, 0, 0)
+                # 每 3 条日志的操作时间相同
+                db.add_all([
+                    OperationLog(
+                        user_id=1, username="张三",
+                        action_type=OperationLogService.ACTION_SEARCH,
+                        module=OperationLogService.MODULE_KNOWLEDGE_GRAPH if i % 2 else OperationLogService.MODULE_CHAT,
+                        created_at=base + timedelta(seconds=i // 3)
+                    )
+                    for i in range(25)
+                ])
+                await db.commit()
+
+                ids, cursor, pages = [], None, 0
+                while True:
+                    page = await OperationLogService.get_logs_page(
+                        db, limit=10, cursor=cursor,
+                        total_mode=OperationLogService.TOTAL_CAPPED if cursor is None else OperationLogService.TOTAL_NONE
+                    )
+                    if cursor is None:
+                        assert page["total"] == 20
+                        assert not page["total_exact"]
+                    else:
+                        assert page["total"] is None
+                    ids.extend(log.id for log in page["items"])
+                    pages += 1
+                    if not page["has_more"]:
+                        assert page["next_cursor"] is None
+                        break
+                    cursor = page["next_cursor"]
+
+                assert pages == 3
+                assert ids == list(range(25, 0, -1))
+
+                page = await OperationLogService.get_logs_page(
+                    db, limit=5, total_mode=OperationLogService.TOTAL_EXACT,
+                    query=OperationLogQuery(module=OperationLogService.MODULE_KNOWLEDGE_GRAPH)
+                )
+                assert page["total"] == 12
+                assert page["total_exact"]
+                assert all(log.module == OperationLogService.MODULE_KNOWLEDGE_GRAPH for log in page["items"])
+
+                # SQLite 没有表统计信息，approx 按 capped 计算
+                page = await OperationLogService.get_logs_page(db, total_mode=OperationLogService.TOTAL_APPROX)
+                assert (page["total"], page["total_exact"]) == (20, False)
+
+                with pytest.raises(ValueError):
+                    await OperationLogService.get_logs_page(db, cursor="not-a-cursor")
+
+        self.run(scenario())
+
+    def test_06_fail_interrupted_jobs(self):
+        """测试 6: 启动时上一个进程遗留的排队中、执行中导入标记为失败，其他记录不变"""
+        async def scenario():
+            async with self.session_factory() as db:
+                def make_record(file_id, status, job_id=None, phase=None):
+                    return FileUploadRecord(
+                        file_id=file_id, filename=f"{file_id}.xlsx", file_path=f"/tmp/{file_id}.xlsx",
+                        file_size=1, uploader_id=1, uploader_name="张三",
+                        import_status=status, job_id=job_id, import_phase=phase
+                    )
+                db.add_all([
+                    make_record("queued", "pending", job_id="job-1", phase="queued"),
+                    make_record("running", "importing", job_id="job-2", phase="nodes"),
+                    make_record("done", "success", job_id="job-3", phase="done"),
+                    make_record("new", "pending"),
+                ])
+                await db.commit()
+
+                assert await ImportJobService.fail_interrupted_jobs(db) == 2
+
+                result = await db.execute(select(FileUploadRecord))
+                records = {record.file_id: record for record in result.scalars()}
+                assert records["queued"].import_status == "failed"
+                assert records["running"].import_status == "failed"
+                assert not ImportJobService.is_running(records["running"])
+                assert records["done"].import_status == "success"
+                assert records["new"].import_status == "pending"
+
+        self.run(scenario())
+
+    def test_07_failed_job_not_running(self, tmp_path, monkeypatch):
+        """测试 7: 任务在更新记录前抛出异常时记录标记为失败，失败的记录不再阻止重新导入"""
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from app.services import import_job_service
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+        Base.metadata.create_all(engine)
+        monkeypatch.setattr(import_job_service, "SessionLocal", sessionmaker(bind=engine))
+
+        def broken_import(file_path, file_id, mode):
+            raise ValueError(f"不支持的导入模式: {mode}")
+        monkeypatch.setattr(ImportJobService, "run_import", staticmethod(broken_import))
+
+        db = import_job_service.SessionLocal()
+        record = FileUploadRecord(
+            file_id="f1", filename="f1.xlsx", file_path="/tmp/f1.xlsx", file_size=1,
+            uploader_id=1, uploader_name="张三", import_status="pending", job_id="job-1", import_phase="queued"
+        )
+        db.add(record)
+        db.commit()
+        assert ImportJobService.is_running(record)
+
+        ImportJobService._run("job-1", "f1", "/tmp/f1.xlsx", "bad")
+
+        db.refresh(record)
+        assert record.import_status == "failed"
+        assert record.import_phase == "failed"
+        assert "不支持的导入模式" in record.error_message
+        assert not ImportJobService.is_running(record)
+
+        # 失败但阶段停留在 queued 的旧记录也不算进行中；从未提交任务的 pending 记录同样不算
+        record.import_phase = "queued"
+        assert not ImportJobService.is_running(record)
+        record.import_status, record.job_id = "pending", None
+        assert not ImportJobService.is_running(record)
+        db.close()
+        engine.dispose()
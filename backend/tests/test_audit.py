@@ -0,0 +1,134 @@
+"""
+请求审计中间件测试代码
+
+直接按 ASGI 协议调用应用，用列表代替缓冲写入器收集日志记录（需要安装 fastapi，未安装时跳过）
+"""
+import sys
+import asyncio
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("fastapi")
+
+from starlette.applications import Starlette
+from starlette.exceptions import HTTPException
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core.audit import AuditMiddleware, audit, set_audit_context
+
+
+@audit("知识图谱", "SEARCH")
+async def search(request):
+    set_audit_context(request, remark="搜索: 电机")
+    return PlainTextResponse("ok")
+
+
+@audit("用户管理", "DELETE")
+async def forbidden(request):
+    raise HTTPException(status_code=403, detail="权限不足")
+
+
+@audit("数据导入", "IMPORT")
+async def import_failed(request):
+    # 接口返回 200，业务结果为失败
+    set_audit_context(request, user_id=7, username="张三", remark="导入失败: 缺少工作表", status=0)
+    return PlainTextResponse("ok")
+
+
+@audit("智能问答", "QUERY")
+async def crash(request):
+    raise RuntimeError("连接中断")
+
+
+async def health(request):
+    return PlainTextResponse("ok")
+
+
+class TestAuditMiddleware:
+    """请求审计中间件测试类"""
+
+    def setup_method(self):
+        self.records = []
+        app = Starlette(routes=[
+            Route("/search", search),
+            Route("/forbidden", forbidden, methods=["DELETE"]),
+            Route("/import", import_failed, methods=["POST"]),
+            Route("/crash", crash),
+            Route("/health", health),
+        ])
+        self.app = AuditMiddleware(app, sink=self.records.append)
+
+    def call(self, path: str, method: str = "GET", headers: dict = None) -> int:
+        """发送一个请求，返回响应状态码"""
+        scope = {
+            "type": "http",
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+            "client": ("10.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        asyncio.run(self.app(scope, receive, send))
+        return messages[0]["status"]
+
+    def test_01_record_tagged_route(self):
+        """测试 1: 声明了 @audit 的路由记录模块、行为、来源和耗时"""
+        headers = {"User-Agent": "pytest", "X-Forwarded-For": "192.168.1.5, 10.0.0.1"}
+        assert self.call("/search", headers=headers) == 200
+
+        assert len(self.records) == 1
+        record = self.records[0]
+        assert record["module"] == "知识图谱"
+        assert record["action_type"] == "SEARCH"
+        assert record["status"] == 1
+        assert record["remark"] == "搜索: 电机"
+        assert record["username"] == "anonymous"
+        assert record["ip_address"] == "192.168.1.5"
+        assert record["user_agent"] == "pytest"
+        assert record["duration_ms"] >= 0
+
+    def test_02_skip_untagged_route(self):
+        """测试 2: 未声明 @audit 的路由和未匹配的路径不记录"""
+        assert self.call("/health") == 200
+        assert self.call("/missing") == 404
+        assert self.records == []
+
+    def test_03_record_failures(self):
+        """测试 3: 错误响应码和业务失败记录为失败"""
+        assert self.call("/forbidden", method="DELETE") == 403
+        assert self.call("/import", method="POST") == 200
+
+        forbidden_record, import_record = self.records
+        assert forbidden_record["status"] == 0
+        assert forbidden_record["remark"] == "DELETE /forbidden (HTTP 403)"
+        assert import_record["status"] == 0
+        assert import_record["user_id"] == 7
+        assert import_record["username"] == "张三"
+
+    def test_04_record_exception(self):
+        """测试 4: 未捕获的异常记录为失败后继续抛出"""
+        with pytest.raises(RuntimeError):
+            self.call("/crash")
+
+        assert len(self.records) == 1
+        assert self.records[0]["status"] == 0
+        assert "RuntimeError: 连接中断" in self.records[0]["remark"]
@@ -0,0 +1,98 @@
+"""
+TTL + LRU 结果缓存测试代码
+
+使用可控时钟测试过期和淘汰（不需要连接 Neo4j）
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.cache import TTLCache
+
+
+class FakeTimer:
+    """可手动推进的时钟"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache:
+    """结果缓存测试类"""
+
+    def setup_method(self):
+        """每个测试使用新的缓存和时钟"""
+        self.timer = FakeTimer()
+        self.cache = TTLCache(maxsize=3, ttl=10, timer=self.timer)
+
+    def test_01_hit_and_miss(self):
+        """测试 1: 命中与未命中计数"""
+        assert self.cache.get("a") == (False, None)
+        self.cache.set("a", 1)
+        assert self.cache.get("a") == (True, 1)
+
+        stats = self.cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_02_get_or_load(self):
+        """测试 2: 未命中时调用 loader，命中后不再调用"""
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return {"nodes": [], "edges": []}
+
+        first = self.cache.get_or_load(("search", "开机", 100), loader)
+        second = self.cache.get_or_load(("search", "开机", 100), loader)
+        assert first is second
+        assert len(calls) == 1
+
+    def test_03_loader_error_not_cached(self):
+        """测试 3: loader 抛出异常时不写入缓存"""
+        def failing_loader():
+            raise RuntimeError("Neo4j 不可用")
+
+        with pytest.raises(RuntimeError):
+            self.cache.get_or_load("a", failing_loader)
+        assert len(self.cache) == 0
+        assert self.cache.get_or_load("a", lambda: 2) == 2
+
+    def test_04_ttl_expiry(self):
+        """测试 4: 超过 TTL 后失效"""
+        self.cache.set("a", 1)
+        self.timer.now = 9.9
+        assert self.cache.get("a") == (True, 1)
+        self.timer.now = 10.0
+        assert self.cache.get("a") == (False, None)
+        assert self.cache.stats()["expirations"] == 1
+
+    def test_05_lru_eviction(self):
+        """测试 5: 超出容量时淘汰最久未使用的条目"""
+        for key in ["a", "b", "c"]:
+            self.cache.set(key, key)
+        # 访问 a 后，b 成为最久未使用的条目
+        self.cache.get("a")
+        self.cache.set("d", "d")
+
+        assert self.cache.get("b") == (False, None)
+        assert self.cache.get("a") == (True, "a")
+        assert len(self.cache) == 3
+        assert self.cache.stats()["evictions"] == 1
+
+    def test_06_clear(self):
+        """测试 6: 清空缓存后全部未命中，统计计数保留"""
+        self.cache.set("a", 1)
+        self.cache.get("a")
+        self.cache.clear()
+        assert self.cache.get("a") == (False, None)
+        assert self.cache.stats()["hits"] == 1
@@ -0,0 +1,428 @@
+"""
+数据导入写入路径测试代码
+
+用内存中的模拟图代替 Neo4j 客户端，按写入语句的结构执行节点和关系的增删改（不需要连接 Neo4j）
+"""
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import pandas as pd
+from app.core import neo4j_client as neo4j_client_module
+from app.core.neo4j_client import ActiveDatabasePointer, neo4j_client
+from app.services import data_import_service
+from app.services.data_import_service import DataImportService
+from app.services.knowledge_graph_service import KnowledgeGraphService
+
+LABEL_PATTERN = re.compile(r":`((?:[^`]|``)*)`")
+
+
+def parse_labels(fragment: str):
+    """从 Cypher 片段中解析反引号转义的标签或关系类型"""
+    return [label.replace("``", "`") for label in LABEL_PATTERN.findall(fragment)]
+
+
+class FakeGraph:
+    """内存中的图，只支持导入服务使用的写入和读取语句"""
+
+    def __init__(self):
+        self.nodes = {}
+        self.relations = {}
+        self.queries = []
+        # 返回 True 时模拟语句执行失败（如某一行数据无法写入）
+        self.fail_when = lambda query, parameters: False
+        self._next_id = 0
+
+    def _new_id(self, prefix: str) -> str:
+        self._next_id += 1
+        return f"{prefix}{self._next_id}"
+
+    def execute_query(self, query, parameters=None):
+        parameters = parameters or {}
+        self.queries.append(query)
+        if self.fail_when(query, parameters):
+            raise RuntimeError("模拟写入失败")
+        if "CREATE INDEX" in query:
+            return []
+        if "CREATE (n" in query:
+            labels = parse_labels(query.split("CREATE (n", 1)[1].split(")", 1)[0])
+            if "rows" not in parameters:
+                node_id = self._new_id("n")
+                self.nodes[node_id] = {"labels": list(labels), "props": dict(parameters["props"])}
+                return [{"id": node_id}]
+            result = []
+            for row in parameters["rows"]:
+                node_id = self._new_id("n")
+                self.nodes[node_id] = {"labels": list(labels), "props": dict(row["props"])}
+                result.append({"key": row["key"], "id": node_id})
+            return result
+        if "CREATE (a)-[r" in query:
+            rel_type = parse_labels(query.split("-[r", 1)[1].split("]", 1)[0])[0]
+            result = []
+            for row in parameters["rows"]:
+                if row["source_id"] in self.nodes and row["target_id"] in self.nodes:
+                    self.relations[self._new_id("r")] = (row["source_id"], rel_type, row["target_id"])
+                    result.append({"row": row["row"]})
+            return result
+        if "SET n = row.props" in query:
+            for row in parameters["rows"]:
+                self.nodes[row["id"]]["props"] = dict(row["props"])
+            return []
+        if "DETACH DELETE n" in query:
+            for node_id in parameters["rows"]:
+                self.nodes.pop(node_id, None)
+                self.relations = {k: v for k, v in self.relations.items() if node_id not in (v[0], v[2])}
+            return []
+        if "DELETE r" in query:
+            for rel_id in parameters["rows"]:
+                self.relations.pop(rel_id, None)
+            return []
+        if "REMOVE n" in query or "SET n:" in query:
+            removed = parse_labels(query.split("REMOVE n", 1)[1].split("SET", 1)[0]) if "REMOVE n" in query else []
+            added = parse_labels(query.split("SET n", 1)[1]) if "SET n:" in query else []
+            for node_id in parameters["rows"]:
+                labels = [label for label in self.nodes[node_id]["labels"] if label not in removed]
+                self.nodes[node_id]["labels"] = labels + added
+            return []
+        if "-[r]->(b)" in query:
+            label = parse_labels(query.split("MATCH (a", 1)[1].split(")", 1)[0])[0]
+            return [
+                {"id": rel_id, "source_id": source, "type": rel_type, "target_id": target}
+                for rel_id, (source, rel_type, target) in self.relations.items()
+                if label in self.nodes[source]["labels"]
+            ]
+        if "RETURN elementId(n) AS id, labels(n) AS labels" in query:
+            label = parse_labels(query.split("MATCH (n", 1)[1].split(")", 1)[0])[0]
+            return [
+                {"id": node_id, "labels": list(node["labels"]), "props": dict(node["props"])}
+                for node_id, node in self.nodes.items() if label in node["labels"]
+            ]
+        if "count(n)" in query:
+            return [{"count": len(self.nodes)}]
+        if "count(r)" in query:
+            return [{"count": len(self.relations)}]
+        raise AssertionError(f"未预期的查询: {query}")
+
+    def clear(self):
+        self.nodes.clear()
+        self.relations.clear()
+        return True
+
+    def snapshot(self):
+        """与 elementId 无关的图内容：节点（标签、属性）和关系（两端节点属性、类型）"""
+        def describe(node_id):
+            node = self.nodes[node_id]
+            return tuple(sorted(node["labels"])), tuple(sorted((k, repr(v)) for k, v in node["props"].items()))
+
+        nodes = sorted(describe(node_id) for node_id in self.nodes)
+        relations = sorted(
+            (describe(source), rel_type, describe(target))
+            for source, rel_type, target in self.relations.values()
+        )
+        return nodes, relations
+
+
+class FakeNeo4j:
+    """每个数据库一个模拟图，语句在当前线程使用的数据库（neo4j_client.current_database）中执行"""
+
+    def __init__(self):
+        self.graphs = defaultdict(FakeGraph)
+
+    @property
+    def current(self) -> FakeGraph:
+        return self.graphs[neo4j_client.current_database]
+
+    def execute_query(self, query, parameters=None):
+        return self.current.execute_query(query, parameters)
+
+
+class DeleteSession:
+    """模拟清空数据库时的 Neo4j 会话：记录执行的语句，按 LIMIT 或一次性删除并返回计数"""
+
+    def __init__(self, relationships: int, nodes: int, supports_in_transactions: bool):
+        self.remaining = {"relationships_deleted": relationships, "nodes_deleted": nodes}
+        self.supports_in_transactions = supports_in_transactions
+        self.runs = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, parameters=None):
+        self.runs.append((query, parameters))
+        if "IN TRANSACTIONS" in query and not self.supports_in_transactions:
+            raise RuntimeError("Invalid input 'IN TRANSACTIONS'")
+        counter = "relationships_deleted" if "DELETE r" in query else "nodes_deleted"
+        deleted = self.remaining[counter]
+        if parameters and "limit" in parameters:
+            deleted = min(deleted, parameters["limit"])
+        self.remaining[counter] -= deleted
+        counters = SimpleNamespace(relationships_deleted=0, nodes_deleted=0)
+        setattr(counters, counter, deleted)
+        return SimpleNamespace(consume=lambda: SimpleNamespace(counters=counters))
+
+
+class NoRecordSession:
+    """没有上传记录的数据库会话（导入只更新图，不更新上传记录）"""
+
+    def query(self, *args):
+        return self
+
+    def filter(self, *args):
+        return self
+
+    def first(self):
+        return None
+
+
+SHEETS = {
+    "设备台账": pd.DataFrame({"设备编号": ["D1", "D2"], "设备名称": ["车床", "铣床"]}),
+    "故障台账": pd.DataFrame({"故障编号": ["F1"], "故障名称": ["主轴过热"]}),
+    "三元组关系": pd.DataFrame({"头实体": ["D1", "D2"], "对象属性": ["发生", "发生"], "尾实体": ["F1", "F1"]}),
+}
+
+
+def empty_statistics(incremental: bool):
+    statistics = {key: 0 for key in data_import_service.GRAPH_STATISTIC_KEYS}
+    if incremental:
+        statistics.update({
+            "nodes_created": 0, "nodes_updated": 0, "nodes_deleted": 0, "nodes_failed": 0,
+            "relations_created": 0, "relations_deleted": 0
+        })
+    return statistics
+
+
+class TestDataImportWrites:
+    """数据导入写入路径测试类"""
+
+    @pytest.fixture
+    def neo4j(self, monkeypatch):
+        neo4j = FakeNeo4j()
+        monkeypatch.setattr(neo4j_client, "execute_query", neo4j.execute_query)
+        monkeypatch.setattr(
+            DataImportService, "clear_neo4j_database",
+            classmethod(lambda cls, batch_size=None: neo4j.current.clear())
+        )
+        monkeypatch.setattr(KnowledgeGraphService, "refresh_fulltext_index", staticmethod(lambda labels: None))
+        monkeypatch.setattr(data_import_service.settings, "IMPORT_BATCH_SIZE", 100, raising=False)
+        return neo4j
+
+    @pytest.fixture
+    def graph(self, neo4j):
+        return neo4j.current
+
+    def build(self, monkeypatch, sheets, mode):
+        """以指定模式把内存中的工作表写入模拟图"""
+        monkeypatch.setattr(DataImportService, "read_excel_with_encoding", classmethod(lambda cls, path: sheets))
+        statistics = empty_statistics(mode == "incremental")
+        errors = []
+        DataImportService._build_graph("台账.xlsx", None, None, False, mode, statistics, errors)
+        return statistics, errors
+
+    def test_01_incremental_then_full_same_graph(self, graph, monkeypatch):
+        """测试 1: 数字主键和带空白的主键在增量导入和全量导入中得到相同的图"""
+        sheets = {
+            "设备台账": pd.DataFrame({
+                "设备编号": [1001, " D-2 "],
+                "设备名称": ["数控车床", "铣床"],
+                "设备类型": ["加工设备", "加工设备"],
+            }),
+            "故障台账": pd.DataFrame({"故障编号": ["F1"], "故障名称": ["主轴过热"]}),
+            "三元组关系": pd.DataFrame({
+                "头实体": ["1001", "D-2"],
+                "对象属性": ["发生", "发生"],
+                "尾实体": ["F1", "F1"],
+            }),
+        }
+
+        incremental_stats, incremental_errors = self.build(monkeypatch, sheets, "incremental")
+        incremental_graph = graph.snapshot()
+        full_stats, full_errors = self.build(monkeypatch, sheets, "full")
+
+        assert graph.snapshot() == incremental_graph
+        assert incremental_errors == [] and full_errors == []
+        assert incremental_stats["relation_count"] == full_stats["relation_count"] == 2
+        assert len(graph.nodes) == 3
+
+    def test_02_node_batch_falls_back_per_row(self, graph):
+        """测试 2: 批量写入某一块失败时逐行重试，只有坏行失败；标签中的反引号被转义"""
+        graph.fail_when = lambda query, parameters: any(
+            row["props"].get("设备名称") == "坏数据" for row in parameters.get("rows", [])
+        ) or parameters.get("props", {}).get("设备名称") == "坏数据"
+        labels = ["设备", "加工`设备"]
+        pending = [
+            (labels, "D1", {"设备编号": "D1", "设备名称": "车床"}),
+            (labels, "D2", {"设备编号": "D2", "设备名称": "坏数据"}),
+            (labels, "D3", {"设备编号": "D3", "设备名称": "铣床", "故障率 (%)": 0.05}),
+        ]
+
+        count, node_id_map, failed = DataImportService._create_nodes_batch(pending, batch_size=2)
+
+        assert (count, failed) == (2, 1)
+        assert sorted(node_id_map) == ["D1", "D3"]
+        assert all(graph.nodes[node_id]["labels"] == labels for node_id in node_id_map.values())
+        assert graph.nodes[node_id_map["D3"]]["props"]["故障率 (%)"] == 0.05
+        # 第一块批量失败后逐行重试两次，第二块批量写入成功
+        assert sum("UNWIND" in query for query in graph.queries) == 2
+        assert sum("UNWIND" not in query for query in graph.queries) == 2
+
+    def test_03_relationship_batch_escapes_type(self, graph):
+        """测试 3: 关系按类型分组写入，关系类型中的反引号被转义；端点不存在的行记录为错误"""
+        _, node_id_map, _ = DataImportService._create_nodes_batch([
+            (["设备"], "D1", {"设备编号": "D1"}),
+            (["故障"], "F1", {"故障编号": "F1"}),
+        ])
+        pending = {
+            "发生`故障": [(2, "D1", "F1", node_id_map["D1"], node_id_map["F1"])],
+            "维修": [
+                (3, "D1", "F1", node_id_map["D1"], node_id_map["F1"]),
+                (4, "D1", "F9", node_id_map["D1"], "n404"),
+            ],
+        }
+
+        count, errors = DataImportService._create_relationships_batch(pending, batch_size=10)
+
+        assert count == 2
+        assert sorted(rel_type for _, rel_type, _ in graph.relations.values()) == ["发生`故障", "维修"]
+        assert errors == [{
+            "row": 4,
+            "error_type": "create_failed",
+            "message": "创建关系返回空结果: D1 -[维修]-> F9"
+        }]
+        assert sum("CREATE (a)-[r" in query for query in graph.queries) == 2
+
+    def test_04_relationship_batch_failure_reports_rows(self, graph):
+        """测试 4: 某一块关系写入失败时该块每一行都记录为错误，其他关系类型继续写入"""
+        _, node_id_map, _ = DataImportService._create_nodes_batch([
+            (["设备"], "D1", {"设备编号": "D1"}),
+            (["故障"], "F1", {"故障编号": "F1"}),
+        ])
+        graph.fail_when = lambda query, parameters: "`维修`" in query
+        source, target = node_id_map["D1"], node_id_map["F1"]
+        pending = {
+            "维修": [(2, "D1", "F1", source, target), (3, "F1", "D1", target, source)],
+            "发生": [(4, "D1", "F1", source, target)],
+        }
+
+        count, errors = DataImportService._create_relationships_batch(pending)
+
+        assert count == 1
+        assert [(error["row"], error["error_type"]) for error in errors] == [
+            (2, "processing_error"), (3, "processing_error")
+        ]
+
+    @pytest.fixture
+    def blue_green(self, neo4j, monkeypatch, tmp_path):
+        """启用蓝绿切换（neo4j 在线、standby 备用），状态文件写入临时目录；返回读取 Excel 的次数"""
+        settings = neo4j_client_module.settings
+        monkeypatch.setattr(settings, "NEO4J_DATABASE", "neo4j", raising=False)
+        monkeypatch.setattr(settings, "NEO4J_STANDBY_DATABASE", "standby", raising=False)
+        pointer = ActiveDatabasePointer()
+        pointer.STATE_FILE = tmp_path / "neo4j_active.json"
+        monkeypatch.setattr(neo4j_client_module, "database_pointer", pointer)
+        monkeypatch.setattr(data_import_service, "database_pointer", pointer)
+        monkeypatch.setattr(neo4j_client, "ensure_database", lambda database: None)
+        monkeypatch.setattr(KnowledgeGraphService, "on_graph_changed", classmethod(lambda cls: None))
+
+        reads = []
+        sheets_by_file = {"f1": SHEETS, "empty": {"设备台账": pd.DataFrame({"设备编号": [None], "设备名称": ["车床"]})}}
+
+        def read(cls, path):
+            reads.append(path)
+            return sheets_by_file.get(path, SHEETS)
+
+        monkeypatch.setattr(DataImportService, "read_excel_with_encoding", classmethod(read))
+        return pointer, reads
+
+    def reimport(self, file_id):
+        return DataImportService.import_from_excel(file_id, NoRecordSession(), file_id, streaming=False)
+
+    def test_05_full_import_builds_standby_and_switches(self, neo4j, blue_green):
+        """测试 5: 全量导入写入备用数据库，校验通过后切换在线数据库，原在线数据库不受影响"""
+        pointer, _ = blue_green
+        neo4j.graphs["neo4j"].nodes["old"] = {"labels": ["设备"], "props": {"设备编号": "OLD"}}
+
+        result = self.reimport("f1")
+
+        assert result["success"], result["message"]
+        assert pointer.active == "standby"
+        assert len(neo4j.graphs["standby"].nodes) == 3 and len(neo4j.graphs["standby"].relations) == 2
+        assert list(neo4j.graphs["neo4j"].nodes) == ["old"]
+        slot = pointer.get_slot("standby")
+        assert slot["file_id"] == "f1"
+        assert slot["statistics"]["total_nodes"] == 3 and slot["statistics"]["relation_count"] == 2
+
+    def test_06_failed_validation_keeps_active(self, neo4j, blue_green):
+        """测试 6: 新构建的图校验失败（为空）时不切换，在线数据库保持不变"""
+        pointer, _ = blue_green
+
+        result = self.reimport("empty")
+
+        assert not result["success"]
+        assert "为空" in result["message"]
+        assert pointer.active == "neo4j"
+        assert pointer.get_slot("standby") == {}
+
+    def test_07_reimport_switches_back_to_prebuilt(self, neo4j, blue_green):
+        """测试 7: 备用数据库中已是该文件的完整数据时直接切换（回滚），数据被修改过时重新构建"""
+        pointer, reads = blue_green
+        assert self.reimport("f1")["success"]
+        assert self.reimport("f2")["success"]
+        assert pointer.active == "neo4j"
+        assert len(reads) == 2
+
+        # 回滚到 f1：standby 中仍是 f1 的数据，不读取 Excel
+        result = self.reimport("f1")
+        assert result["success"]
+        assert pointer.active == "standby"
+        assert len(reads) == 2
+        assert result["statistics"]["total_nodes"] == 3
+
+        # neo4j 中 f2 的数据被修改过（节点数与记录不一致），回到 f2 时重新构建
+        neo4j.graphs["neo4j"].nodes.popitem()
+        assert self.reimport("f2")["success"]
+        assert pointer.active == "neo4j"
+        assert len(reads) == 3
+
+    def test_08_clear_in_transactions(self, monkeypatch):
+        """测试 8: 支持 CALL { } IN TRANSACTIONS 时每类数据一条语句删除，先删关系再删节点"""
+        session = DeleteSession(relationships=5, nodes=3, supports_in_transactions=True)
+        monkeypatch.setattr(neo4j_client, "get_session", lambda database=None: session)
+
+        assert DataImportService.clear_neo4j_database(batch_size=2)
+
+        assert [query.split(" CALL")[0] for query, _ in session.runs] == ["MATCH ()-[r]->()", "MATCH (n)"]
+        assert all("IN TRANSACTIONS OF 2 ROWS" in query for query, _ in session.runs)
+        assert session.remaining == {"relationships_deleted": 0, "nodes_deleted": 0}
+
+    def test_09_clear_falls_back_to_limit_loop(self, monkeypatch):
+        """测试 9: 不支持 IN TRANSACTIONS 时退回 LIMIT 循环，每批最多 batch_size 行，删完为止"""
+        session = DeleteSession(relationships=5, nodes=3, supports_in_transactions=False)
+        monkeypatch.setattr(neo4j_client, "get_session", lambda database=None: session)
+
+        assert DataImportService.clear_neo4j_database(batch_size=2)
+
+        loop_runs = [(query, parameters) for query, parameters in session.runs if "LIMIT" in query]
+        assert len(session.runs) - len(loop_runs) == 1
+        assert all(parameters == {"limit": 2} for _, parameters in loop_runs)
+        # 关系 2 + 2 + 1 + 0（确认删完），节点 2 + 1 + 0
+        assert ["DELETE r" in query for query, _ in loop_runs] == [True] * 4 + [False] * 3
+        assert session.remaining == {"relationships_deleted": 0, "nodes_deleted": 0}
+
+    def test_10_clear_reports_failure(self, monkeypatch):
+        """测试 10: 回退后仍然失败时返回 False（导入据此中止，不写入半清空的图）"""
+        def broken_session(database=None):
+            raise RuntimeError("连接中断")
+
+        monkeypatch.setattr(neo4j_client, "get_session", broken_session)
+        assert DataImportService.clear_neo4j_database(batch_size=2) is False
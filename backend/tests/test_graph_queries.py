@@ -0,0 +1,147 @@
+"""
+知识图谱查询测试代码
+
+用模拟的异步 Neo4j 客户端按查询语句返回固定结果（不需要连接 Neo4j）
+"""
+import sys
+import asyncio
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.cache import TTLCache
+from app.services import knowledge_graph_service
+from app.services.knowledge_graph_service import KnowledgeGraphService, NEIGHBOR_DEFAULT_MAX_NODES
+
+
+class FakeAsyncClient:
+    """按查询语句中的关键片段返回结果的异步客户端，记录每次调用"""
+
+    current_database = "neo4j"
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.calls = []
+
+    def _results(self, query, parameters):
+        for marker, results in self.routes.items():
+            if marker in query:
+                return results(parameters) if callable(results) else results
+        raise AssertionError(f"未预期的查询: {query}")
+
+    async def execute_query(self, query, parameters=None):
+        self.calls.append(("execute", query, parameters))
+        return list(self._results(query, parameters))
+
+    async def stream_query(self, query, parameters=None, database=None):
+        self.calls.append(("stream", query, parameters))
+        for record in self._results(query, parameters):
+            yield record
+
+
+def node(node_id, label="设备"):
+    return {"id": node_id, "labels": [label], "properties": {"title": node_id}}
+
+
+def collect(stream):
+    """读取流式结果的全部记录"""
+    async def run():
+        return [item async for item in await stream]
+    return asyncio.run(run())
+
+
+async def no_ngram(keyword, limit):
+    """未开启 n-gram 索引"""
+    return None
+
+
+class TestGraphQueries:
+    """知识图谱查询测试类"""
+
+    def use_client(self, monkeypatch, routes):
+        client = FakeAsyncClient(routes)
+        monkeypatch.setattr(knowledge_graph_service, "async_neo4j_client", client)
+        return client
+
+    def test_01_stream_direct_neighbors_from_cursor(self, monkeypatch):
+        """测试 1: depth=1 的流式邻居从查询游标读取，不输出中心节点，超过上限时标记截断"""
+        client = self.use_client(monkeypatch, {
+            "WITH DISTINCT neighbor": lambda p: [node("c"), node("n1"), node("n2"), node("n3")][:p["limit"]],
+            "WITH DISTINCT r": [
+                {"from_node": "c", "to_node": "n1", "type": "发生", "rel_id": "r1"},
+                {"from_node": "n2", "to_node": "c", "type": "负责", "rel_id": "r2"},
+            ],
+        })
+
+        records = collect(KnowledgeGraphService.stream_node_neighbors("c", depth=1, max_nodes=3))
+
+        assert [r["data"]["id"] for r in records if r["type"] == "node"] == ["n1", "n2"]
+        assert [r["data"]["id"] for r in records if r["type"] == "edge"] == ["r1", "r2"]
+        assert records[-1] == {"type": "end", "node_count": 2, "edge_count": 2, "truncated": True}
+        assert all(kind == "stream" for kind, _, _ in client.calls)
+        # 关系查询只针对已输出的邻居和中心节点
+        assert client.calls[-1][2]["node_ids"] == ["c", "n1", "n2"]
+
+    def test_02_fill_fulltext_results_from_scan(self, monkeypatch):
+        """测试 2: 全文索引命中不足 limit 个时用全属性扫描补足，按节点去重且全文结果在前"""
+        monkeypatch.setattr(KnowledgeGraphService, "_search_ngram", staticmethod(no_ngram))
+        self.use_client(monkeypatch, {
+            "db.index.fulltext.queryNodes": [dict(node("a"), score=2.0)],
+            "CONTAINS $keyword": lambda p: [node("b"), node("a"), node("c"), node("d")][:p["limit"]],
+        })
+
+        nodes, node_ids = asyncio.run(KnowledgeGraphService._find_nodes("10天", 3))
+        assert node_ids == ["a", "b", "c"]
+        assert [n["id"] for n in nodes] == node_ids
+        assert nodes[0]["score"] == 2.0
+
+    def test_03_skip_scan_when_fulltext_is_full(self, monkeypatch):
+        """测试 3: 全文索引命中 limit 个时不再扫描"""
+        monkeypatch.setattr(KnowledgeGraphService, "_search_ngram", staticmethod(no_ngram))
+        client = self.use_client(monkeypatch, {
+            "db.index.fulltext.queryNodes": [dict(node("a"), score=2.0), dict(node("b"), score=1.0)],
+        })
+
+        _, node_ids = asyncio.run(KnowledgeGraphService._find_nodes("电机", 2))
+        assert node_ids == ["a", "b"]
+        assert len(client.calls) == 1
+
+    def test_04_direct_neighbors_uncapped_by_default(self, monkeypatch):
+        """测试 4: 未指定 max_nodes 时 depth=1 返回全部直接邻居，不截断"""
+        neighbors = [dict(node(f"n{i}"), rels=[]) for i in range(NEIGHBOR_DEFAULT_MAX_NODES + 1)]
+        client = self.use_client(monkeypatch, {"collect(DISTINCT": neighbors})
+
+        result = asyncio.run(KnowledgeGraphService.get_node_neighbors("c", depth=1))
+        assert len(result["nodes"]) == NEIGHBOR_DEFAULT_MAX_NODES + 1
+        assert result["truncated"] is False
+        _, query, parameters = client.calls[0]
+        assert "LIMIT" not in query and "limit" not in parameters
+
+    def test_05_multi_hop_keeps_default_cap(self, monkeypatch):
+        """测试 5: 未指定 max_nodes 时多跳展开仍使用默认上限"""
+        client = self.use_client(monkeypatch, {
+            "WITH DISTINCT neighbor": [node("n1")],
+            "MATCH (a)-[r]->(b)": [],
+        })
+
+        asyncio.run(KnowledgeGraphService.get_node_neighbors("c", depth=2))
+        assert client.calls[0][2]["limit"] == NEIGHBOR_DEFAULT_MAX_NODES + 1
+
+    def test_06_cache_batch_neighbors(self, monkeypatch):
+        """测试 6: 批量展开经过结果缓存，节点顺序不同也命中同一条缓存"""
+        monkeypatch.setattr(knowledge_graph_service.settings, "GRAPH_CACHE_ENABLED", True)
+        monkeypatch.setattr(KnowledgeGraphService, "_result_cache", TTLCache(maxsize=10, ttl=60))
+        monkeypatch.setattr(KnowledgeGraphService, "_current_graph_version", staticmethod(lambda: ("neo4j", None)))
+        client = self.use_client(monkeypatch, {"collect(DISTINCT": [dict(node("n1"), rels=[])]})
+
+        first = asyncio.run(KnowledgeGraphService.get_neighbors_batch(["a", "b"]))
+        second = asyncio.run(KnowledgeGraphService.get_neighbors_batch(["b", "a", "b"]))
+        assert second is first
+        assert len(client.calls) == 1
+
+        asyncio.run(KnowledgeGraphService.get_neighbors_batch(["a", "b"], max_nodes=1))
+        assert len(client.calls) == 2
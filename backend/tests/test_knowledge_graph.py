@@ -9,10 +9,14 @@ from pathlib import Path
 # 添加项目根目录到 Python 路径
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.core.neo4j_client import neo4j_client
+from app.core.neo4j_client import neo4j_client, async_neo4j_client
 from app.services.knowledge_graph_service import KnowledgeGraphService
+import asyncio
 import json
 
+# 知识图谱服务的查询方法是异步的，异步驱动绑定在创建它的事件循环上，所有调用使用同一个事件循环
+loop = asyncio.new_event_loop()
+
 
 def test_check_database_nodes():
     """
@@ -167,7 +171,7 @@ def test_search_all_nodes():
 
     try:
         # 调用 search_all_nodes 方法
-        result = KnowledgeGraphService.search_all_nodes(keyword, limit=10)
+        result = loop.run_until_complete(KnowledgeGraphService.search_all_nodes(keyword, limit=10))
 
         print(f"\n[OK] 搜索执行成功！")
         print(f"[OK] 找到 {len(result['nodes'])} 个节点")
@@ -231,6 +235,7 @@ def main():
         # 关闭数据库连接
         try:
             neo4j_client.close()
+            loop.run_until_complete(async_neo4j_client.close())
             print("\n数据库连接已关闭")
         except:
             pass
@@ -0,0 +1,133 @@
+"""
+操作日志缓冲写入器测试代码
+
+使用 SQLite + aiosqlite 内存数据库代替 MySQL（需要安装 aiosqlite，未安装时跳过）
+"""
+import sys
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.log_writer import OperationLogWriter
+from app.models import Base, OperationLog
+
+
+def make_record(i: int) -> dict:
+    """生成一条日志记录"""
+    return {
+        "user_id": 1,
+        "username": "张三",
+        "action_type": "SEARCH",
+        "module": "知识图谱",
+        "status": 1,
+        "remark": f"第{i}次搜索",
+        "created_at": datetime.utcnow()
+    }
+
+
+class TestOperationLogWriter:
+    """操作日志写入器测试类"""
+
+    def setup_method(self):
+        """每个测试使用新的内存数据库"""
+        self.loop = asyncio.new_event_loop()
+        self.engine = create_async_engine("sqlite+aiosqlite://")
+        self.session_factory = async_sessionmaker(bind=self.engine, class_=AsyncSession)
+        self.run(self._create_tables())
+
+    def teardown_method(self):
+        """释放连接池和事件循环"""
+        self.run(self.engine.dispose())
+        self.loop.close()
+
+    def run(self, coro):
+        """在测试的事件循环中执行协程"""
+        return self.loop.run_until_complete(coro)
+
+    async def _create_tables(self):
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    async def _count_rows(self) -> int:
+        async with self.session_factory() as db:
+            return await db.scalar(select(func.count(OperationLog.id)))
+
+    def make_writer(self, **kwargs) -> OperationLogWriter:
+        options = dict(maxsize=100, batch_size=3, flush_interval_ms=10000, enqueue_timeout_ms=10)
+        options.update(kwargs)
+        return OperationLogWriter(session_factory=self.session_factory, **options)
+
+    def test_01_flush_by_batch_size(self):
+        """测试 1: 凑满一批立即写入，剩余不足一批的日志在停止时写入"""
+        async def scenario():
+            writer = self.make_writer()
+            writer.start()
+            for i in range(7):
+                assert await writer.write(make_record(i))
+            await asyncio.sleep(0.2)
+            assert writer.written == 6
+            assert writer.batches == 2
+
+            await writer.stop()
+            assert writer.written == 7
+            assert await self._count_rows() == 7
+
+        self.run(scenario())
+
+    def test_02_flush_by_interval(self):
+        """测试 2: 不足一批时等待时间间隔后写入"""
+        async def scenario():
+            writer = self.make_writer(batch_size=100, flush_interval_ms=50)
+            writer.start()
+            await writer.write(make_record(0))
+            await asyncio.sleep(0.3)
+            assert writer.written == 1
+            assert await self._count_rows() == 1
+            await writer.stop()
+
+        self.run(scenario())
+
+    def test_03_drop_when_full(self):
+        """测试 3: 队列已满或写入器停止后丢弃并计数"""
+        async def scenario():
+            writer = self.make_writer(maxsize=2)
+            writer.start()
+            # 中间没有 await，后台任务还没有机会取走日志
+            results = [writer.write_nowait(make_record(i)) for i in range(5)]
+            assert results == [True, True, False, False, False]
+            assert writer.dropped == 3
+
+            await writer.stop()
+            assert not await writer.write(make_record(5))
+            assert writer.stats()["dropped"] == 4
+            assert await self._count_rows() == 2
+
+        self.run(scenario())
+
+    def test_04_keep_enqueue_time(self):
+        """测试 4: 写入的操作时间是入队时间"""
+        async def scenario():
+            writer = self.make_writer()
+            writer.start()
+            record = make_record(0)
+            record["created_at"] = datetime.utcnow() - timedelta(hours=1)
+            await writer.write(record)
+            await writer.stop()
+
+            async with self.session_factory() as db:
+                log = await db.scalar(select(OperationLog))
+            assert log.created_at == record["created_at"]
+            assert log.remark == "第0次搜索"
+
+        self.run(scenario())
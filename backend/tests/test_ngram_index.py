@@ -0,0 +1,72 @@
+"""
+n-gram 倒排索引测试代码
+
+测试子串搜索结果与 CONTAINS 语义一致（不需要连接 Neo4j）
+"""
+import sys
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services.ngram_index import NGramIndex, property_to_text
+
+
+# ==================== 测试数据 ====================
+DOCUMENTS = [
+    ("n1", {"设备编号": "E001", "设备名称": "数控车床", "维护周期": "10天", "故障率": 0.05}),
+    ("n2", {"设备编号": "E002", "设备名称": "数控铣床", "维护周期": "30天"}),
+    ("n3", {"故障编号": "F001", "故障名称": "无法开机", "故障现象": "按下电源后无法开机"}),
+    ("n4", {"工号": 1001, "姓名": "张三", "在职": True}),
+    ("n5", {}),
+]
+
+
+def contains_scan(keyword: str) -> list:
+    """参照实现：逐个属性做子串匹配"""
+    return [
+        doc_id for doc_id, properties in DOCUMENTS
+        if any(keyword in property_to_text(v) for v in properties.values())
+    ]
+
+
+class TestNGramIndex:
+    """n-gram 倒排索引测试类"""
+
+    @classmethod
+    def setup_class(cls):
+        """构建测试索引"""
+        cls.index = NGramIndex.build(DOCUMENTS)
+
+    def test_01_build(self):
+        """测试 1: 构建索引"""
+        assert len(self.index) == len(DOCUMENTS)
+        assert self.index.gram_count > 0
+
+    def test_02_short_keywords(self):
+        """测试 2: 不超过 3 个字符的关键词（倒排表直接命中）"""
+        for keyword in ["开机", "10天", "数控", "床", "张三", "E00"]:
+            assert self.index.search(keyword) == contains_scan(keyword), keyword
+
+    def test_03_long_keywords(self):
+        """测试 3: 超过 3 个字符的关键词（交集后校验连续出现）"""
+        for keyword in ["数控车床", "按下电源后", "E001", "无法开机"]:
+            assert self.index.search(keyword) == contains_scan(keyword), keyword
+
+    def test_04_no_cross_property_match(self):
+        """测试 4: 不跨属性值匹配"""
+        # "车床" 和 "10天" 属于不同属性，拼接后的片段不应命中
+        assert self.index.search("车床10") == []
+
+    def test_05_non_string_values(self):
+        """测试 5: 数值、布尔值按 toString() 的结果匹配"""
+        assert self.index.search("0.05") == ["n1"]
+        assert self.index.search("1001") == ["n4"]
+        assert self.index.search("true") == ["n4"]
+
+    def test_06_limit_and_missing(self):
+        """测试 6: 数量限制和未命中"""
+        assert self.index.search("数控", limit=1) == ["n1"]
+        assert self.index.search("不存在的词") == []
+        assert self.index.search("") == []
@@ -7,10 +7,14 @@ from pathlib import Path
 # 添加项目根目录到 Python 路径
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.core.neo4j_client import neo4j_client
+from app.core.neo4j_client import neo4j_client, async_neo4j_client
 from app.services.knowledge_graph_service import KnowledgeGraphService
+import asyncio
 import json
 
+# 知识图谱服务的查询方法是异步的，异步驱动绑定在创建它的事件循环上，所有调用使用同一个事件循环
+loop = asyncio.new_event_loop()
+
 
 def test_get_node_neighbors():
     """测试获取节点邻居功能"""
@@ -22,7 +26,7 @@ def test_get_node_neighbors():
     keyword = "重新开机"
     print(f"\n步骤1：搜索关键词 '{keyword}'")
 
-    search_result = KnowledgeGraphService.search_all_nodes(keyword, limit=1)
+    search_result = loop.run_until_complete(KnowledgeGraphService.search_all_nodes(keyword, limit=1))
 
     if not search_result['nodes']:
         print(f"[ERROR] 未找到包含 '{keyword}' 的节点")
@@ -41,7 +45,7 @@ def test_get_node_neighbors():
     print(f"\n步骤2：获取节点的邻居")
 
     try:
-        neighbors_result = KnowledgeGraphService.get_node_neighbors(node_id, depth=1)
+        neighbors_result = loop.run_until_complete(KnowledgeGraphService.get_node_neighbors(node_id, depth=1))
 
         print(f"[OK] 成功获取邻居节点")
         print(f"     找到 {len(neighbors_result['nodes'])} 个邻居节点")
@@ -104,6 +108,7 @@ def main():
         # 关闭数据库连接
         try:
             neo4j_client.close()
+            loop.run_until_complete(async_neo4j_client.close())
             print("\n数据库连接已关闭")
         except:
             pass
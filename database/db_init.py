@@ -122,12 +122,16 @@ def init_database():
                 `created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '操作时间',
                 `status` TINYINT NOT NULL DEFAULT 1 COMMENT '操作状态: 1=成功, 0=失败',
                 `remark` VARCHAR(500) DEFAULT NULL COMMENT '备注信息',
+                `duration_ms` INT DEFAULT NULL COMMENT '请求耗时（毫秒）',
                 PRIMARY KEY (`id`),
                 KEY `idx_user_id` (`user_id`),
                 KEY `idx_username` (`username`),
                 KEY `idx_action_type` (`action_type`),
                 KEY `idx_module` (`module`),
-                KEY `idx_created_at` (`created_at`)
+                KEY `idx_created_at` (`created_at`),
+                KEY `idx_user_time` (`user_id`, `created_at`),
+                KEY `idx_module_time` (`module`, `created_at`),
+                KEY `idx_action_time` (`action_type`, `created_at`)
             ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='操作日志表';
         """
         cursor.execute(log_table_sql)
@@ -147,6 +151,10 @@ def init_database():
                 `uploader_id` BIGINT NOT NULL COMMENT '上传者用户ID',
                 `uploader_name` VARCHAR(50) NOT NULL COMMENT '上传者用户名',
                 `import_status` VARCHAR(20) NOT NULL DEFAULT 'pending' COMMENT '导入状态: pending=待导入, importing=导入中, success=成功, failed=失败',
+                `job_id` VARCHAR(64) DEFAULT NULL COMMENT '后台导入任务ID',
+                `import_phase` VARCHAR(20) DEFAULT NULL COMMENT '导入阶段: queued/reading/clearing/nodes/relations/switching/done/failed',
+                `processed_rows` INT DEFAULT 0 COMMENT '已处理行数',
+                `total_rows` INT DEFAULT 0 COMMENT '待处理总行数',
                 `device_count` INT DEFAULT 0 COMMENT '设备节点数',
                 `person_count` INT DEFAULT 0 COMMENT '人员节点数',
                 `material_count` INT DEFAULT 0 COMMENT '物料节点数',
@@ -162,6 +170,7 @@ def init_database():
                 UNIQUE KEY `uk_file_id` (`file_id`),
                 KEY `idx_uploader_id` (`uploader_id`),
                 KEY `idx_import_status` (`import_status`),
+                KEY `idx_job_id` (`job_id`),
                 KEY `idx_upload_time` (`upload_time`)
             ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='文件上传记录表';
         """
@@ -0,0 +1,99 @@
+"""
+数据库迁移脚本
+功能：为已有数据库补充新版本增加的列和索引（不删除表、不影响已有数据）
+
+db_init.py 会删除并重建所有表，只适用于全新安装；已有数据库升级时运行本脚本，
+已存在的列和索引会跳过，可以重复执行
+"""
+import os
+
+import pymysql
+
+from db_init import DB_CONFIG
+
+# =========================
+# 迁移列表：(表名, 类型, 列名或索引名, ALTER TABLE 子句)
+# =========================
+MIGRATIONS = [
+    # 后台导入任务的任务ID和进度
+    ("file_upload_record", "column", "job_id",
+     "ADD COLUMN `job_id` VARCHAR(64) DEFAULT NULL COMMENT '后台导入任务ID' AFTER `import_status`"),
+    ("file_upload_record", "column", "import_phase",
+     "ADD COLUMN `import_phase` VARCHAR(20) DEFAULT NULL "
+     "COMMENT '导入阶段: queued/reading/clearing/nodes/relations/switching/done/failed' AFTER `job_id`"),
+    ("file_upload_record", "column", "processed_rows",
+     "ADD COLUMN `processed_rows` INT DEFAULT 0 COMMENT '已处理行数' AFTER `import_phase`"),
+    ("file_upload_record", "column", "total_rows",
+     "ADD COLUMN `total_rows` INT DEFAULT 0 COMMENT '待处理总行数' AFTER `processed_rows`"),
+    ("file_upload_record", "index", "idx_job_id",
+     "ADD INDEX `idx_job_id` (`job_id`)"),
+    # 审计中间件记录的请求耗时
+    ("operation_log", "column", "duration_ms",
+     "ADD COLUMN `duration_ms` INT DEFAULT NULL COMMENT '请求耗时（毫秒）' AFTER `remark`"),
+    # 操作日志按筛选列 + 时间的游标分页（InnoDB 索引末尾隐含主键 id）
+    ("operation_log", "index", "idx_user_time",
+     "ADD INDEX `idx_user_time` (`user_id`, `created_at`)"),
+    ("operation_log", "index", "idx_module_time",
+     "ADD INDEX `idx_module_time` (`module`, `created_at`)"),
+    ("operation_log", "index", "idx_action_time",
+     "ADD INDEX `idx_action_time` (`action_type`, `created_at`)"),
+]
+
+
+def column_exists(cursor, db_name: str, table: str, column: str) -> bool:
+    """判断列是否已存在"""
+    cursor.execute(
+        "SELECT COUNT(*) FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = %s",
+        (db_name, table, column)
+    )
+    return cursor.fetchone()[0] > 0
+
+
+def index_exists(cursor, db_name: str, table: str, index: str) -> bool:
+    """判断索引是否已存在"""
+    cursor.execute(
+        "SELECT COUNT(*) FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND INDEX_NAME = %s",
+        (db_name, table, index)
+    )
+    return cursor.fetchone()[0] > 0
+
+
+def migrate_database():
+    """执行迁移"""
+    print("=" * 60)
+    print("开始迁移数据库...")
+    print("=" * 60)
+
+    db_name = os.getenv('DB_NAME', 'workshop')
+    conn = pymysql.connect(**DB_CONFIG, database=db_name, autocommit=True)
+    cursor = conn.cursor()
+
+    try:
+        applied = 0
+        for table, kind, name, clause in MIGRATIONS:
+            exists = (column_exists if kind == "column" else index_exists)(cursor, db_name, table, name)
+            if exists:
+                print(f"  - {table}.{name} 已存在，跳过")
+                continue
+            cursor.execute(f"ALTER TABLE `{table}` {clause};")
+            applied += 1
+            print(f"  ✓ {table}.{name} 已添加")
+
+        print("\n" + "=" * 60)
+        print(f"数据库迁移完成！新增 {applied} 项")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n迁移失败: {e}")
+        raise
+
+    finally:
+        cursor.close()
+        conn.close()
+        print("\n数据库连接已关闭。")
+
+
+if __name__ == "__main__":
+    migrate_database()
@@ -7,11 +7,13 @@ import request from './index'
 /**
  * 上传并导入 Excel 文件（一步完成）
  * @param {File} file - Excel 文件对象
+ * @param {string} mode - 导入模式：full 清空重建，incremental 增量导入
  */
-export const uploadAndImport = (file) => {
+export const uploadAndImport = (file, mode = 'full') => {
   const formData = new FormData()
   formData.append('file', file)
   return request.post('/v1/data-import/upload-and-import', formData, {
+    params: { mode },
     headers: {
       'Content-Type': 'multipart/form-data'
     },
@@ -45,13 +47,50 @@ export const deleteUploadRecord = (fileId) => {
 /**
  * 根据历史记录重新导入
  * @param {string} fileId - 历史上传记录的文件ID
+ * @param {string} mode - 导入模式：full 清空重建，incremental 增量导入
  */
-export const reimportFromRecord = (fileId) => {
+export const reimportFromRecord = (fileId, mode = 'full') => {
   return request.post(`/v1/data-import/reimport/${fileId}`, {}, {
+    params: { mode },
     timeout: 300000 // 导入可能需要较长时间，设置5分钟超时
   })
 }
 
+/**
+ * 上传 Excel 文件并提交后台导入任务（立即返回任务ID）
+ * @param {File} file - Excel 文件对象
+ * @param {string} mode - 导入模式：full 清空重建，incremental 增量导入
+ */
+export const submitUploadImportJob = (file, mode = 'full') => {
+  const formData = new FormData()
+  formData.append('file', file)
+  return request.post('/v1/data-import/jobs/upload-and-import', formData, {
+    params: { mode },
+    headers: {
+      'Content-Type': 'multipart/form-data'
+    }
+  })
+}
+
+/**
+ * 根据历史记录提交后台重新导入任务
+ * @param {string} fileId - 历史上传记录的文件ID
+ * @param {string} mode - 导入模式：full 清空重建，incremental 增量导入
+ */
+export const submitReimportJob = (fileId, mode = 'full') => {
+  return request.post(`/v1/data-import/jobs/reimport/${fileId}`, {}, {
+    params: { mode }
+  })
+}
+
+/**
+ * 查询后台导入任务进度
+ * @param {string} jobId - 任务ID
+ */
+export const getImportJobStatus = (jobId) => {
+  return request.get(`/v1/data-import/jobs/${jobId}`)
+}
+
 /**
  * 健康检查
  */
@@ -66,6 +105,9 @@ export const dataImportApi = {
   getUploadRecord,
   deleteUploadRecord,
   reimportFromRecord,
+  submitUploadImportJob,
+  submitReimportJob,
+  getImportJobStatus,
   healthCheck
 }
 
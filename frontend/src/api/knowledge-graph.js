@@ -47,14 +47,46 @@ export const getGraphData = (limit = 100) => {
   })
 }
 
+/**
+ * 分页获取图谱数据（逐页加载大图）
+ * 每页返回本页节点以及与已加载节点之间的关系，逐页合并即为完整的图
+ * @param {number} pageSize - 每页节点数
+ * @param {string} cursor - 上一页返回的 next_cursor，第一页不传
+ */
+export const getGraphDataPage = (pageSize = 500, cursor = null) => {
+  return request.get('/v1/knowledge-graph/graph-data/page', {
+    params: { page_size: pageSize, cursor: cursor || undefined }
+  })
+}
+
 /**
  * 获取节点的邻居（用于节点展开）
  * @param {string} nodeId - 节点的 elementId
- * @param {number} depth - 扩展深度（默认1）
+ * @param {number} depth - 扩展深度（默认1，最大3，一次返回整个邻域子图）
+ * @param {Object} options - 可选参数
+ * @param {number} options.maxNodes - 返回的邻居节点总数上限
+ * @param {number} options.perHopLimit - 每一跳新增节点数上限
  */
-export const getNodeNeighbors = (nodeId, depth = 1) => {
+export const getNodeNeighbors = (nodeId, depth = 1, { maxNodes, perHopLimit } = {}) => {
   return request.get(`/v1/knowledge-graph/neighbors/${nodeId}`, {
-    params: { depth }
+    params: { depth, max_nodes: maxNodes, per_hop_limit: perHopLimit }
+  })
+}
+
+/**
+ * 批量获取多个节点的邻居（合并后的子图，节点和关系已去重）
+ * @param {string[]} nodeIds - 节点的 elementId 列表
+ * @param {number} depth - 扩展深度（默认1）
+ * @param {Object} options - 可选参数
+ * @param {number} options.maxNodes - 返回的邻居节点总数上限
+ * @param {number} options.perHopLimit - 每一跳新增节点数上限
+ */
+export const getNeighborsBatch = (nodeIds, depth = 1, { maxNodes, perHopLimit } = {}) => {
+  return request.post('/v1/knowledge-graph/neighbors/batch', {
+    node_ids: nodeIds,
+    depth,
+    max_nodes: maxNodes,
+    per_hop_limit: perHopLimit
   })
 }
 
@@ -75,7 +107,9 @@ export const knowledgeGraphApi = {
   getNodeRelationships,
   getStatistics,
   getGraphData,
+  getGraphDataPage,
   getNodeNeighbors,
+  getNeighborsBatch,
   executeCypher
 }
 
@@ -13,6 +13,15 @@ export const getOperationLogs = (params) => {
   return request.get('/v1/logs', { params })
 }
 
+/**
+ * 游标分页获取操作日志列表（每页代价与页码无关）
+ * @param {Object} params - 查询参数（limit、cursor、total_mode、筛选等）
+ * @returns {Promise} 日志列表、next_cursor、has_more、total、total_exact
+ */
+export const getOperationLogsPage = (params) => {
+  return request.get('/v1/logs/page', { params })
+}
+
 /**
  * 获取操作日志详情
  * @param {number} id - 日志ID
@@ -42,6 +51,7 @@ export const getRecentLogs = (limit = 10) => {
 // 统一导出
 export const operationLogApi = {
   getOperationLogs,
+  getOperationLogsPage,
   getOperationLogById,
   getLogStatistics,
   getRecentLogs